@@ -2,10 +2,23 @@
 NewsHub API v1 路由配置
 移动端友好的API路由结构
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.api_v1.endpoints import auth, news
+from app.api.api_v1.endpoints import auth, news, comments
+from app.api.deps import require_admin_key
 from app.core.config import MobileAPIResponse
+from app.core.cache import get_cache
+from app.core.compression import compression_stats
+from app.core.rate_limit import get_rate_limiter
+from app.services.news.view_counter import get_view_counter
+from app.services.news.interaction_writer import get_interaction_writer
+from app.services.news.interaction_state import get_interaction_state_cache
+from app.services.news.trending import get_trending_engine
+from app.services.news.trending_windows import get_trending_windows
+from app.services.news.categories import get_category_store
+from app.services.auth.profile_cache import get_profile_cache
+from app.services.auth.account_index import get_account_index
+from app.services.auth.token_store import get_token_store
 
 # 创建主路由器
 api_router = APIRouter()
@@ -20,6 +33,26 @@ async def api_status():
         "status": "running"
     })
 
+# 运行指标端点 - 缓存命中率等（内部状态，仅管理员可见）
+@api_router.get("/metrics", dependencies=[Depends(require_admin_key)])
+async def api_metrics():
+    """运行指标，需携带请求头 X-Admin-Key"""
+    return MobileAPIResponse.success({
+        "cache": get_cache().stats(),
+        "compression": compression_stats.snapshot(),
+        "rate_limit": get_rate_limiter().stats(),
+        "view_counter": get_view_counter().stats(),
+        "interaction_writer": get_interaction_writer().stats(),
+        "interaction_state": get_interaction_state_cache().stats(),
+        "trending": get_trending_engine().stats(),
+        "trending_windows": get_trending_windows().stats(),
+        "categories": get_category_store().stats(),
+        "auth_profiles": get_profile_cache().stats(),
+        "account_index": get_account_index().stats(),
+        "token_store": get_token_store().stats()
+    })
+
 # 包含业务路由模块
 api_router.include_router(auth.router, prefix="/auth", tags=["认证"])
-api_router.include_router(news.router, prefix="/news", tags=["新闻"]) 
\ No newline at end of file
+api_router.include_router(news.router, prefix="/news", tags=["新闻"])
+api_router.include_router(comments.router, prefix="/news", tags=["评论"]) 
\ No newline at end of file
@@ -2,16 +2,19 @@
 认证相关API端点
 支持移动端登录、注册、令牌刷新
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Any
+from typing import Any, Optional
 import logging
 
+from app.api.deps import CurrentUser, get_current_user
 from app.core.config import settings, MobileAPIResponse
 from app.db.database import get_db
 from app.schemas.requests.auth import LoginRequest, RegisterRequest
-from app.schemas.responses.auth import TokenResponse, UserResponse
+from app.schemas.responses.auth import AvailabilityResponse, TokenResponse, UserResponse
 from app.services.auth.auth_service import AuthService
+from app.services.auth.account_index import get_account_index
+from app.services.auth.token_store import TokenStoreFullError
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -46,6 +49,35 @@ async def register(
             detail="注册失败，请稍后重试"
         )
 
+@router.get("/availability", response_model=dict, tags=["认证"])
+async def check_availability(
+    username: Optional[str] = Query(None, min_length=1, max_length=50, description="待检查的用户名"),
+    email: Optional[str] = Query(None, min_length=3, max_length=255, description="待检查的邮箱"),
+    db = Depends(get_db)
+) -> Any:
+    """
+    检查用户名/邮箱是否可用
+    移动端注册时实时提示，多数请求由布隆过滤器直接判定，无需查询数据库
+    """
+    if username is None and email is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="请提供用户名或邮箱"
+        )
+    try:
+        result = await get_account_index().check(db, username=username, email=email)
+        
+        return MobileAPIResponse.success(
+            data=AvailabilityResponse(**result).model_dump(exclude_none=True),
+            message="检查完成"
+        )
+    except Exception as e:
+        logger.error(f"Availability check error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="检查失败，请稍后重试"
+        )
+
 @router.post("/login", response_model=dict, tags=["认证"])
 async def login(
     request: LoginRequest,
@@ -97,6 +129,12 @@ async def refresh_token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e)
         )
+    except TokenStoreFullError:
+        # 无法记录旧令牌已使用时拒绝刷新，避免同一刷新令牌可被重放
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="服务繁忙，请稍后重试"
+        )
     except Exception as e:
         logger.error(f"Token refresh error: {e}")
         raise HTTPException(
@@ -128,16 +166,14 @@ async def logout(
 
 @router.get("/profile", response_model=dict, tags=["认证"])
 async def get_profile(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db = Depends(get_db)
+    user: CurrentUser = Depends(get_current_user)
 ) -> Any:
     """
     获取用户资料
     移动端个人信息显示
     """
     try:
-        auth_service = AuthService(db)
-        result = await auth_service.get_current_user(credentials.credentials)
+        result = await user.profile()
         
         return MobileAPIResponse.success(
             data=result,
@@ -0,0 +1,119 @@
+"""
+评论相关API端点
+支持移动端评论浏览（游标分页）、回复与发表评论
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional, Any
+import logging
+
+from app.api.deps import CurrentUser, get_current_user, get_service_db
+from app.core.config import MobileAPIResponse
+from app.db.database import get_db
+from app.schemas.requests.news import CommentCreateRequest
+from app.services.news.comment_service import CommentService
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/{news_id}/comments", response_model=dict, tags=["评论"])
+async def get_comments(
+    news_id: str,
+    size: int = Query(20, ge=1, le=50, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的next_cursor）"),
+    preview_size: int = Query(3, ge=0, le=10, description="每条评论的回复预览数量"),
+    db = Depends(get_db),
+    service_db = Depends(get_service_db)
+) -> Any:
+    """
+    获取新闻评论
+    顶层评论按时间倒序游标分页，附带回复预览
+    """
+    try:
+        comment_service = CommentService(db, service_db=service_db)
+        result = await comment_service.get_comments(news_id, size=size, cursor=cursor, preview_size=preview_size)
+        
+        return MobileAPIResponse.success(
+            data=result,
+            message="获取评论成功"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Get comments error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取评论失败"
+        )
+
+@router.get("/{news_id}/comments/{comment_id}/replies", response_model=dict, tags=["评论"])
+async def get_comment_replies(
+    news_id: str,
+    comment_id: str,
+    size: int = Query(20, ge=1, le=50, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的next_cursor）"),
+    db = Depends(get_db),
+    service_db = Depends(get_service_db)
+) -> Any:
+    """
+    获取评论回复
+    按时间正序游标分页
+    """
+    try:
+        comment_service = CommentService(db, service_db=service_db)
+        result = await comment_service.get_replies(news_id, comment_id, size=size, cursor=cursor)
+        
+        return MobileAPIResponse.success(
+            data=result,
+            message="获取回复成功"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Get comment replies error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取回复失败"
+        )
+
+@router.post("/{news_id}/comments", response_model=dict, tags=["评论"])
+async def add_comment(
+    news_id: str,
+    comment_data: CommentCreateRequest,
+    user: CurrentUser = Depends(get_current_user),
+    db = Depends(get_db),
+    service_db = Depends(get_service_db)
+) -> Any:
+    """
+    发表评论
+    传入 parent_id 时为回复
+    """
+    try:
+        comment_service = CommentService(db, service_db=service_db)
+        result = await comment_service.add_comment(
+            news_id,
+            user.id,
+            comment_data.content,
+            parent_id=comment_data.parent_id
+        )
+        
+        return MobileAPIResponse.success(
+            data=result,
+            message="评论成功"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Add comment error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="评论失败"
+        )
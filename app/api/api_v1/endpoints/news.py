@@ -2,36 +2,45 @@
 新闻相关API端点
 支持移动端新闻浏览、搜索、互动
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from typing import Optional, List, Any
 import logging
 
+from app.api.deps import CurrentUser, get_current_user, get_optional_user, get_service_db, require_admin_key
 from app.core.config import settings, MobileAPIResponse
-from app.db.database import get_db
+from app.core.etag import cached_not_modified, compute_etag, conditional_success
+from app.db.database import get_db, ServiceClientUnavailableError
 from app.models.news import NewsCategory, NewsPublic, NewsListResponse
+from app.schemas.requests.news import InteractionStateRequest
 from app.services.news.news_service import NewsService
-from app.services.auth.auth_service import AuthService
+from app.services.news.categories import get_category_store
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-security = HTTPBearer()
 
 @router.get("/", response_model=dict, tags=["新闻"])
 async def get_news_list(
+    request: Request,
     page: int = Query(1, ge=1, description="页码"),
     size: int = Query(20, ge=1, le=100, description="每页数量"),
     category: Optional[NewsCategory] = Query(None, description="新闻分类"),
     keyword: Optional[str] = Query(None, description="搜索关键词"),
-    sort: str = Query("published_at", regex="^(published_at|view_count|like_count)$", description="排序字段"),
+    sort: str = Query("published_at", regex="^(published_at|view_count|like_count|relevance)$", description="排序字段（relevance需配合keyword）"),
     order: str = Query("desc", regex="^(asc|desc)$", description="排序方向"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的next_cursor），传入时忽略page"),
+    count_mode: str = Query("exact", regex="^(exact|estimated|none)$", description="总数计算方式"),
     db = Depends(get_db)
 ) -> Any:
     """
     获取新闻列表
-    移动端分页和筛选
+    移动端分页和筛选，支持偏移分页与游标分页
+    支持 If-None-Match 条件请求
     """
     try:
+        not_modified = await cached_not_modified("news_list", request)
+        if not_modified:
+            return not_modified
+        
         news_service = NewsService(db)
         result = await news_service.get_news_list(
             page=page,
@@ -39,12 +48,22 @@ async def get_news_list(
             category=category,
             keyword=keyword,
             sort=sort,
-            order=order
+            order=order,
+            cursor=cursor,
+            count_mode=count_mode
         )
         
-        return MobileAPIResponse.success(
+        return await conditional_success(
+            request,
             data=result,
-            message="获取新闻列表成功"
+            message="获取新闻列表成功",
+            namespace="news_list",
+            ttl=settings.CACHE_TTL_MEDIUM
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     except Exception as e:
         logger.error(f"Get news list error: {e}")
@@ -53,40 +72,67 @@ async def get_news_list(
             detail="获取新闻列表失败"
         )
 
+@router.post("/interactions/state", response_model=dict, tags=["新闻"])
+async def get_interaction_states(
+    request_data: InteractionStateRequest,
+    user: CurrentUser = Depends(get_current_user),
+    db = Depends(get_db),
+    service_db = Depends(get_service_db)
+) -> Any:
+    """
+    批量获取互动状态
+    移动端信息流一次请求获取整屏卡片的点赞/收藏/分享状态（最多100条）
+    """
+    try:
+        news_service = NewsService(db, service_db=service_db)
+        result = await news_service.get_interaction_states(user.id, request_data.news_ids)
+        
+        return MobileAPIResponse.success(
+            data={'states': result},
+            message="获取互动状态成功"
+        )
+    except Exception as e:
+        logger.error(f"Get interaction states error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="获取互动状态失败"
+        )
+
 @router.get("/{news_id}", response_model=dict, tags=["新闻"])
 async def get_news_detail(
     news_id: str,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    request: Request,
+    user: Optional[CurrentUser] = Depends(get_optional_user),
     db = Depends(get_db)
 ) -> Any:
     """
     获取新闻详情
-    记录用户浏览行为
+    记录用户浏览行为；每次打开都需计入浏览量，因此始终执行查询，
+    ETag 不含随浏览变化的 view_count，内容未变时返回304省去响应体
     """
     try:
         news_service = NewsService(db)
         
-        # 获取当前用户ID（如果已登录）
-        user_id = None
-        if credentials:
-            try:
-                auth_service = AuthService(db)
-                user = await auth_service.get_current_user(credentials.credentials)
-                user_id = user.id
-            except:
-                pass  # 未登录用户也可以浏览
-        
-        result = await news_service.get_news_detail(news_id, user_id)
+        # 未登录用户也可以浏览
+        result = await news_service.get_news_detail(news_id, user.id if user else None)
         
-        return MobileAPIResponse.success(
+        etag = compute_etag({k: v for k, v in result.items() if k != 'view_count'})
+        return await conditional_success(
+            request,
             data=result,
-            message="获取新闻详情成功"
+            message="获取新闻详情成功",
+            etag=etag
         )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except ServiceClientUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="服务暂不可用"
+        )
     except Exception as e:
         logger.error(f"Get news detail error: {e}")
         raise HTTPException(
@@ -97,18 +143,16 @@ async def get_news_detail(
 @router.post("/{news_id}/like", response_model=dict, tags=["新闻"])
 async def like_news(
     news_id: str,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db = Depends(get_db)
+    user: CurrentUser = Depends(get_current_user),
+    db = Depends(get_db),
+    service_db = Depends(get_service_db)
 ) -> Any:
     """
     点赞/取消点赞新闻
     移动端一键互动
     """
     try:
-        auth_service = AuthService(db)
-        user = await auth_service.get_current_user(credentials.credentials)
-        
-        news_service = NewsService(db)
+        news_service = NewsService(db, service_db=service_db)
         result = await news_service.toggle_news_like(news_id, user.id)
         
         return MobileAPIResponse.success(
@@ -116,11 +160,6 @@ async def like_news(
             message="操作成功"
         )
     except ValueError as e:
-        if "无效" in str(e) or "过期" in str(e):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=str(e)
-            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
@@ -135,18 +174,16 @@ async def like_news(
 @router.post("/{news_id}/favorite", response_model=dict, tags=["新闻"])
 async def favorite_news(
     news_id: str,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db = Depends(get_db)
+    user: CurrentUser = Depends(get_current_user),
+    db = Depends(get_db),
+    service_db = Depends(get_service_db)
 ) -> Any:
     """
     收藏/取消收藏新闻
     移动端个人收藏管理
     """
     try:
-        auth_service = AuthService(db)
-        user = await auth_service.get_current_user(credentials.credentials)
-        
-        news_service = NewsService(db)
+        news_service = NewsService(db, service_db=service_db)
         result = await news_service.toggle_news_favorite(news_id, user.id)
         
         return MobileAPIResponse.success(
@@ -154,11 +191,6 @@ async def favorite_news(
             message="操作成功"
         )
     except ValueError as e:
-        if "无效" in str(e) or "过期" in str(e):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=str(e)
-            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
@@ -173,26 +205,18 @@ async def favorite_news(
 @router.post("/{news_id}/share", response_model=dict, tags=["新闻"])
 async def share_news(
     news_id: str,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db = Depends(get_db)
+    user: Optional[CurrentUser] = Depends(get_optional_user),
+    db = Depends(get_db),
+    service_db = Depends(get_service_db)
 ) -> Any:
     """
     分享新闻
     记录分享统计
     """
     try:
-        # 获取当前用户ID（如果已登录）
-        user_id = None
-        if credentials:
-            try:
-                auth_service = AuthService(db)
-                user = await auth_service.get_current_user(credentials.credentials)
-                user_id = user.id
-            except:
-                pass  # 未登录用户也可以分享
-        
-        news_service = NewsService(db)
-        result = await news_service.share_news(news_id, user_id)
+        # 未登录用户也可以分享
+        news_service = NewsService(db, service_db=service_db)
+        result = await news_service.share_news(news_id, user.id if user else None)
         
         return MobileAPIResponse.success(
             data=result,
@@ -212,19 +236,29 @@ async def share_news(
 
 @router.get("/categories/list", response_model=dict, tags=["新闻"])
 async def get_categories(
+    request: Request,
     db = Depends(get_db)
 ) -> Any:
     """
     获取新闻分类列表
-    移动端分类筛选
+    移动端分类筛选，直接读取内存中的分类快照，快照版本即ETag，支持 If-None-Match 条件请求
     """
     try:
+        # 已知版本命中时直接返回304（快照变化时由 CategoryStore.load 失效）
+        not_modified = await cached_not_modified("categories", request)
+        if not_modified:
+            return not_modified
+        
         news_service = NewsService(db)
-        result = await news_service.get_categories()
+        snapshot = await news_service.get_category_snapshot()
         
-        return MobileAPIResponse.success(
-            data=result,
-            message="获取分类列表成功"
+        return await conditional_success(
+            request,
+            data=snapshot.as_list(),
+            message="获取分类列表成功",
+            namespace="categories",
+            ttl=settings.CACHE_TTL_LONG,
+            etag=snapshot.version
         )
     except Exception as e:
         logger.error(f"Get categories error: {e}")
@@ -233,22 +267,53 @@ async def get_categories(
             detail="获取分类列表失败"
         )
 
+@router.post("/categories/refresh", response_model=dict, tags=["新闻"], dependencies=[Depends(require_admin_key)])
+async def refresh_categories(
+    db = Depends(get_db)
+) -> Any:
+    """
+    刷新分类快照
+    管理员修改分类后调用（需携带请求头 X-Admin-Key），立即重新加载并失效客户端缓存的ETag
+    """
+    try:
+        snapshot = await get_category_store().load(db)
+        return MobileAPIResponse.success(
+            data={'version': snapshot.version, 'count': len(snapshot.items)},
+            message="分类已刷新"
+        )
+    except Exception as e:
+        logger.error(f"Refresh categories error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="刷新分类失败"
+        )
+
 @router.get("/trending/hot", response_model=dict, tags=["新闻"])
 async def get_trending_news(
+    request: Request,
     limit: int = Query(10, ge=1, le=50, description="数量限制"),
+    window: Optional[str] = Query(None, regex="^(hour|day|week)$", description="时间窗口：最近1小时/今日/本周"),
+    category: Optional[NewsCategory] = Query(None, description="新闻分类"),
     db = Depends(get_db)
 ) -> Any:
     """
     获取热门新闻
-    移动端首页推荐
+    移动端首页推荐，支持按时间窗口与分类筛选，支持 If-None-Match 条件请求
     """
     try:
+        not_modified = await cached_not_modified("news_trending", request)
+        if not_modified:
+            return not_modified
+        
         news_service = NewsService(db)
-        result = await news_service.get_trending_news(limit)
+        result = await news_service.get_trending_news(limit, window=window, category=category)
         
-        return MobileAPIResponse.success(
+        return await conditional_success(
+            request,
             data=result,
-            message="获取热门新闻成功"
+            message="获取热门新闻成功",
+            namespace="news_trending",
+            ttl=settings.TRENDING_REFRESH_INTERVAL
         )
     except Exception as e:
         logger.error(f"Get trending news error: {e}")
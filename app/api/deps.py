@@ -0,0 +1,121 @@
+"""
+API公共依赖项
+从已签名的JWT声明解析当前用户身份，不查询 users 表；
+端点确实需要完整资料时再按需加载（经用户资料缓存）
+"""
+import hashlib
+import secrets
+from typing import Any, Dict, Optional
+
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from supabase import Client
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import get_db, get_supabase_service_client
+from app.schemas.responses.auth import UserResponse
+from app.services.auth.auth_service import AuthService, decode_token
+from app.services.auth.token_store import get_token_store
+
+security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# 校验失败的令牌短时缓存（签名错误、格式错误、已过期），重复提交时无需再次校验
+REJECTED_TOKEN_TTL = 60
+
+class CurrentUser:
+    """当前请求的用户身份，完整资料在首次调用 profile() 时才加载"""
+
+    __slots__ = ('id', 'token', '_db', '_profile')
+
+    def __init__(self, user_id: str, token: str, db: Client):
+        self.id = user_id
+        self.token = token
+        self._db = db
+        self._profile: Optional[UserResponse] = None
+
+    async def profile(self) -> UserResponse:
+        # 令牌已由依赖项校验，这里只按用户ID加载资料（经用户资料缓存）
+        if self._profile is None:
+            self._profile = await AuthService(self._db).get_user_profile(self.id)
+        return self._profile
+
+# 全局无效令牌缓存实例
+_rejected_tokens: Optional[TTLCache] = None
+
+def get_rejected_tokens() -> TTLCache:
+    """获取无效令牌缓存"""
+    global _rejected_tokens
+
+    if _rejected_tokens is None:
+        _rejected_tokens = TTLCache(max_entries=10000, default_ttl=REJECTED_TOKEN_TTL)
+    return _rejected_tokens
+
+def verify_token(token: str) -> Dict[str, Any]:
+    """校验访问令牌并返回令牌声明，无效令牌抛出 ValueError"""
+    rejected = get_rejected_tokens()
+    # 以摘要为键，避免超长的伪造令牌占用缓存内存
+    key = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+    reason = rejected.peek(key)
+    if reason is not None:
+        raise ValueError(reason)
+    try:
+        return decode_token(token, "access")
+    except ValueError as e:
+        rejected.set(key, str(e))
+        raise
+
+async def _resolve_user(token: str, db: Client) -> CurrentUser:
+    """校验令牌并检查会话是否已吊销（一次哈希查找）"""
+    claims = verify_token(token)
+    if await get_token_store().is_revoked(claims["sid"]):
+        raise ValueError("访问令牌已失效")
+    return CurrentUser(claims["sub"], token, db)
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Client = Depends(get_db)
+) -> CurrentUser:
+    """必须登录：令牌无效或已吊销时返回401（同一请求内只校验一次）"""
+    try:
+        return await _resolve_user(credentials.credentials, db)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Client = Depends(get_db)
+) -> Optional[CurrentUser]:
+    """可选登录：未携带、无效或已吊销的令牌按匿名用户处理"""
+    if credentials is None:
+        return None
+    try:
+        return await _resolve_user(credentials.credentials, db)
+    except ValueError:
+        return None
+
+async def get_service_db() -> Client:
+    """
+    service-role客户端：点赞/收藏/分享、评论等数据库函数仅对 service_role 开放，
+    未配置 SUPABASE_SERVICE_ROLE_KEY 时返回503，而不是以匿名客户端调用后失败
+    """
+    client = get_supabase_service_client()
+    if client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="服务暂不可用"
+        )
+    return client
+
+async def require_admin_key(x_admin_key: Optional[str] = Header(None)) -> None:
+    """管理接口：校验请求头 X-Admin-Key，未配置 ADMIN_API_KEY 时一律拒绝"""
+    if not settings.ADMIN_API_KEY or not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="无权限"
+        )
@@ -0,0 +1,188 @@
+"""
+NewsHub 缓存层
+REDIS_URL 配置时使用Redis，否则退化为进程内有界 LRU+TTL 缓存
+"""
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """进程内有界 LRU+TTL 缓存（同步，值可为任意对象）"""
+
+    def __init__(self, max_entries: int = 10000, default_ttl: int = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._store: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._store.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._store[key]
+            self.misses += 1
+            return None
+        self._store.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        """读取未过期的值，不计入命中统计也不调整LRU顺序"""
+        entry = self._store.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def values(self) -> list:
+        return [value for _, value in self._store.values()]
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        self._store[key] = (expires_at, value)
+        self._store.move_to_end(key)
+        # 超出容量时淘汰最久未使用的条目
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._store.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        keys = [key for key in self._store if key.startswith(prefix)]
+        for key in keys:
+            del self._store[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._store),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+class MemoryCache:
+    """进程内缓存后端（异步接口，与RedisCache保持一致）"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 10000, default_ttl: int = 300):
+        self._cache = TTLCache(max_entries=max_entries, default_ttl=default_ttl)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        return self._cache.delete_prefix(prefix)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, **self._cache.stats()}
+
+class RedisCache:
+    """Redis缓存后端，异常时按未命中处理，不影响主流程"""
+
+    backend = "redis"
+
+    def __init__(self, client: aioredis.Redis, default_ttl: int = 300, namespace: str = "newshub:"):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.client.get(self.namespace + key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache get failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        try:
+            await self.client.set(self.namespace + key, value, ex=ttl if ttl is not None else self.default_ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache set failed: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(self.namespace + key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache delete failed: {e}")
+
+    async def delete_prefix(self, prefix: str) -> int:
+        deleted = 0
+        try:
+            async for key in self.client.scan_iter(match=f"{self.namespace}{prefix}*", count=500):
+                deleted += await self.client.delete(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache delete_prefix failed: {e}")
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+# 全局缓存实例
+_cache = None
+
+def get_redis_client() -> Optional[aioredis.Redis]:
+    """根据REDIS_URL创建Redis客户端，未配置时返回None"""
+    if not settings.REDIS_URL:
+        return None
+    return aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+
+def get_cache():
+    """获取缓存实例：优先Redis，未配置时使用进程内缓存"""
+    global _cache
+
+    if _cache is None:
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            _cache = RedisCache(redis_client, default_ttl=settings.CACHE_TTL_SHORT)
+            logger.info("Redis cache initialized")
+        else:
+            _cache = MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, default_ttl=settings.CACHE_TTL_SHORT)
+            logger.info("In-process cache initialized (REDIS_URL not configured)")
+
+    return _cache
@@ -0,0 +1,193 @@
+"""
+响应压缩中间件
+按 Accept-Encoding 协商 brotli/gzip，小响应与304不压缩；
+携带强ETag的响应按 (路径, ETag, 编码) 缓存压缩结果，同一版本只压缩一次；
+压缩后的表示使用带编码后缀的ETag，与未压缩表示区分
+"""
+import gzip
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.etag import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # brotli为可选依赖，未安装时仅支持gzip
+    brotli = None
+
+# 不压缩的状态码
+_SKIP_STATUS = {204, 206, 304}
+
+class CompressionStats:
+    """按端点统计压缩率与压缩CPU耗时"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, endpoint: str, encoding: Optional[str], size_in: int, size_out: int, cpu_seconds: float, cache_hit: bool) -> None:
+        stats = self.endpoints.setdefault(endpoint, {
+            "responses": 0,
+            "compressed": 0,
+            "cache_hits": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "cpu_ms": 0.0,
+            "encodings": {}
+        })
+        stats["responses"] += 1
+        stats["bytes_in"] += size_in
+        stats["bytes_out"] += size_out
+        if encoding:
+            stats["compressed"] += 1
+            stats["encodings"][encoding] = stats["encodings"].get(encoding, 0) + 1
+            stats["cpu_ms"] += cpu_seconds * 1000
+            if cache_hit:
+                stats["cache_hits"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        result = {}
+        for endpoint, stats in self.endpoints.items():
+            compressed = stats["compressed"] - stats["cache_hits"]
+            result[endpoint] = {
+                **stats,
+                "cpu_ms": round(stats["cpu_ms"], 3),
+                "encodings": dict(stats["encodings"]),
+                "compression_ratio": round(stats["bytes_out"] / stats["bytes_in"], 4) if stats["bytes_in"] else 1.0,
+                "cpu_ms_per_compression": round(stats["cpu_ms"] / compressed, 3) if compressed > 0 else 0.0
+            }
+        return result
+
+compression_stats = CompressionStats()
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """解析 Accept-Encoding（含q值），优先brotli，其次gzip"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+class CompressionMiddleware:
+    """按需压缩响应的ASGI中间件"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache_entries: int = 1024,
+        cache_ttl: int = 1800
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        # 预压缩结果缓存: (路径, ETag, 编码) -> 压缩后字节
+        self.compressed_cache = TTLCache(max_entries=cache_entries, default_ttl=cache_ttl)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        body_chunks: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] in _SKIP_STATUS or message["status"] < 200 or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body_chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_chunks)
+            endpoint = _endpoint_name(scope)
+            if len(body) < self.minimum_size:
+                compression_stats.record(endpoint, None, len(body), len(body), 0.0, False)
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            compressed, cpu_seconds, cache_hit = self._compress(body, encoding, Headers(raw=start_message["headers"]), scope["path"])
+            compression_stats.record(endpoint, encoding, len(body), len(compressed), cpu_seconds, cache_hit)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            etag = headers.get("etag")
+            if etag:
+                headers["ETag"] = encoded_etag(etag, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, body: bytes, encoding: str, headers: Headers, path: str = "") -> Tuple[bytes, float, bool]:
+        """
+        压缩响应体；强ETag标识的响应复用已缓存的压缩结果
+        ETag只在同一资源内唯一（不同端点的相同数据ETag相同），缓存键需包含路径
+        """
+        etag = headers.get("etag")
+        cache_key = f"{path}|{etag}|{encoding}" if etag and not etag.startswith("W/") else None
+        if cache_key:
+            cached = self.compressed_cache.get(cache_key)
+            if cached is not None:
+                return cached, 0.0, True
+
+        start = time.thread_time()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level)
+        cpu_seconds = time.thread_time() - start
+
+        if cache_key:
+            self.compressed_cache.set(cache_key, compressed)
+        return compressed, cpu_seconds, False
+
+def _endpoint_name(scope: Scope) -> str:
+    """按路由模板归类端点，避免路径参数导致统计项无限增长"""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope.get('method', 'GET')} {path}"
@@ -4,7 +4,7 @@ NewsHub Backend Configuration
 """
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import Optional, List, Union
+from typing import Literal, Optional, List, Union
 import os
 
 class Settings(BaseSettings):
@@ -41,6 +41,7 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: Optional[str] = None
     SUPABASE_SERVICE_ROLE_KEY: Optional[str] = None
     SUPABASE_DB_URL: Optional[str] = None
+    DB_EXECUTOR_WORKERS: int = 32  # 数据库调用线程池大小 (同步客户端不阻塞事件循环)
     
     # Redis配置 (Railway托管)
     REDIS_URL: Optional[str] = None
@@ -53,12 +54,56 @@ class Settings(BaseSettings):
     CACHE_TTL_SHORT: int = 300    # 5分钟 - 实时数据
     CACHE_TTL_MEDIUM: int = 1800  # 30分钟 - 新闻列表
     CACHE_TTL_LONG: int = 3600    # 1小时 - 用户数据
+    CACHE_MAX_ENTRIES: int = 10000  # 进程内缓存最大条目数 (未配置Redis时)
+    
+    # 浏览量写回配置 - 进程内缓冲崩溃时最多丢失一个周期的浏览量，配置Redis后可跨实例保留
+    VIEW_COUNT_FLUSH_INTERVAL: int = 10  # 秒
+    
+    # 用户互动事件批量写入配置 - 队列满时丢弃事件，不阻塞请求
+    INTERACTION_QUEUE_SIZE: int = 10000
+    INTERACTION_BATCH_SIZE: int = 500
+    INTERACTION_FLUSH_INTERVAL: float = 1.0  # 秒
+    
+    # 用户互动状态缓存 (点赞/收藏/分享集合，进程内LRU)
+    INTERACTION_STATE_MAX_USERS: int = 10000
+    
+    # 热门排行配置 - 热度 = (浏览*w_v + 点赞*w_l + 分享*w_s + 1) / (发布小时数 + 2) ^ gravity
+    TRENDING_GRAVITY: float = 1.8
+    TRENDING_VIEW_WEIGHT: float = 1.0
+    TRENDING_LIKE_WEIGHT: float = 5.0
+    TRENDING_SHARE_WEIGHT: float = 10.0
+    TRENDING_WINDOW_HOURS: int = 168  # 只对最近7天发布的新闻排行
+    TRENDING_MAX_RANKED: int = 200  # 预排序榜单长度
+    TRENDING_REFRESH_INTERVAL: int = 60  # 增量刷新间隔（秒）
+    
+    # 响应压缩配置 - 移动网络节省流量
+    COMPRESSION_MIN_SIZE: int = 1024  # 小于该字节数的响应不压缩
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # brotli质量 (0-11)，兼顾CPU与压缩率
+    
+    # 用户资料缓存 (按令牌sub缓存，登出与资料变更时失效)
+    AUTH_PROFILE_CACHE_TTL: int = 300  # 秒
+    AUTH_PROFILE_CACHE_MAX_ENTRIES: int = 10000
+    
+    # 用户名/邮箱占用布隆过滤器 (注册与可用性检查，判定不存在时无需查询数据库)
+    ACCOUNT_FILTER_CAPACITY: int = 1000000
+    ACCOUNT_FILTER_ERROR_RATE: float = 0.01
+    ACCOUNT_FILTER_REBUILD_INTERVAL: int = 3600  # 秒
+    
+    # 管理接口密钥 (请求头 X-Admin-Key)，未配置时管理接口不可用
+    ADMIN_API_KEY: Optional[str] = None
     
     # JWT认证配置
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7天 (移动端长期登录)
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 30  # 30天
+    TOKEN_STORE_MAX_ENTRIES: int = 100000  # 进程内已消费刷新令牌上限 (未配置Redis时)，满时拒绝刷新而不是提前淘汰
+    
+    # 凭证后端: supabase (Supabase Auth) 或 local (users.password_hash 存储bcrypt哈希)
+    AUTH_BACKEND: Literal["supabase", "local"] = "supabase"
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2  # 密码哈希进程池大小
     
     # 推送通知配置 (移动端)
     FIREBASE_CREDENTIALS_PATH: Optional[str] = None
@@ -71,6 +116,11 @@ class Settings(BaseSettings):
     # API限流配置 - 移动端友好
     RATE_LIMIT_PER_MINUTE: int = 100  # 每分钟100次请求
     RATE_LIMIT_BURST: int = 20        # 突发请求限制
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_SEARCH_PER_MINUTE: int = 30  # 关键词搜索单独限流
+    RATE_LIMIT_SEARCH_BURST: int = 10
+    # 可信反向代理（IP或CIDR，逗号分隔）：仅当直连对端属于其中时才按 X-Forwarded-For 识别客户端IP
+    TRUSTED_PROXIES: Union[List[str], str] = ["127.0.0.1"]
     
     @field_validator('BACKEND_CORS_ORIGINS')
     @classmethod
@@ -80,6 +130,14 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(',') if origin.strip()]
         return v
     
+    @field_validator('TRUSTED_PROXIES')
+    @classmethod
+    def parse_trusted_proxies(cls, v):
+        """解析可信代理配置 - 支持逗号分隔字符串或列表"""
+        if isinstance(v, str):
+            return [proxy.strip() for proxy in v.split(',') if proxy.strip()]
+        return v
+    
     @field_validator('ALLOWED_IMAGE_TYPES')
     @classmethod
     def parse_image_types(cls, v):
@@ -0,0 +1,118 @@
+"""
+ETag与条件请求支持
+基于数据内容哈希生成ETag，已知版本时直接返回304而无需重新查询
+同一版本的响应体只渲染一次，供压缩中间件按ETag复用压缩结果
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+from app.core.cache import get_cache, TTLCache
+from app.core.config import settings, MobileAPIResponse
+
+# 已知ETag缓存键前缀: etag:{资源命名空间}:{路径}?{查询参数}
+ETAG_CACHE_PREFIX = "etag:"
+
+# 按 (命名空间, 路径, ETag) 缓存已渲染的响应体（进程内），同一版本字节完全一致；
+# ETag只是数据哈希，不同端点的相同数据（如空列表）ETag相同，但响应信封的message不同
+_rendered_bodies = TTLCache(max_entries=1024, default_ttl=settings.CACHE_TTL_SHORT)
+
+def compute_etag(data: Any, weak: bool = True) -> str:
+    """根据响应数据内容计算ETag（响应信封中的timestamp不参与计算）"""
+    payload = json.dumps(jsonable_encoder(data), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+# 压缩中间件为编码后的表示追加的ETag后缀（编码前后的字节不同，强ETag不能相同）
+ENCODING_ETAG_SUFFIXES = ("-br", "-gzip")
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """为压缩后的表示生成ETag：在引号内追加编码后缀，如 "abc" -> "abc-br" """
+    return f'{etag[:-1]}-{encoding}"'
+
+def _strip_encoding_suffix(opaque: str) -> str:
+    for suffix in ENCODING_ETAG_SUFFIXES:
+        if opaque.endswith(suffix + '"'):
+            return opaque[:-len(suffix) - 1] + '"'
+    return opaque
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """按弱比较规则判断 If-None-Match 是否命中（接受压缩表示带编码后缀的ETag）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if _strip_encoding_suffix(candidate) == opaque:
+            return True
+    return False
+
+def _etag_cache_key(namespace: str, request: Request) -> str:
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return f"{ETAG_CACHE_PREFIX}{namespace}:{request.url.path}?{query}"
+
+async def invalidate_etags(namespace: str) -> None:
+    """数据变更时失效某类资源的已知ETag"""
+    await get_cache().delete_prefix(f"{ETAG_CACHE_PREFIX}{namespace}:")
+
+def not_modified_response(etag: str) -> Response:
+    """304响应，不携带响应体"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+async def cached_not_modified(namespace: str, request: Request) -> Optional[Response]:
+    """客户端携带的ETag与已知版本一致时直接返回304，跳过服务查询"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    known_etag = await get_cache().get(_etag_cache_key(namespace, request))
+    if known_etag and etag_matches(if_none_match, known_etag):
+        return not_modified_response(known_etag)
+    return None
+
+async def conditional_success(
+    request: Request,
+    data: Any,
+    message: str,
+    namespace: Optional[str] = None,
+    ttl: Optional[int] = None,
+    etag: Optional[str] = None
+) -> Response:
+    """
+    生成带ETag的成功响应，If-None-Match 命中时返回304
+    指定 namespace 时记录已知ETag供后续请求跳过查询，并使用强ETag：
+    同一版本只渲染一次响应体（信封timestamp为首次生成时间），压缩结果可按ETag复用
+    """
+    if namespace:
+        etag = etag or compute_etag(data, weak=False)
+        await get_cache().set(
+            _etag_cache_key(namespace, request),
+            etag,
+            ttl=ttl if ttl is not None else settings.CACHE_TTL_SHORT
+        )
+    else:
+        etag = etag or compute_etag(data)
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified_response(etag)
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if not namespace:
+        return JSONResponse(
+            content=jsonable_encoder(MobileAPIResponse.success(data=data, message=message)),
+            headers=headers
+        )
+    
+    body_key = f"{namespace}:{request.url.path}|{etag}"
+    body = _rendered_bodies.get(body_key)
+    if body is None:
+        body = JSONResponse(content=jsonable_encoder(MobileAPIResponse.success(data=data, message=message))).body
+        _rendered_bodies.set(body_key, body, ttl)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,303 @@
+"""
+API限流中间件
+令牌桶算法：每个客户端（已登录用户，否则客户端IP；经可信代理转发时取 X-Forwarded-For 中的客户端IP）按 RATE_LIMIT_PER_MINUTE 匀速补充令牌，
+桶容量为 RATE_LIMIT_BURST；配置REDIS_URL时由Lua脚本在Redis中原子扣减（多实例共享额度），
+否则使用进程内令牌桶。关键词搜索等高开销接口可单独配置额度
+"""
+import ipaddress
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl
+
+import redis.asyncio as aioredis
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.cache import TTLCache, get_redis_client
+from app.core.config import settings, MobileAPIResponse
+from app.services.auth.auth_service import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+# 不限流的路径（健康检查等）
+EXEMPT_PATHS = frozenset({"/", "/health"})
+
+class RateLimitRule:
+    """限流规则：匹配的请求使用独立的令牌桶"""
+
+    __slots__ = ('name', 'per_minute', 'burst', 'path', 'methods', 'query_param')
+
+    def __init__(
+        self,
+        name: str,
+        per_minute: int,
+        burst: int,
+        path: Optional[str] = None,
+        methods: Optional[Sequence[str]] = None,
+        query_param: Optional[str] = None
+    ):
+        self.name = name
+        self.per_minute = per_minute
+        self.burst = burst
+        self.path = path.rstrip("/") if path else None
+        self.methods = frozenset(methods) if methods else None
+        self.query_param = query_param
+
+    @property
+    def rate(self) -> float:
+        """每秒补充的令牌数"""
+        return self.per_minute / 60.0
+
+    def matches(self, scope: Scope) -> bool:
+        if self.path is not None and scope["path"].rstrip("/") != self.path:
+            return False
+        if self.methods is not None and scope.get("method") not in self.methods:
+            return False
+        if self.query_param is not None:
+            query = scope.get("query_string", b"").decode("latin-1")
+            return any(key == self.query_param and value.strip() for key, value in parse_qsl(query))
+        return True
+
+class MemoryTokenBuckets:
+    """进程内令牌桶（单事件循环内无需加锁），超出容量时淘汰最久未访问的桶"""
+
+    backend = "memory"
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, capacity: int, cost: float = 1.0) -> float:
+        """扣减令牌，成功返回0，否则返回需等待的秒数"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(capacity), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(capacity), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+# 令牌桶的原子扣减；使用Redis服务器时间，避免多实例时钟偏差
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+class RedisTokenBuckets:
+    """Redis令牌桶（Lua脚本原子执行），Redis异常时放行请求"""
+
+    backend = "redis"
+
+    def __init__(self, client: aioredis.Redis, namespace: str = "newshub:ratelimit:"):
+        self.client = client
+        self.namespace = namespace
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+        self.errors = 0
+
+    async def acquire(self, key: str, rate: float, capacity: int, cost: float = 1.0) -> float:
+        try:
+            wait = await self._script(keys=[self.namespace + key], args=[rate, capacity, cost])
+            return float(wait)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis rate limit failed, allowing request: {e}")
+            return 0.0
+
+# 已校验令牌 -> 用户ID，避免每个请求重复校验JWT签名（仅用于选择令牌桶，不做鉴权）
+_token_subjects = TTLCache(max_entries=10000, default_ttl=60)
+
+ProxyNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+def parse_trusted_proxies(proxies: Sequence[str]) -> Tuple[ProxyNetwork, ...]:
+    """解析可信代理列表（IP或CIDR），非法条目记录警告后忽略"""
+    networks = []
+    for proxy in proxies:
+        try:
+            networks.append(ipaddress.ip_network(proxy, strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid trusted proxy: {proxy}")
+    return tuple(networks)
+
+def _is_trusted(address: str, trusted_proxies: Sequence[ProxyNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+def client_ip(scope: Scope, headers: Headers, trusted_proxies: Sequence[ProxyNetwork] = ()) -> str:
+    """
+    客户端IP：直连对端是可信代理时，从右向左取 X-Forwarded-For 中第一个非可信代理的地址
+    （最左侧的条目由客户端自行填写，不可信）
+    """
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not trusted_proxies or not _is_trusted(address, trusted_proxies):
+        return address
+    forwarded = headers.get("x-forwarded-for")
+    if not forwarded:
+        return address
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        address = hop
+        if not _is_trusted(hop, trusted_proxies):
+            break
+    return address
+
+def client_identity(scope: Scope, trusted_proxies: Sequence[ProxyNetwork] = ()) -> str:
+    """
+    限流主体：有效访问令牌的用户ID，否则客户端IP
+    （X-Device-ID 等客户端可随意更换的请求头不能作为限流键，否则轮换即可绕过限流并挤占他人的桶）
+    """
+    headers = Headers(scope=scope)
+    authorization = headers.get("authorization")
+    if authorization and authorization[:7].lower() == "bearer ":
+        token = authorization[7:]
+        user_id = _token_subjects.peek(token)
+        if user_id is None:
+            try:
+                user_id = decode_access_token(token)
+                _token_subjects.set(token, user_id)
+            except ValueError:
+                pass
+        if user_id is not None:
+            return "user:" + user_id
+    return "ip:" + client_ip(scope, headers, trusted_proxies)
+
+class RateLimiter:
+    """按规则选择令牌桶并统计限流次数"""
+
+    def __init__(
+        self,
+        buckets,
+        default_rule: RateLimitRule,
+        rules: Sequence[RateLimitRule] = (),
+        trusted_proxies: Sequence[ProxyNetwork] = ()
+    ):
+        self.buckets = buckets
+        self.default_rule = default_rule
+        self.rules = list(rules)
+        self.trusted_proxies = tuple(trusted_proxies)
+        self.allowed = 0
+        self.limited: Dict[str, int] = {}
+
+    def rule_for(self, scope: Scope) -> RateLimitRule:
+        for rule in self.rules:
+            if rule.matches(scope):
+                return rule
+        return self.default_rule
+
+    async def check(self, scope: Scope) -> Tuple[RateLimitRule, float]:
+        """返回匹配的规则与需等待的秒数（0表示放行）"""
+        rule = self.rule_for(scope)
+        wait = await self.buckets.acquire(f"{rule.name}:{client_identity(scope, self.trusted_proxies)}", rule.rate, rule.burst)
+        if wait > 0:
+            self.limited[rule.name] = self.limited.get(rule.name, 0) + 1
+        else:
+            self.allowed += 1
+        return rule, wait
+
+    def stats(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "backend": self.buckets.backend,
+            "allowed": self.allowed,
+            "limited": dict(self.limited),
+            "rules": {
+                rule.name: {"per_minute": rule.per_minute, "burst": rule.burst}
+                for rule in [self.default_rule, *self.rules]
+            }
+        }
+        if isinstance(self.buckets, MemoryTokenBuckets):
+            result["buckets"] = len(self.buckets)
+        else:
+            result["errors"] = self.buckets.errors
+        return result
+
+class RateLimitMiddleware:
+    """令牌桶限流的ASGI中间件，超限返回429与 Retry-After"""
+
+    def __init__(self, app: ASGIApp, exempt_paths: frozenset = EXEMPT_PATHS):
+        self.app = app
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        rule, wait = await get_rate_limiter().check(scope)
+        if wait <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            status_code=429,
+            content=MobileAPIResponse.error(message="请求过于频繁，请稍后重试", code=429),
+            headers={
+                "Retry-After": str(max(1, math.ceil(wait))),
+                "X-RateLimit-Limit": str(rule.per_minute)
+            }
+        )
+        await response(scope, receive, send)
+
+# 全局限流器实例
+_rate_limiter: Optional[RateLimiter] = None
+
+def get_rate_limiter() -> RateLimiter:
+    """获取限流器：配置REDIS_URL时使用Redis令牌桶，否则使用进程内令牌桶"""
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        redis_client = get_redis_client()
+        buckets = RedisTokenBuckets(redis_client) if redis_client is not None else MemoryTokenBuckets()
+        _rate_limiter = RateLimiter(
+            buckets,
+            default_rule=RateLimitRule("default", settings.RATE_LIMIT_PER_MINUTE, settings.RATE_LIMIT_BURST),
+            rules=[
+                # 关键词搜索走全文检索，单独限制
+                RateLimitRule(
+                    "search",
+                    settings.RATE_LIMIT_SEARCH_PER_MINUTE,
+                    settings.RATE_LIMIT_SEARCH_BURST,
+                    path=f"{settings.API_V1_PREFIX}/news",
+                    methods=["GET"],
+                    query_param="keyword"
+                )
+            ],
+            trusted_proxies=parse_trusted_proxies(settings.TRUSTED_PROXIES)
+        )
+    return _rate_limiter
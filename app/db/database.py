@@ -3,13 +3,27 @@ NewsHub Database Configuration
 Supabase PostgreSQL 连接配置
 """
 from supabase import create_client, Client
+from pydantic import BaseModel
+from typing import Any, Callable, Optional, Type
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from app.core.config import settings
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Supabase客户端实例
 supabase: Client = None
+supabase_service: Client = None
+# service-role客户端只解析一次（未配置时不在每次调用时重复尝试与告警）
+_service_client_resolved = False
+
+class ServiceClientUnavailableError(Exception):
+    """未配置 SUPABASE_SERVICE_ROLE_KEY，无法访问仅对 service_role 开放的表与函数"""
+
+# 数据库调用线程池 - supabase客户端为同步实现，在线程池中执行以免阻塞事件循环
+_db_executor: Optional[ThreadPoolExecutor] = None
 
 def get_supabase_client() -> Client:
     """获取Supabase客户端实例"""
@@ -49,10 +63,67 @@ def get_supabase_admin_client() -> Client:
         logger.error(f"Failed to initialize Supabase admin client: {e}")
         return None
 
+def get_supabase_service_client() -> Optional[Client]:
+    """
+    获取service-role客户端（进程内只解析一次，未配置时返回None）
+    写计数、代用户互动等数据库函数已撤销 anon/authenticated 的执行权限，只能经此客户端调用，
+    不能退回匿名客户端
+    """
+    global supabase_service, _service_client_resolved
+    
+    if not _service_client_resolved:
+        supabase_service = get_supabase_admin_client()
+        _service_client_resolved = True
+    return supabase_service
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """获取数据库调用线程池（有界，大小由DB_EXECUTOR_WORKERS控制）"""
+    global _db_executor
+    
+    if _db_executor is None:
+        _db_executor = ThreadPoolExecutor(
+            max_workers=settings.DB_EXECUTOR_WORKERS,
+            thread_name_prefix="supabase-db"
+        )
+    return _db_executor
+
+async def run_in_db_executor(func: Callable, *args, **kwargs) -> Any:
+    """在数据库线程池中执行阻塞调用（如supabase auth接口）"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), partial(func, *args, **kwargs))
+
+async def execute(query) -> Any:
+    """在数据库线程池中执行PostgREST查询，等价于非阻塞的 query.execute()"""
+    return await run_in_db_executor(query.execute)
+
+def shutdown_db_executor() -> None:
+    """关闭数据库线程池（应用退出时调用）"""
+    global _db_executor
+    
+    if _db_executor is not None:
+        _db_executor.shutdown(wait=True)
+        _db_executor = None
+
 # 依赖注入函数
 async def get_db() -> Client:
     """FastAPI依赖注入：获取数据库客户端"""
     client = get_supabase_client()
     if client is None:
         raise Exception("Database connection not available")
-    return client 
\ No newline at end of file
+    return client 
+
+def quote_filter_value(value) -> str:
+    """为PostgREST逻辑过滤条件(or/and)中的值加引号，避免逗号、括号等保留字符破坏语法"""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+def select_columns(model: Type[BaseModel], *extra: str) -> str:
+    """根据响应模型字段生成select列清单，避免select('*')拉取未使用的大字段"""
+    columns = list(model.model_fields)
+    columns.extend(column for column in extra if column not in columns)
+    return ','.join(columns)
+
+def rpc_select(query, columns: str):
+    """为返回表记录的RPC调用附加列投影"""
+    query.params = query.params.add('select', columns)
+    return query
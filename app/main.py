@@ -6,17 +6,59 @@ from fastapi import FastAPI, Request, HTTPException, Body
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import time
 import logging
 from datetime import datetime
 
 from app.core.config import settings, MobileAPIResponse
 from app.api.api_v1.api import api_router
+from app.core.compression import CompressionMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.db.database import get_supabase_service_client, shutdown_db_executor
+from app.services.concurrency import start_query_timing, format_server_timing
+from app.services.news.view_counter import get_view_counter
+from app.services.news.interaction_writer import get_interaction_writer
+from app.services.news.trending import get_trending_engine
+from app.services.news.categories import get_category_store
+from app.services.auth.account_index import get_account_index
+from app.services.auth.passwords import shutdown_password_executor
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    应用生命周期：预加载分类快照，启动浏览量与互动事件的后台写入、热门榜单刷新及账号索引重建；
+    退出时写入剩余数据并释放数据库线程池与密码哈希进程池
+    """
+    # service-role客户端启动时解析一次；未配置时依赖它的互动与评论接口返回503
+    if get_supabase_service_client() is None:
+        logger.error("SUPABASE_SERVICE_ROLE_KEY not configured, interaction and comment endpoints will return 503")
+    
+    try:
+        await get_category_store().load()
+    except Exception as e:
+        logger.warning(f"Category preload failed, will load on first request: {e}")
+    
+    view_counter = get_view_counter()
+    interaction_writer = get_interaction_writer()
+    trending_engine = get_trending_engine()
+    account_index = get_account_index()
+    view_counter.start()
+    interaction_writer.start()
+    trending_engine.start()
+    account_index.start()
+    yield
+    await account_index.stop()
+    await trending_engine.stop()
+    await interaction_writer.stop()
+    await view_counter.stop()
+    shutdown_db_executor()
+    shutdown_password_executor()
+
 def create_application() -> FastAPI:
     """创建并配置FastAPI应用"""
     
@@ -27,8 +69,13 @@ def create_application() -> FastAPI:
         docs_url="/docs" if settings.DEBUG else None,
         redoc_url="/redoc" if settings.DEBUG else None,
         openapi_url="/openapi.json" if settings.DEBUG else None,
+        lifespan=lifespan,
     )
     
+    # 添加限流中间件 - 令牌桶，位于CORS内层以便429响应带有跨域头
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(RateLimitMiddleware)
+    
     # 添加CORS中间件 - 支持移动端
     app.add_middleware(
         CORSMiddleware,
@@ -36,7 +83,16 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
         allow_headers=["*"],
-        expose_headers=["X-Total-Count", "X-Page-Count"],  # 移动端分页信息
+        expose_headers=["X-Total-Count", "X-Page-Count", "Server-Timing", "ETag"],  # 移动端分页信息
+    )
+    
+    # 添加响应压缩中间件 - brotli/gzip协商
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        cache_ttl=settings.CACHE_TTL_MEDIUM
     )
     
     # 添加信任主机中间件
@@ -50,10 +106,16 @@ def create_application() -> FastAPI:
     @app.middleware("http")
     async def add_process_time_header(request: Request, call_next):
         start_time = time.time()
+        timing_origin = time.perf_counter()
+        query_timings = start_query_timing()
         response = await call_next(request)
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
         
+        # 查询耗时分解，可观察并行查询的重叠情况
+        if query_timings:
+            response.headers["Server-Timing"] = format_server_timing(query_timings, timing_origin)
+        
         # 移动端超时警告
         if process_time > settings.MOBILE_API_TIMEOUT:
             logger.warning(f"Slow API response: {request.url} took {process_time:.2f}s")
@@ -233,54 +295,6 @@ async def mock_user_me():
         "timestamp": int(datetime.utcnow().timestamp())
     }
 
-@app.get("/api/v1/news/{news_id}/comments")
-async def mock_news_comments(news_id: str, page: int = 1, size: int = 10):
-    comments = [
-        {
-            "id": str(i),
-            "news_id": news_id,
-            "user_id": "u1",
-            "username": "testuser",
-            "content": f"这是评论 {i}",
-            "created_at": datetime.utcnow().isoformat() + "Z",
-            "like_count": i
-        }
-        for i in range(1, 6)
-    ]
-    return {
-        "success": True,
-        "code": 200,
-        "message": "获取评论成功",
-        "data": {
-            "items": comments,
-            "total": 5,
-            "page": page,
-            "size": size,
-            "has_next": False
-        },
-        "errors": None,
-        "timestamp": int(datetime.utcnow().timestamp())
-    }
-
-@app.post("/api/v1/news/{news_id}/comments")
-async def mock_add_comment(news_id: str, data: dict = Body(...)):
-    return {
-        "success": True,
-        "code": 200,
-        "message": "评论成功",
-        "data": {
-            "id": "c1",
-            "news_id": news_id,
-            "user_id": "u1",
-            "username": "testuser",
-            "content": data.get("content", "mock 评论内容"),
-            "created_at": datetime.utcnow().isoformat() + "Z",
-            "like_count": 0
-        },
-        "errors": None,
-        "timestamp": int(datetime.utcnow().timestamp())
-    }
-
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,37 @@
+"""
+新闻相关请求模式
+移动端信息流批量查询数据验证
+"""
+from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+
+from app.utils.ids import is_uuid
+
+class InteractionStateRequest(BaseModel):
+    """批量查询互动状态请求"""
+    news_ids: List[str] = Field(..., min_length=1, max_length=100)  # 一屏信息流的新闻ID
+    
+    @validator('news_ids')
+    def unique_news_ids(cls, v):
+        if not all(is_uuid(news_id) for news_id in v):
+            raise ValueError('无效的新闻ID')
+        # 去重并保持顺序
+        return list(dict.fromkeys(v))
+
+class CommentCreateRequest(BaseModel):
+    """发表评论请求"""
+    content: str = Field(..., min_length=1, max_length=1000)
+    parent_id: Optional[str] = None  # 回复的评论ID
+    
+    @validator('content')
+    def content_not_blank(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError('评论内容不能为空')
+        return v
+    
+    @validator('parent_id')
+    def parent_id_is_uuid(cls, v):
+        if v is not None and not is_uuid(v):
+            raise ValueError('无效的评论ID')
+        return v
@@ -34,4 +34,9 @@ class LoginResponse(BaseModel):
 class RegisterResponse(BaseModel):
     """注册响应"""
     user: UserResponse
-    message: str = "注册成功，请查收验证邮件" 
\ No newline at end of file
+    message: str = "注册成功，请查收验证邮件"
+
+class AvailabilityResponse(BaseModel):
+    """用户名/邮箱可用性响应（仅包含请求中提供的字段）"""
+    username: Optional[bool] = None
+    email: Optional[bool] = None
@@ -0,0 +1,173 @@
+"""
+用户名/邮箱占用索引
+启动时（及周期性）将已注册的用户名与邮箱载入布隆过滤器，注册成功后即时加入；
+过滤器判定“一定不存在”时直接返回可用，无需访问数据库，仅“可能存在”时用一次 or_ 查询确认
+多实例部署时其他实例的注册要到下次重建才进入本实例的过滤器，最终以数据库唯一约束兜底
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.db.database import execute, get_supabase_client, quote_filter_value
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+# 重建时每次拉取的行数 (PostgREST默认单次最多返回1000行)
+ACCOUNT_FETCH_PAGE_SIZE = 1000
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+class AccountIndex:
+    """已占用用户名与邮箱的布隆过滤器"""
+
+    def __init__(
+        self,
+        capacity: int = 1000000,
+        error_rate: float = 0.01,
+        db=None,
+        rebuild_interval: float = 3600.0
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.db = db
+        self.rebuild_interval = rebuild_interval
+        self._filter: Optional[BloomFilter] = None
+        self._lock = asyncio.Lock()
+        self._added_during_load: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self.filter_negatives = 0
+        self.db_checks = 0
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    @staticmethod
+    def _key(field: str, value: str) -> str:
+        return f"{field}:{value}"
+
+    def add(self, username: Optional[str] = None, email: Optional[str] = None) -> None:
+        """注册成功后加入过滤器"""
+        keys = []
+        if username:
+            keys.append(self._key('username', username))
+        if email:
+            keys.append(self._key('email', normalize_email(email)))
+        for key in keys:
+            if self._filter is not None:
+                self._filter.add(key)
+            if self._lock.locked():
+                self._added_during_load.append(key)
+
+    def might_exist(self, field: str, value: str) -> bool:
+        """未加载时一律视为可能存在"""
+        return self._filter is None or self._key(field, value) in self._filter
+
+    async def load(self, db=None) -> int:
+        """分页读取全部用户名与邮箱，重建过滤器后整体替换"""
+        async with self._lock:
+            db = db or self.db or get_supabase_client()
+            if db is None:
+                raise RuntimeError("Database connection not available")
+
+            # 按 id 游标分页，每页都走主键索引，避免 OFFSET 逐页扫描已读过的行
+            rows = []
+            last_id = None
+            while True:
+                query = db.table('users').select('id, username, email')
+                if last_id is not None:
+                    query = query.gt('id', last_id)
+                page = (await execute(query.order('id').limit(ACCOUNT_FETCH_PAGE_SIZE))).data
+                rows.extend(page)
+                if len(page) < ACCOUNT_FETCH_PAGE_SIZE:
+                    break
+                last_id = page[-1]['id']
+
+            # 容量至少为现有条目的两倍，为新注册留出余量
+            bloom = BloomFilter(max(self.capacity, 4 * len(rows)), self.error_rate)
+            for row in rows:
+                if row.get('username'):
+                    bloom.add(self._key('username', row['username']))
+                if row.get('email'):
+                    bloom.add(self._key('email', normalize_email(row['email'])))
+            # 重建期间注册的账号可能不在查询结果中，一并加入新过滤器
+            for key in self._added_during_load:
+                bloom.add(key)
+            self._added_during_load.clear()
+            self._filter = bloom
+            self.loaded_at = time.monotonic()
+            return len(rows)
+
+    async def check(self, db, username: Optional[str] = None, email: Optional[str] = None) -> Dict[str, bool]:
+        """返回各字段是否可用；过滤器全部判定不存在时不访问数据库"""
+        values: Dict[str, str] = {}
+        if username is not None:
+            values['username'] = username
+        if email is not None:
+            values['email'] = normalize_email(email)
+
+        available = {field: True for field in values}
+        candidates = {field: value for field, value in values.items() if self.might_exist(field, value)}
+        if not candidates:
+            self.filter_negatives += 1
+            return available
+
+        self.db_checks += 1
+        conditions = ','.join(f'{field}.eq.{quote_filter_value(value)}' for field, value in candidates.items())
+        result = await execute(db.table('users').select('username, email').or_(conditions).limit(len(candidates)))
+        for row in result.data:
+            if 'username' in candidates and row.get('username') == candidates['username']:
+                available['username'] = False
+            if 'email' in candidates and normalize_email(row.get('email') or '') == candidates['email']:
+                available['email'] = False
+        return available
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.load()
+            except Exception as e:
+                logger.warning(f"Account index rebuild failed: {e}")
+            await asyncio.sleep(self.rebuild_interval)
+
+    def start(self) -> None:
+        """启动过滤器加载与周期重建任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "filter_negatives": self.filter_negatives,
+            "db_checks": self.db_checks,
+            "filter": self._filter.stats() if self._filter else None
+        }
+
+# 全局账号索引实例
+_account_index: Optional[AccountIndex] = None
+
+def get_account_index() -> AccountIndex:
+    """获取用户名/邮箱占用索引"""
+    global _account_index
+
+    if _account_index is None:
+        _account_index = AccountIndex(
+            capacity=settings.ACCOUNT_FILTER_CAPACITY,
+            error_rate=settings.ACCOUNT_FILTER_ERROR_RATE,
+            rebuild_interval=settings.ACCOUNT_FILTER_REBUILD_INTERVAL
+        )
+    return _account_index
@@ -2,47 +2,79 @@
 认证服务层
 处理用户注册、登录、令牌管理
 """
+import time
+import uuid
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
-import bcrypt
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from supabase import Client
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.db.database import execute
 from app.schemas.requests.auth import LoginRequest, RegisterRequest
 from app.schemas.responses.auth import TokenResponse, UserResponse, LoginResponse, RegisterResponse
+from app.services.auth.account_index import AccountIndex, get_account_index, normalize_email
+from app.services.auth.credentials import get_credential_backend
+from app.services.auth.profile_cache import get_profile_cache
+from app.services.auth.token_store import get_token_store
+
+# 令牌类型对应的错误提示
+_TOKEN_LABELS = {"access": "访问令牌", "refresh": "刷新令牌"}
+
+def decode_token(token: str, token_type: str = "access") -> Dict[str, Any]:
+    """校验令牌签名、有效期与类型，返回令牌声明"""
+    label = _TOKEN_LABELS[token_type]
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except ExpiredSignatureError:
+        raise ValueError(f"{label}已过期")
+    except InvalidTokenError:
+        raise ValueError(f"无效的{label}")
+    
+    # 访问令牌与刷新令牌不能混用；未携带 jti/sid 的旧令牌无法吊销，不再接受
+    if not payload.get("sub") or payload.get("type") != token_type or not payload.get("jti") or not payload.get("sid"):
+        raise ValueError(f"无效的{label}")
+    return payload
+
+def decode_access_token(access_token: str) -> str:
+    """校验访问令牌的签名与有效期，返回令牌中的用户ID（sub）"""
+    return decode_token(access_token, "access")["sub"]
 
 class AuthService:
-    def __init__(self, db: Client):
+    def __init__(
+        self,
+        db: Client,
+        profile_cache: Optional[TTLCache] = None,
+        account_index: Optional[AccountIndex] = None,
+        token_store=None,
+        credential_backend=None
+    ):
         self.db = db
+        self.credentials = credential_backend if credential_backend is not None else get_credential_backend(db)
+        self.profile_cache = profile_cache if profile_cache is not None else get_profile_cache()
+        self.account_index = account_index if account_index is not None else get_account_index()
+        self.token_store = token_store if token_store is not None else get_token_store()
         
     async def register_user(self, request: RegisterRequest) -> RegisterResponse:
         """用户注册"""
         try:
-            # 检查用户是否已存在
-            existing_user = self.db.table('users').select('*').eq('email', request.email).execute()
-            if existing_user.data:
+            # 检查邮箱与用户名是否已被占用（布隆过滤器判定不存在时不查询数据库）
+            availability = await self.account_index.check(self.db, username=request.username, email=request.email)
+            if not availability['email']:
                 raise ValueError("邮箱已被注册")
-                
-            # 检查用户名是否已存在
-            existing_username = self.db.table('users').select('*').eq('username', request.username).execute()
-            if existing_username.data:
+            if not availability['username']:
                 raise ValueError("用户名已被使用")
             
-            # 使用Supabase Auth注册
-            auth_response = self.db.auth.sign_up({
-                "email": request.email,
-                "password": request.password
-            })
-            
-            if not auth_response.user:
-                raise ValueError("注册失败")
+            # 按配置的凭证后端创建凭证（Supabase Auth 或本地bcrypt哈希）
+            credentials = await self.credentials.create_credentials(request.email, request.password)
             
             # 创建用户资料
             user_data = {
-                "auth_id": auth_response.user.id,
+                **credentials,
                 "username": request.username,
+                "email": normalize_email(request.email),
                 "full_name": request.full_name,
                 "device_id": request.device_id,
                 "push_token": request.push_token,
@@ -54,11 +86,12 @@ class AuthService:
                 }
             }
             
-            user_result = self.db.table('users').insert(user_data).execute()
+            user_result = await execute(self.db.table('users').insert(user_data))
             if not user_result.data:
                 raise ValueError("创建用户资料失败")
             
             user_profile = user_result.data[0]
+            self.account_index.add(username=request.username, email=request.email)
             
             return RegisterResponse(
                 user=UserResponse(
@@ -79,21 +112,8 @@ class AuthService:
     async def login_user(self, request: LoginRequest) -> LoginResponse:
         """用户登录"""
         try:
-            # Supabase Auth登录
-            auth_response = self.db.auth.sign_in_with_password({
-                "email": request.email,
-                "password": request.password
-            })
-            
-            if not auth_response.user:
-                raise ValueError("邮箱或密码错误")
-            
-            # 获取用户资料
-            user_result = self.db.table('users').select('*').eq('auth_id', auth_response.user.id).execute()
-            if not user_result.data:
-                raise ValueError("用户资料不存在")
-            
-            user_profile = user_result.data[0]
+            # 按配置的凭证后端校验并获取用户资料
+            user_profile, is_verified = await self.credentials.authenticate(request.email, request.password)
             
             # 更新设备信息和最后登录时间
             update_data = {"last_login_at": datetime.utcnow().isoformat()}
@@ -102,11 +122,14 @@ class AuthService:
             if request.push_token:
                 update_data["push_token"] = request.push_token
                 
-            self.db.table('users').update(update_data).eq('id', user_profile['id']).execute()
+            await execute(self.db.table('users').update(update_data).eq('id', user_profile['id']))
+            self.profile_cache.delete(user_profile['id'])
             
             # 生成自定义JWT令牌
-            access_token = self._generate_access_token(user_profile['id'])
-            refresh_token = self._generate_refresh_token(user_profile['id'])
+            # 同一次登录签发的令牌共享会话ID，登出时一并吊销
+            session_id = uuid.uuid4().hex
+            access_token = self._generate_access_token(user_profile['id'], session_id)
+            refresh_token = self._generate_refresh_token(user_profile['id'], session_id)
             
             return LoginResponse(
                 token=TokenResponse(
@@ -121,7 +144,7 @@ class AuthService:
                     username=user_profile['username'],
                     full_name=user_profile['full_name'],
                     avatar_url=user_profile.get('avatar_url'),
-                    is_verified=auth_response.user.email_confirmed_at is not None,
+                    is_verified=is_verified,
                     created_at=user_profile['created_at'],
                     preferences=user_profile['preferences']
                 )
@@ -131,94 +154,101 @@ class AuthService:
             raise ValueError(f"登录失败: {str(e)}")
     
     async def refresh_token(self, refresh_token: str) -> TokenResponse:
-        """刷新访问令牌"""
-        try:
-            payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            user_id = payload.get("sub")
-            
-            if not user_id:
-                raise ValueError("无效的刷新令牌")
-            
-            # 验证用户存在
-            user_result = self.db.table('users').select('id').eq('id', user_id).execute()
-            if not user_result.data:
-                raise ValueError("用户不存在")
-            
-            # 生成新的访问令牌
-            new_access_token = self._generate_access_token(user_id)
-            
-            return TokenResponse(
-                access_token=new_access_token,
-                refresh_token=refresh_token,  # 刷新令牌保持不变
-                expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                user_id=user_id
-            )
-            
-        except ExpiredSignatureError:
-            raise ValueError("刷新令牌已过期")
-        except InvalidTokenError:
-            raise ValueError("无效的刷新令牌")
+        """刷新令牌（一次性轮换：旧刷新令牌立即失效，同时签发新的访问令牌与刷新令牌）"""
+        payload = decode_token(refresh_token, "refresh")
+        user_id = payload["sub"]
+        session_id = payload["sid"]
+        
+        if await self.token_store.is_revoked(session_id):
+            raise ValueError("刷新令牌已失效")
+        # 刷新令牌被重复使用说明可能已泄露，吊销整个会话
+        if not await self.token_store.revoke_once(payload["jti"], payload["exp"]):
+            await self._revoke_session(session_id)
+            raise ValueError("刷新令牌已失效")
+        
+        # 验证用户存在
+        user_result = await execute(self.db.table('users').select('id').eq('id', user_id))
+        if not user_result.data:
+            raise ValueError("用户不存在")
+        
+        return TokenResponse(
+            access_token=self._generate_access_token(user_id, session_id),
+            refresh_token=self._generate_refresh_token(user_id, session_id),
+            expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            user_id=user_id
+        )
     
     async def logout_user(self, access_token: str) -> None:
-        """用户登出"""
+        """用户登出（吊销本次登录的会话，访问令牌与刷新令牌同时失效）"""
         try:
-            payload = jwt.decode(access_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            user_id = payload.get("sub")
-            
-            if user_id:
-                # 清理推送令牌
-                self.db.table('users').update({"push_token": None}).eq('id', user_id).execute()
-                
-        except InvalidTokenError:
-            pass  # 登出操作即使令牌无效也应该成功
+            payload = decode_token(access_token, "access")
+        except ValueError:
+            return  # 登出操作即使令牌无效也应该成功
+        
+        user_id = payload["sub"]
+        await self._revoke_session(payload["sid"])
+        self.profile_cache.delete(user_id)
+        # 清理推送令牌
+        await execute(self.db.table('users').update({"push_token": None}).eq('id', user_id))
+    
+    async def _revoke_session(self, session_id: str) -> None:
+        """吊销会话至该会话可能签发的最晚令牌过期时间"""
+        expires_at = time.time() + settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60
+        await self.token_store.revoke(session_id, expires_at)
     
     async def get_current_user(self, access_token: str) -> UserResponse:
-        """获取当前用户信息"""
-        try:
-            payload = jwt.decode(access_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            user_id = payload.get("sub")
-            
-            if not user_id:
-                raise ValueError("无效的访问令牌")
-            
-            user_result = self.db.table('users').select('*').eq('id', user_id).execute()
-            if not user_result.data:
-                raise ValueError("用户不存在")
-            
-            user_profile = user_result.data[0]
-            
-            return UserResponse(
-                id=user_profile['id'],
-                email=user_profile.get('email', ''),
-                username=user_profile['username'],
-                full_name=user_profile['full_name'],
-                avatar_url=user_profile.get('avatar_url'),
-                is_verified=True,  # 假设已验证
-                created_at=user_profile['created_at'],
-                preferences=user_profile['preferences']
-            )
-            
-        except ExpiredSignatureError:
-            raise ValueError("访问令牌已过期")
-        except InvalidTokenError:
-            raise ValueError("无效的访问令牌")
+        """校验访问令牌并获取当前用户信息"""
+        payload = decode_token(access_token, "access")
+        user_id = payload["sub"]
+        if await self.token_store.is_revoked(payload["sid"]):
+            raise ValueError("访问令牌已失效")
+        return await self.get_user_profile(user_id)
     
-    def _generate_access_token(self, user_id: str) -> str:
+    async def get_user_profile(self, user_id: str) -> UserResponse:
+        """按用户ID获取资料（调用方已校验令牌签名、过期时间与吊销状态），命中缓存时不再查询数据库"""
+        cached = self.profile_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
+        user_result = await execute(self.db.table('users').select('*').eq('id', user_id))
+        if not user_result.data:
+            raise ValueError("用户不存在")
+        
+        user_profile = user_result.data[0]
+        
+        user = UserResponse(
+            id=user_profile['id'],
+            email=user_profile.get('email', ''),
+            username=user_profile['username'],
+            full_name=user_profile['full_name'],
+            avatar_url=user_profile.get('avatar_url'),
+            is_verified=True,  # 假设已验证
+            created_at=user_profile['created_at'],
+            preferences=user_profile['preferences']
+        )
+        self.profile_cache.set(user_id, user)
+        return user
+    
+    def _generate_access_token(self, user_id: str, session_id: Optional[str] = None) -> str:
         """生成访问令牌"""
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         payload = {
             "sub": user_id,
             "exp": expire,
-            "type": "access"
+            "type": "access",
+            "jti": uuid.uuid4().hex,
+            "sid": session_id or uuid.uuid4().hex
         }
         return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
-    def _generate_refresh_token(self, user_id: str) -> str:
+    def _generate_refresh_token(self, user_id: str, session_id: Optional[str] = None) -> str:
         """生成刷新令牌"""
         expire = datetime.utcnow() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
         payload = {
             "sub": user_id,
             "exp": expire,
-            "type": "refresh"
+            "type": "refresh",
+            "jti": uuid.uuid4().hex,
+            "sid": session_id or uuid.uuid4().hex
         }
-        return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM) 
\ No newline at end of file
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -0,0 +1,84 @@
+"""
+凭证后端
+AUTH_BACKEND=supabase 时由 Supabase Auth 完成注册与登录；
+AUTH_BACKEND=local 时在 users.password_hash 中保存bcrypt哈希，登录无需外部认证服务往返
+"""
+from typing import Any, Dict, Optional, Tuple
+from supabase import Client
+
+from app.core.config import settings
+from app.db.database import execute, run_in_db_executor
+from app.services.auth.account_index import normalize_email
+from app.services.auth.passwords import hash_password, verify_password, run_in_password_executor
+
+class SupabaseCredentialBackend:
+    """Supabase Auth 凭证后端"""
+
+    name = "supabase"
+
+    def __init__(self, db: Client):
+        self.db = db
+
+    async def create_credentials(self, email: str, password: str) -> Dict[str, Any]:
+        """创建凭证，返回需写入 users 表的字段"""
+        auth_response = await run_in_db_executor(self.db.auth.sign_up, {
+            "email": email,
+            "password": password
+        })
+        if not auth_response.user:
+            raise ValueError("注册失败")
+        return {"auth_id": auth_response.user.id}
+
+    async def authenticate(self, email: str, password: str) -> Tuple[Dict[str, Any], bool]:
+        """校验凭证，返回 (用户资料, 邮箱是否已验证)"""
+        auth_response = await run_in_db_executor(self.db.auth.sign_in_with_password, {
+            "email": email,
+            "password": password
+        })
+        if not auth_response.user:
+            raise ValueError("邮箱或密码错误")
+
+        user_result = await execute(self.db.table('users').select('*').eq('auth_id', auth_response.user.id))
+        if not user_result.data:
+            raise ValueError("用户资料不存在")
+        return user_result.data[0], auth_response.user.email_confirmed_at is not None
+
+class LocalCredentialBackend:
+    """本地bcrypt凭证后端，哈希与校验在进程池中执行"""
+
+    name = "local"
+
+    # 用户不存在时用于校验的哈希，使响应耗时与密码错误一致，避免枚举邮箱
+    _dummy_hashes: Dict[int, str] = {}
+
+    def __init__(self, db: Client, rounds: int = 12):
+        self.db = db
+        self.rounds = rounds
+
+    async def create_credentials(self, email: str, password: str) -> Dict[str, Any]:
+        password_hash = await run_in_password_executor(hash_password, password, self.rounds)
+        return {"password_hash": password_hash}
+
+    async def _dummy_hash(self) -> str:
+        dummy = self._dummy_hashes.get(self.rounds)
+        if dummy is None:
+            dummy = await run_in_password_executor(hash_password, "dummy-password", self.rounds)
+            self._dummy_hashes[self.rounds] = dummy
+        return dummy
+
+    async def authenticate(self, email: str, password: str) -> Tuple[Dict[str, Any], bool]:
+        user_result = await execute(self.db.table('users').select('*').eq('email', normalize_email(email)))
+        user_profile: Optional[Dict[str, Any]] = user_result.data[0] if user_result.data else None
+        password_hash = (user_profile or {}).get('password_hash') or await self._dummy_hash()
+
+        valid = await run_in_password_executor(verify_password, password, password_hash)
+        if user_profile is None or not user_profile.get('password_hash') or not valid:
+            raise ValueError("邮箱或密码错误")
+        # 本地账号没有邮箱验证流程
+        return user_profile, True
+
+def get_credential_backend(db: Client):
+    """按 AUTH_BACKEND 选择凭证后端"""
+    if settings.AUTH_BACKEND == "local":
+        return LocalCredentialBackend(db, rounds=settings.BCRYPT_ROUNDS)
+    return SupabaseCredentialBackend(db)
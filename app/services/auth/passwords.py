@@ -0,0 +1,57 @@
+"""
+密码哈希
+bcrypt 单次哈希/校验约耗费百毫秒级CPU，放在独立进程池中执行，避免阻塞事件循环
+（进程池绕开GIL，多核时登录吞吐随进程数增长）
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+import bcrypt
+
+from app.core.config import settings
+
+# bcrypt 只使用前72字节，显式截断以保持各版本行为一致
+BCRYPT_MAX_BYTES = 72
+
+def _encode(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_BYTES]
+
+def hash_password(password: str, rounds: int = 12) -> str:
+    """生成bcrypt哈希（同步，CPU密集）"""
+    return bcrypt.hashpw(_encode(password), bcrypt.gensalt(rounds=rounds)).decode("ascii")
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """校验密码（同步，CPU密集），哈希格式非法时返回False"""
+    try:
+        return bcrypt.checkpw(_encode(password), password_hash.encode("ascii"))
+    except ValueError:
+        return False
+
+# 密码哈希进程池
+_password_executor: Optional[ProcessPoolExecutor] = None
+
+def get_password_executor() -> ProcessPoolExecutor:
+    """获取密码哈希进程池（spawn启动，避免fork带有线程的服务进程）"""
+    global _password_executor
+
+    if _password_executor is None:
+        _password_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _password_executor
+
+async def run_in_password_executor(func: Callable, *args) -> Any:
+    """在密码哈希进程池中执行（函数与参数需可pickle）"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), func, *args)
+
+def shutdown_password_executor() -> None:
+    """关闭密码哈希进程池（应用退出时调用）"""
+    global _password_executor
+
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=True)
+        _password_executor = None
@@ -0,0 +1,24 @@
+"""
+用户资料缓存
+按令牌 sub（用户ID）缓存解码后的 UserResponse（进程内有界 LRU+TTL），
+已登录请求只需校验JWT签名，命中时无需查询 users 表；登录与登出写 users 表后由 AuthService 显式失效
+多实例部署时其他实例的缓存在TTL到期前可能短暂滞后
+"""
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# 全局用户资料缓存实例
+_profile_cache: Optional[TTLCache] = None
+
+def get_profile_cache() -> TTLCache:
+    """获取用户资料缓存"""
+    global _profile_cache
+
+    if _profile_cache is None:
+        _profile_cache = TTLCache(
+            max_entries=settings.AUTH_PROFILE_CACHE_MAX_ENTRIES,
+            default_ttl=settings.AUTH_PROFILE_CACHE_TTL
+        )
+    return _profile_cache
@@ -0,0 +1,114 @@
+"""
+令牌吊销存储
+每个令牌携带 jti（令牌ID）与 sid（会话ID，同一次登录签发的访问/刷新令牌共享）；
+登出吊销会话，刷新令牌使用一次即吊销其 jti（一次性轮换），重复使用视为泄露并吊销整个会话
+配置REDIS_URL时存于Redis（多实例共享），否则存于进程内结构，条目只在对应令牌过期后清理（从不提前淘汰）；
+请求热路径只做一次哈希查找，不访问数据库
+"""
+import heapq
+import logging
+import time
+from typing import Any, Dict, List, Tuple
+
+import redis.asyncio as aioredis
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class TokenStoreFullError(Exception):
+    """吊销存储已满，无法记录新的一次性令牌"""
+
+class MemoryTokenStore:
+    """
+    进程内吊销集合：ID -> 过期时间戳，按过期时间堆清理
+    条目在令牌过期前从不淘汰（提前淘汰会让已吊销的令牌重新生效）：
+    达到 max_entries 时拒绝记录新的刷新令牌jti（刷新失败，需重新登录），
+    会话吊销（登出、检测到重复使用）仍然记录，不受上限限制
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._revoked: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self.rejected = 0
+
+    def _prune(self, now: float) -> None:
+        """清理已过期的条目"""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, token_id = heapq.heappop(heap)
+            if self._revoked.get(token_id) == expires_at:
+                del self._revoked[token_id]
+
+    async def is_revoked(self, token_id: str) -> bool:
+        expires_at = self._revoked.get(token_id)
+        return expires_at is not None and expires_at > time.time()
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        """吊销至 expires_at（令牌过期后条目无需保留）"""
+        now = time.time()
+        if expires_at <= now:
+            return
+        self._prune(now)
+        if self._revoked.get(token_id, 0.0) < expires_at:
+            self._revoked[token_id] = expires_at
+            heapq.heappush(self._expiry_heap, (expires_at, token_id))
+
+    async def revoke_once(self, token_id: str, expires_at: float) -> bool:
+        """首次吊销返回True，已吊销（重复使用）返回False；存储已满时抛出 TokenStoreFullError"""
+        if await self.is_revoked(token_id):
+            return False
+        self._prune(time.time())
+        if len(self._revoked) >= self.max_entries:
+            self.rejected += 1
+            logger.warning("Token revocation store full, rejecting refresh")
+            raise TokenStoreFullError("令牌吊销存储已满")
+        await self.revoke(token_id, expires_at)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "revoked": len(self._revoked), "rejected": self.rejected}
+
+class RedisTokenStore:
+    """Redis吊销集合：每个ID一个带过期时间的键"""
+
+    backend = "redis"
+
+    def __init__(self, client: aioredis.Redis, namespace: str = "newshub:revoked:"):
+        self.client = client
+        self.namespace = namespace
+
+    async def is_revoked(self, token_id: str) -> bool:
+        # Redis不可用时不放行，避免已吊销的令牌继续生效
+        return bool(await self.client.exists(self.namespace + token_id))
+
+    async def revoke(self, token_id: str, expires_at: float) -> None:
+        ttl = int(expires_at - time.time()) + 1
+        if ttl > 0:
+            await self.client.set(self.namespace + token_id, 1, ex=ttl)
+
+    async def revoke_once(self, token_id: str, expires_at: float) -> bool:
+        ttl = max(int(expires_at - time.time()) + 1, 1)
+        return bool(await self.client.set(self.namespace + token_id, 1, ex=ttl, nx=True))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.backend}
+
+# 全局令牌吊销存储实例
+_token_store = None
+
+def get_token_store():
+    """获取令牌吊销存储：配置REDIS_URL时使用Redis，否则使用进程内存储"""
+    global _token_store
+
+    if _token_store is None:
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            _token_store = RedisTokenStore(redis_client)
+        else:
+            _token_store = MemoryTokenStore(max_entries=settings.TOKEN_STORE_MAX_ENTRIES)
+    return _token_store
@@ -0,0 +1,47 @@
+"""
+服务层并发工具
+并行执行相互独立的数据库往返，并记录每个查询的耗时分解（Server-Timing）
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+# 当前请求的查询耗时记录: (名称, 开始时间, 结束时间)
+_query_timings: ContextVar[Optional[List[Tuple[str, float, float]]]] = ContextVar("query_timings", default=None)
+
+def start_query_timing() -> List[Tuple[str, float, float]]:
+    """为当前请求开启查询耗时记录，返回记录列表"""
+    timings: List[Tuple[str, float, float]] = []
+    _query_timings.set(timings)
+    return timings
+
+async def timed(name: str, awaitable: Awaitable) -> Any:
+    """执行并记录单个查询的耗时"""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings = _query_timings.get()
+        if timings is not None:
+            timings.append((name, start, time.perf_counter()))
+
+async def gather_queries(**queries: Awaitable) -> Dict[str, Any]:
+    """
+    并行执行相互独立的查询，按名称返回结果
+    请求延迟为各查询的最大值而非总和
+    """
+    names = list(queries)
+    results = await asyncio.gather(*(timed(name, queries[name]) for name in names))
+    return dict(zip(names, results))
+
+def format_server_timing(timings: List[Tuple[str, float, float]], origin: float) -> str:
+    """格式化为Server-Timing头：dur为查询耗时，desc为相对请求开始的起止偏移，可看出查询重叠"""
+    entries = []
+    for index, (name, start, end) in enumerate(timings):
+        offset_start = (start - origin) * 1000
+        offset_end = (end - origin) * 1000
+        entries.append(
+            f'{name};dur={(end - start) * 1000:.1f};desc="{index}: +{offset_start:.1f}ms..+{offset_end:.1f}ms"'
+        )
+    return ", ".join(entries)
@@ -0,0 +1,109 @@
+"""
+新闻分类快照
+分类几乎不变，应用启动时加载为不可变快照（带版本ETag），按TTL或管理员触发刷新，
+分类列表接口直接读取快照，无需访问数据库
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.etag import compute_etag, invalidate_etags
+from app.db.database import execute, get_supabase_client, select_columns
+from app.models.news import CategoryPublic
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_COLUMNS = select_columns(CategoryPublic)
+
+class CategorySnapshot:
+    """分类的不可变快照"""
+
+    __slots__ = ('items', 'version', 'loaded_at')
+
+    def __init__(self, items: Tuple[Dict[str, Any], ...], version: str, loaded_at: float):
+        self.items = items
+        self.version = version
+        self.loaded_at = loaded_at
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        return [dict(item) for item in self.items]
+
+class CategoryStore:
+    """持有当前分类快照，超过TTL或管理员刷新时整体替换"""
+
+    def __init__(self, ttl: int = 3600, db=None):
+        self.ttl = ttl
+        self.db = db
+        self._snapshot: Optional[CategorySnapshot] = None
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    @property
+    def snapshot(self) -> Optional[CategorySnapshot]:
+        return self._snapshot
+
+    def _is_fresh(self, snapshot: Optional[CategorySnapshot]) -> bool:
+        return snapshot is not None and time.monotonic() - snapshot.loaded_at <= self.ttl
+
+    async def load(self, db=None) -> CategorySnapshot:
+        """从数据库加载分类并替换快照"""
+        async with self._lock:
+            return await self._load(db)
+
+    async def _load(self, db=None) -> CategorySnapshot:
+        """加载并替换快照（调用方需持有 _lock）"""
+        db = db or self.db or get_supabase_client()
+        if db is None:
+            raise RuntimeError("Database connection not available")
+        result = await execute(db.table('categories').select(CATEGORY_COLUMNS).eq('is_active', True).order('sort_order'))
+        items = tuple(CategoryPublic(**row).model_dump() for row in result.data)
+        previous = self._snapshot
+        self._snapshot = CategorySnapshot(items, compute_etag(list(items), weak=False), time.monotonic())
+        self.loads += 1
+        if previous is not None and previous.version != self._snapshot.version:
+            await invalidate_etags("categories")
+        return self._snapshot
+
+    async def get(self, db=None) -> CategorySnapshot:
+        """获取当前快照，未加载或超过TTL时重新加载"""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+        # 已有其他请求在刷新时先返回旧快照
+        if snapshot is not None and self._lock.locked():
+            return snapshot
+        try:
+            async with self._lock:
+                # 等待锁期间其他请求已完成刷新时直接使用其结果
+                current = self._snapshot
+                if current is not snapshot or self._is_fresh(current):
+                    return current
+                return await self._load(db)
+        except Exception:
+            # 刷新失败时继续使用旧快照
+            if snapshot is None:
+                raise
+            logger.warning("Category refresh failed, serving previous snapshot")
+        return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "version": snapshot.version if snapshot else None,
+            "count": len(snapshot.items) if snapshot else 0,
+            "loads": self.loads
+        }
+
+# 全局分类快照实例
+_category_store: Optional[CategoryStore] = None
+
+def get_category_store() -> CategoryStore:
+    """获取分类快照存储"""
+    global _category_store
+
+    if _category_store is None:
+        _category_store = CategoryStore(ttl=settings.CACHE_TTL_LONG)
+    return _category_store
@@ -0,0 +1,146 @@
+"""
+评论服务层
+顶层评论游标分页、批量回复预览、发表评论（评论数原子递增）
+"""
+from typing import Optional, List, Dict, Any, Tuple
+from dateutil.parser import isoparse
+from supabase import Client
+
+from app.db.database import execute, get_supabase_service_client
+from app.models.news import CommentPublic, CommentListResponse, COMMENT_PUBLIC_LIST_ADAPTER
+from app.utils.ids import is_uuid
+from app.utils.pagination import encode_cursor, decode_cursor
+
+def decode_comment_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    解码评论游标 (created_at, id)，格式非法时抛出 ValueError
+    created_at 的小数秒可能被 Postgres 去掉末尾的0，使用 isoparse 兼容 Python 3.10 及以下
+    """
+    created_at, comment_id = decode_cursor(cursor)
+    try:
+        isoparse(created_at)
+    except (TypeError, ValueError):
+        raise ValueError("无效的分页游标")
+    return created_at, comment_id
+
+class CommentService:
+    def __init__(self, db: Client, service_db: Optional[Client] = None):
+        self.db = db
+        # 评论函数仅对 service_role 开放（用户ID由服务端鉴权后传入），不退回匿名客户端
+        self.service_db = service_db if service_db is not None else get_supabase_service_client()
+
+    async def get_comments(
+        self,
+        news_id: str,
+        size: int = 20,
+        cursor: Optional[str] = None,
+        preview_size: int = 3
+    ) -> CommentListResponse:
+        """
+        获取新闻的顶层评论（按时间倒序，游标分页）
+        整页评论的回复预览一次批量查询获取
+        """
+        if not is_uuid(news_id):
+            raise ValueError("无效的新闻ID")
+        try:
+            params: Dict[str, Any] = {'p_news_id': news_id, 'p_limit': size + 1}
+            if cursor:
+                params['p_before_created_at'], params['p_before_id'] = decode_comment_cursor(cursor)
+
+            rows = (await execute(self.service_db.rpc('get_news_comments', params))).data or []
+            has_next = len(rows) > size
+            rows = rows[:size]
+
+            # 只为有回复的评论获取预览
+            parent_ids = [row['id'] for row in rows if row.get('reply_count')]
+            if parent_ids and preview_size > 0:
+                previews = (await execute(self.service_db.rpc('get_comment_reply_previews', {
+                    'p_parent_ids': parent_ids,
+                    'p_limit': preview_size
+                }))).data or []
+                replies: Dict[str, List[Dict[str, Any]]] = {}
+                for reply in previews:
+                    replies.setdefault(reply['parent_id'], []).append(reply)
+                rows = [{**row, 'replies': replies.get(row['id'], [])} for row in rows]
+
+            next_cursor = None
+            if has_next and rows:
+                next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+
+            return CommentListResponse(
+                items=COMMENT_PUBLIC_LIST_ADAPTER.validate_python(rows),
+                size=size,
+                has_next=has_next,
+                next_cursor=next_cursor
+            )
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise Exception(f"获取评论列表失败: {str(e)}")
+
+    async def get_replies(
+        self,
+        news_id: str,
+        comment_id: str,
+        size: int = 20,
+        cursor: Optional[str] = None
+    ) -> CommentListResponse:
+        """获取新闻下某条评论的回复（按时间正序，游标分页）"""
+        if not is_uuid(news_id) or not is_uuid(comment_id):
+            raise ValueError("无效的新闻或评论ID")
+        try:
+            params: Dict[str, Any] = {
+                'p_news_id': news_id,
+                'p_parent_id': comment_id,
+                'p_limit': size + 1
+            }
+            if cursor:
+                params['p_after_created_at'], params['p_after_id'] = decode_comment_cursor(cursor)
+
+            rows = (await execute(self.service_db.rpc('get_comment_replies', params))).data or []
+            has_next = len(rows) > size
+            rows = rows[:size]
+
+            next_cursor = None
+            if has_next and rows:
+                next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['id'])
+
+            return CommentListResponse(
+                items=COMMENT_PUBLIC_LIST_ADAPTER.validate_python(rows),
+                size=size,
+                has_next=has_next,
+                next_cursor=next_cursor
+            )
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise Exception(f"获取回复列表失败: {str(e)}")
+
+    async def add_comment(
+        self,
+        news_id: str,
+        user_id: str,
+        content: str,
+        parent_id: Optional[str] = None
+    ) -> CommentPublic:
+        """发表评论或回复（数据库函数内原子递增评论数，单次往返）"""
+        if not is_uuid(news_id) or (parent_id is not None and not is_uuid(parent_id)):
+            raise ValueError("新闻或评论不存在")
+        try:
+            result = await execute(self.service_db.rpc('add_news_comment', {
+                'p_news_id': news_id,
+                'p_user_id': user_id,
+                'p_content': content,
+                'p_parent_id': parent_id
+            }))
+            if result.data is None:
+                raise ValueError("新闻或评论不存在")
+
+            return CommentPublic(**result.data)
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise Exception(f"发表评论失败: {str(e)}")
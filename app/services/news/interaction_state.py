@@ -0,0 +1,151 @@
+"""
+用户互动状态缓存
+按用户缓存已点赞/已收藏/已分享的新闻ID集合（进程内LRU），首次访问时一次性加载，
+点赞/收藏/分享操作原地更新，详情页的互动状态查询无需访问数据库
+多实例部署时其他实例的缓存在TTL到期前可能短暂滞后
+"""
+import asyncio
+import sys
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import execute
+
+# 缓存的互动类型
+CACHED_INTERACTION_TYPES = ('like', 'favorite', 'share')
+
+# 加载时每次拉取的行数 (PostgREST默认单次最多返回1000行，超出部分会被静默截断)
+INTERACTION_FETCH_PAGE_SIZE = 1000
+
+NewsKey = Union[bytes, str]
+
+def _news_key(news_id: str) -> NewsKey:
+    """UUID压缩为16字节存储，非UUID按原字符串存储"""
+    try:
+        return uuid.UUID(str(news_id)).bytes
+    except ValueError:
+        return str(news_id)
+
+class UserInteractionState:
+    """单个用户的互动新闻集合"""
+
+    __slots__ = ('sets',)
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = ()):
+        self.sets: Dict[str, Set[NewsKey]] = {t: set() for t in CACHED_INTERACTION_TYPES}
+        for row in rows:
+            if row.get('interaction_type') in self.sets:
+                self.sets[row['interaction_type']].add(_news_key(row['news_id']))
+
+    def lookup(self, news_id: str) -> Dict[str, bool]:
+        """返回与详情页 user_interactions 一致的结构，如 {'like': True}"""
+        key = _news_key(news_id)
+        return {t: True for t, ids in self.sets.items() if key in ids}
+
+    def update(self, news_id: str, interaction_type: str, active: bool) -> None:
+        ids = self.sets.get(interaction_type)
+        if ids is None:
+            return
+        if active:
+            ids.add(_news_key(news_id))
+        else:
+            ids.discard(_news_key(news_id))
+
+    def memory_bytes(self) -> int:
+        total = sys.getsizeof(self.sets)
+        for ids in self.sets.values():
+            total += sys.getsizeof(ids) + sum(sys.getsizeof(key) for key in ids)
+        return total
+
+class InteractionStateCache:
+    """按用户的互动状态LRU缓存"""
+
+    def __init__(self, max_users: int = 10000, ttl: int = 1800):
+        self._states = TTLCache(max_entries=max_users, default_ttl=ttl)
+        # 正在加载的用户（合并并发加载），加载期间发生变更的用户不写入缓存
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._dirty: Set[str] = set()
+
+    async def get(self, db, user_id: str) -> UserInteractionState:
+        """获取用户互动状态，未缓存时从数据库加载（db 须为 service-role 客户端，互动表受RLS保护）"""
+        state = self._states.get(user_id)
+        if state is not None:
+            return state
+
+        loading = self._loading.get(user_id)
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[user_id] = future
+        try:
+            state = UserInteractionState(await self._fetch(db, user_id))
+            if user_id not in self._dirty:
+                self._states.set(user_id, state)
+            future.set_result(state)
+            return state
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 避免无人等待时出现未获取异常的警告
+            future.exception()
+            raise
+        finally:
+            self._loading.pop(user_id, None)
+            self._dirty.discard(user_id)
+
+    async def _fetch(self, db, user_id: str) -> List[Dict[str, Any]]:
+        """按 id 游标分页拉取用户的全部互动记录（避免 OFFSET 逐页扫描已读过的行）"""
+        rows: List[Dict[str, Any]] = []
+        last_id = None
+        while True:
+            query = (
+                db.table('user_news_interactions')
+                .select('id, news_id, interaction_type')
+                .eq('user_id', user_id)
+                .in_('interaction_type', list(CACHED_INTERACTION_TYPES))
+            )
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            page = (await execute(query.order('id').limit(INTERACTION_FETCH_PAGE_SIZE))).data
+            rows.extend(page)
+            if len(page) < INTERACTION_FETCH_PAGE_SIZE:
+                return rows
+            last_id = page[-1]['id']
+
+    def cached(self, user_id: str) -> Optional[UserInteractionState]:
+        """仅读取已缓存的状态，未缓存时返回None而不加载"""
+        return self._states.get(user_id)
+
+    def update(self, user_id: str, news_id: str, interaction_type: str, active: bool) -> None:
+        """互动变更后原地更新已缓存的状态"""
+        if user_id in self._loading:
+            self._dirty.add(user_id)
+        state = self._states.peek(user_id)
+        if state is not None:
+            state.update(news_id, interaction_type, active)
+
+    def invalidate(self, user_id: str) -> None:
+        self._states.delete(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        memory = sum(state.memory_bytes() for state in self._states.values())
+        return {**self._states.stats(), "memory_bytes": memory}
+
+# 全局互动状态缓存实例
+_interaction_state_cache: Optional[InteractionStateCache] = None
+
+def get_interaction_state_cache() -> InteractionStateCache:
+    """获取用户互动状态缓存"""
+    global _interaction_state_cache
+
+    if _interaction_state_cache is None:
+        _interaction_state_cache = InteractionStateCache(
+            max_users=settings.INTERACTION_STATE_MAX_USERS,
+            ttl=settings.CACHE_TTL_MEDIUM
+        )
+    return _interaction_state_cache
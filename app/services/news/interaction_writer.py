@@ -0,0 +1,158 @@
+"""
+用户互动事件异步批量写入
+请求内只将浏览等互动事件放入有界队列，后台任务按批量大小或时间间隔合并为多行upsert写入
+队列已满时丢弃事件并计数（互动记录为非关键数据，不阻塞请求）；应用退出时写入剩余事件
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from postgrest.types import ReturnMethod
+
+from app.core.config import settings
+from app.db.database import execute, get_supabase_service_client
+
+logger = logging.getLogger(__name__)
+
+INTERACTION_CONFLICT_COLUMNS = "user_id,news_id,interaction_type"
+
+class InteractionWriter:
+    """互动事件批量写入器"""
+
+    def __init__(
+        self,
+        db=None,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.last_error: Optional[str] = None
+
+    def record(self, user_id: str, news_id: str, interaction_type: str) -> bool:
+        """记录互动事件（非阻塞），队列已满时丢弃并返回False"""
+        event = {
+            'user_id': user_id,
+            'news_id': news_id,
+            'interaction_type': interaction_type,
+            'created_at': datetime.utcnow().isoformat()
+        }
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    async def _write_batch(self, events: List[Dict[str, Any]]) -> None:
+        """合并同一 (用户, 新闻, 类型) 的重复事件后一次多行upsert"""
+        rows: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for event in events:
+            rows[(event['user_id'], event['news_id'], event['interaction_type'])] = event
+
+        # 互动表受RLS保护，与浏览量写回一样只能经 service-role 客户端写入
+        db = self.db or get_supabase_service_client()
+        try:
+            if db is None:
+                raise RuntimeError("Database connection not available")
+            await execute(db.table('user_news_interactions').upsert(
+                list(rows.values()),
+                on_conflict=INTERACTION_CONFLICT_COLUMNS,
+                returning=ReturnMethod.minimal
+            ))
+            self.written += len(rows)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(events)
+            self.failed_batches += 1
+            self.last_error = str(e)
+            logger.error(f"Interaction batch write failed ({len(events)} events): {e}")
+
+    def _take_ready(self, batch: List[Dict[str, Any]]) -> None:
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                # 凑满批量或到达时间间隔后写入
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                    self._take_ready(batch)
+            except asyncio.CancelledError:
+                # 停止时已取出的事件仍需写入
+                await self._write_batch(batch)
+                raise
+            await self._write_batch(batch)
+
+    async def flush(self) -> None:
+        """写入队列中的全部事件"""
+        while not self.queue.empty():
+            batch: List[Dict[str, Any]] = []
+            self._take_ready(batch)
+            await self._write_batch(batch)
+
+    def start(self) -> None:
+        """启动后台写入任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务并写入剩余事件"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_size": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "last_error": self.last_error
+        }
+
+# 全局互动写入器实例
+_interaction_writer: Optional[InteractionWriter] = None
+
+def get_interaction_writer() -> InteractionWriter:
+    """获取互动事件写入器"""
+    global _interaction_writer
+
+    if _interaction_writer is None:
+        _interaction_writer = InteractionWriter(
+            max_queue_size=settings.INTERACTION_QUEUE_SIZE,
+            batch_size=settings.INTERACTION_BATCH_SIZE,
+            flush_interval=settings.INTERACTION_FLUSH_INTERVAL
+        )
+    return _interaction_writer
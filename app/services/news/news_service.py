@@ -2,15 +2,133 @@
 新闻服务层
 处理新闻获取、搜索、统计、用户互动
 """
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+import re
+from typing import Optional, List, Dict, Any, Tuple
 from supabase import Client
 
-from app.models.news import NewsCategory, NewsPublic, NewsListResponse
+from app.core.config import settings
+from app.core.cache import get_cache
+from app.core.etag import invalidate_etags
+from app.db.database import (
+    execute, quote_filter_value, select_columns, rpc_select, get_supabase_service_client, ServiceClientUnavailableError
+)
+from app.services.concurrency import gather_queries
+from app.services.news.view_counter import get_view_counter
+from app.services.news.interaction_writer import get_interaction_writer
+from app.services.news.trending import get_trending_engine
+from app.services.news.categories import get_category_store, CategorySnapshot
+from app.services.news.trending_windows import get_trending_windows, event_weight
+from app.services.news.interaction_state import (
+    get_interaction_state_cache, UserInteractionState, CACHED_INTERACTION_TYPES
+)
+from app.models.news import (
+    NewsCategory, NewsPublic, NewsDetail, NewsListResponse, to_news_public_list
+)
+from app.utils.pagination import encode_cursor, decode_cursor
+
+# 各响应模型对应的查询列
+NEWS_PUBLIC_COLUMNS = select_columns(NewsPublic)
+NEWS_DETAIL_COLUMNS = select_columns(NewsDetail)
+
+# 新闻列表缓存键前缀
+NEWS_LIST_CACHE_PREFIX = "news:list:"
+# 分类计数缓存键前缀 (入库时失效)
+NEWS_COUNT_CACHE_PREFIX = "news:count:"
+
+def _news_list_cache_key(
+    page: int,
+    size: int,
+    category: Optional[NewsCategory],
+    keyword: Optional[str],
+    sort: str,
+    order: str,
+    cursor: Optional[str] = None,
+    count_mode: str = "exact"
+) -> str:
+    """根据归一化的查询参数生成新闻列表缓存键"""
+    category_key = category.value if category else ""
+    keyword_key = (keyword or "").strip().lower()
+    return (
+        f"{NEWS_LIST_CACHE_PREFIX}{page}:{size}:{category_key}:{sort}:{order}:"
+        f"{count_mode}:{cursor or ''}:{keyword_key}"
+    )
+
+# 中文字符按字切分，与数据库 news_search_tokens() 保持一致
+_CJK_CHAR = re.compile(r'([\u3400-\u9fff\uf900-\ufaff])')
+
+def _search_tokens(keyword: str) -> str:
+    """将关键词切分为全文检索词元（中文按字，英文按词）"""
+    return ' '.join(_CJK_CHAR.sub(r' \1 ', keyword).split())
+
+def _like_pattern(keyword: str) -> str:
+    """
+    子串匹配模式：转义关键词中的LIKE通配符（% _ \\），避免匹配全部行；
+    PostgREST 将 * 视为 %，替换为单字符通配 _
+    """
+    escaped = keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('*', '_')
+    return f'%{escaped}%'
+
+def _keyword_filter(keyword: str) -> str:
+    """关键词筛选：全文检索短语匹配，或标题/摘要子串匹配（走trigram索引）"""
+    pattern = quote_filter_value(_like_pattern(keyword))
+    tokens = quote_filter_value(_search_tokens(keyword))
+    return f'search_vector.phfts(simple).{tokens},title.ilike.{pattern},summary.ilike.{pattern}'
+
+def _apply_list_filters(query, category: Optional[NewsCategory], keyword: Optional[str]):
+    """列表查询与计数查询共用的筛选条件"""
+    # 只显示已发布的新闻
+    query = query.eq('status', 'published')
+    
+    # 分类筛选
+    if category:
+        query = query.eq('category', category.value)
+    
+    # 关键词搜索
+    if keyword:
+        query = query.or_(_keyword_filter(keyword))
+    return query
+
+def _apply_keyset(query, sort: str, desc: bool, sort_value: Any, last_id: str):
+    """
+    按 (排序键, id) 追加游标条件
+    PostgreSQL 默认 DESC 时 NULL 在前、ASC 时 NULL 在后，条件与之保持一致
+    """
+    op = 'lt' if desc else 'gt'
+    quoted_id = quote_filter_value(last_id)
+    if sort_value is None:
+        if desc:
+            return query.or_(f'and({sort}.is.null,id.{op}.{quoted_id}),{sort}.not.is.null')
+        return query.is_(sort, 'null').filter('id', op, last_id)
+    
+    value = quote_filter_value(sort_value)
+    conditions = f'{sort}.{op}.{value},and({sort}.eq.{value},id.{op}.{quoted_id})'
+    if not desc:
+        conditions += f',{sort}.is.null'
+    return query.or_(conditions)
 
 class NewsService:
-    def __init__(self, db: Client):
+    def __init__(
+        self,
+        db: Client,
+        cache=None,
+        view_counter=None,
+        interaction_writer=None,
+        interaction_state=None,
+        trending=None,
+        trending_windows=None,
+        category_store=None,
+        service_db: Optional[Client] = None
+    ):
         self.db = db
+        # 点赞/收藏/分享函数仅对 service_role 开放（用户ID由服务端鉴权后传入），不退回匿名客户端
+        self.service_db = service_db if service_db is not None else get_supabase_service_client()
+        self.cache = cache if cache is not None else get_cache()
+        self.view_counter = view_counter if view_counter is not None else get_view_counter()
+        self.interaction_writer = interaction_writer if interaction_writer is not None else get_interaction_writer()
+        self.interaction_state = interaction_state if interaction_state is not None else get_interaction_state_cache()
+        self.trending = trending if trending is not None else get_trending_engine()
+        self.trending_windows = trending_windows if trending_windows is not None else get_trending_windows()
+        self.category_store = category_store if category_store is not None else get_category_store()
     
     async def get_news_list(
         self,
@@ -19,102 +137,152 @@ class NewsService:
         category: Optional[NewsCategory] = None,
         keyword: Optional[str] = None,
         sort: str = "published_at",
-        order: str = "desc"
+        order: str = "desc",
+        cursor: Optional[str] = None,
+        count_mode: str = "exact"
     ) -> NewsListResponse:
-        """获取新闻列表"""
+        """
+        获取新闻列表（优先读取缓存）
+        传入 cursor 时使用游标分页，忽略 page；否则保持原有的偏移分页
+        sort=relevance 时按关键词全文检索相关度排序（仅支持偏移分页）
+        has_next 由多取一条判断；count_mode 控制总数来源：
+        exact 精确计数，estimated 分类计数缓存/查询计划估算，none 不返回总数
+        """
+        cache_key = _news_list_cache_key(page, size, category, keyword, sort, order, cursor, count_mode)
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            return NewsListResponse.model_validate_json(cached)
+        
         try:
-            # 构建查询
-            query = self.db.table('news').select('*')
-            
-            # 只显示已发布的新闻
-            query = query.eq('status', 'published')
-            
-            # 分类筛选
-            if category:
-                query = query.eq('category', category.value)
-            
-            # 关键词搜索
-            if keyword:
-                query = query.or_(f'title.ilike.%{keyword}%,summary.ilike.%{keyword}%')
-            
-            # 排序
-            if order == "desc":
-                query = query.order(sort, desc=True)
+            if sort == "relevance":
+                # 相关度排序：由数据库函数按全文检索得分排序
+                if not keyword:
+                    raise ValueError("按相关度排序需要提供关键词")
+                if cursor:
+                    raise ValueError("相关度排序不支持游标分页")
+                query = rpc_select(self.db.rpc('search_news', {
+                    'p_keyword': keyword,
+                    'p_category': category.value if category else None,
+                    'p_limit': size + 1,
+                    'p_offset': (page - 1) * size
+                }), NEWS_PUBLIC_COLUMNS)
             else:
-                query = query.order(sort, desc=False)
-            
-            # 分页
-            offset = (page - 1) * size
-            query = query.range(offset, offset + size - 1)
-            
-            # 执行查询
-            result = query.execute()
-            
-            # 获取总数
-            count_query = self.db.table('news').select('id', count='exact')
-            if category:
-                count_query = count_query.eq('category', category.value)
-            if keyword:
-                count_query = count_query.or_(f'title.ilike.%{keyword}%,summary.ilike.%{keyword}%')
-            
-            count_result = count_query.execute()
-            total = count_result.count or 0
+                # 构建查询
+                query = self.db.table('news').select(NEWS_PUBLIC_COLUMNS)
+                query = _apply_list_filters(query, category, keyword)
+                
+                # 排序 (id 作为次级排序键保证顺序稳定)
+                desc = order == "desc"
+                query = query.order(sort, desc=desc).order('id', desc=desc)
+                
+                # 分页：多取一条用于判断是否有下一页，无需计数
+                if cursor:
+                    sort_value, last_id = decode_cursor(cursor)
+                    query = _apply_keyset(query, sort, desc, sort_value, last_id)
+                    query = query.limit(size + 1)
+                else:
+                    offset = (page - 1) * size
+                    query = query.range(offset, offset + size)
+            
+            # 列表查询与总数查询相互独立，并行执行
+            results = await gather_queries(
+                news_page=execute(query),
+                news_count=self._count_news(category, keyword, count_mode)
+            )
+            result = results['news_page']
+            total, total_exact = results['news_count']
+            rows = result.data[:size]
+            has_next = len(result.data) > size
             
             # 转换为响应格式
-            items = []
-            for news_data in result.data:
-                items.append(NewsPublic(
-                    id=news_data['id'],
-                    slug=news_data['slug'],
-                    title=news_data['title'],
-                    summary=news_data.get('summary'),
-                    category=NewsCategory(news_data['category']),
-                    tags=news_data.get('tags', []),
-                    author=news_data.get('author'),
-                    featured_image=news_data.get('featured_image'),
-                    thumbnail_image=news_data.get('thumbnail_image'),
-                    reading_time=news_data.get('reading_time', 0),
-                    view_count=news_data.get('view_count', 0),
-                    like_count=news_data.get('like_count', 0),
-                    created_at=news_data['created_at'],
-                    published_at=news_data.get('published_at')
-                ))
+            items = to_news_public_list(rows)
+            
+            next_cursor = None
+            if has_next and rows and sort != "relevance":
+                next_cursor = encode_cursor(rows[-1].get(sort), rows[-1]['id'])
             
-            return NewsListResponse(
+            response = NewsListResponse(
                 items=items,
                 total=total,
+                total_exact=total_exact,
                 page=page,
                 size=size,
-                has_next=total > page * size
+                has_next=has_next,
+                next_cursor=next_cursor
             )
             
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"获取新闻列表失败: {str(e)}")
+        
+        await self.cache.set(cache_key, response.model_dump_json(), ttl=settings.CACHE_TTL_MEDIUM)
+        return response
+    
+    async def _count_news(
+        self,
+        category: Optional[NewsCategory],
+        keyword: Optional[str],
+        count_mode: str
+    ) -> Tuple[Optional[int], bool]:
+        """按 count_mode 获取列表总数，返回 (总数, 是否精确)"""
+        if count_mode == "none":
+            return None, False
+        
+        if count_mode == "estimated":
+            if keyword:
+                # 关键词筛选无法缓存，使用查询计划估算
+                count_query = self.db.table('news').select('id', count='planned')
+                count_query = _apply_list_filters(count_query, category, keyword)
+                count_result = await execute(count_query.limit(1))
+                return count_result.count or 0, False
+            
+            # 分类计数缓存，入库时失效
+            cache_key = f"{NEWS_COUNT_CACHE_PREFIX}{category.value if category else 'all'}"
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return int(cached), False
+            count_query = self.db.table('news').select('id', count='exact')
+            count_query = _apply_list_filters(count_query, category, None)
+            total = (await execute(count_query.limit(1))).count or 0
+            await self.cache.set(cache_key, str(total), ttl=settings.CACHE_TTL_LONG)
+            return total, False
+        
+        count_query = self.db.table('news').select('id', count='exact')
+        count_query = _apply_list_filters(count_query, category, keyword)
+        count_result = await execute(count_query.limit(1))
+        return count_result.count or 0, True
     
     async def get_news_detail(self, news_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """获取新闻详情"""
         try:
-            # 获取新闻
-            news_result = self.db.table('news').select('*').eq('id', news_id).eq('status', 'published').execute()
+            # 互动表受RLS保护，用户互动状态与点赞等写入一样经 service-role 客户端读取
+            if user_id and self.service_db is None:
+                raise ServiceClientUnavailableError("service-role client not configured")
+            
+            # 获取新闻与用户互动状态（相互独立，并行执行）
+            reads = {
+                'news_detail': execute(self.db.table('news').select(NEWS_DETAIL_COLUMNS).eq('id', news_id).eq('status', 'published'))
+            }
+            if user_id:
+                reads['user_interactions'] = self.interaction_state.get(self.service_db, user_id)
+            read_results = await gather_queries(**reads)
+            
+            news_result = read_results['news_detail']
             if not news_result.data:
                 raise ValueError("新闻不存在")
             
             news_data = news_result.data[0]
             
-            # 增加浏览量
-            self.db.table('news').update({
-                'view_count': news_data['view_count'] + 1
-            }).eq('id', news_id).execute()
-            
-            # 记录用户浏览行为
+            user_interactions = {}
             if user_id:
-                self._record_user_interaction(user_id, news_id, 'view')
+                user_interactions = read_results['user_interactions'].lookup(news_id)
             
-            # 获取用户互动状态
-            user_interactions = {}
+            # 浏览量写入缓冲，周期批量写回数据库
+            pending_views = await self.view_counter.increment(news_id)
+            self.trending_windows.record(news_id, event_weight('view'), news_data['category'])
             if user_id:
-                interactions_result = self.db.table('user_news_interactions').select('interaction_type').eq('user_id', user_id).eq('news_id', news_id).execute()
-                user_interactions = {item['interaction_type']: True for item in interactions_result.data}
+                self._record_user_interaction(user_id, news_id, 'view')
             
             # 构建响应
             return {
@@ -130,7 +298,7 @@ class NewsService:
                 'featured_image': news_data.get('featured_image'),
                 'thumbnail_image': news_data.get('thumbnail_image'),
                 'reading_time': news_data.get('reading_time', 0),
-                'view_count': news_data['view_count'] + 1,  # 返回更新后的浏览量
+                'view_count': news_data['view_count'] + pending_views,  # 含尚未写回的浏览量
                 'like_count': news_data.get('like_count', 0),
                 'comment_count': news_data.get('comment_count', 0),
                 'share_count': news_data.get('share_count', 0),
@@ -140,48 +308,30 @@ class NewsService:
                 'user_interactions': user_interactions  # 用户互动状态
             }
             
-        except ValueError:
+        except (ValueError, ServiceClientUnavailableError):
             raise
         except Exception as e:
             raise Exception(f"获取新闻详情失败: {str(e)}")
     
     async def toggle_news_like(self, news_id: str, user_id: str) -> Dict[str, Any]:
-        """切换新闻点赞状态"""
+        """切换新闻点赞状态（数据库函数内原子完成，单次往返）"""
         try:
-            # 检查新闻是否存在
-            news_result = self.db.table('news').select('id, like_count').eq('id', news_id).execute()
-            if not news_result.data:
+            result = await execute(self.service_db.rpc('toggle_news_like', {
+                'p_news_id': news_id,
+                'p_user_id': user_id
+            }))
+            if result.data is None:
                 raise ValueError("新闻不存在")
             
-            news_data = news_result.data[0]
-            
-            # 检查是否已点赞
-            like_result = self.db.table('user_news_interactions').select('*').eq('user_id', user_id).eq('news_id', news_id).eq('interaction_type', 'like').execute()
-            
-            if like_result.data:
-                # 取消点赞
-                self.db.table('user_news_interactions').delete().eq('user_id', user_id).eq('news_id', news_id).eq('interaction_type', 'like').execute()
-                new_like_count = max(0, news_data['like_count'] - 1)
-                action = "unliked"
-            else:
-                # 添加点赞
-                self.db.table('user_news_interactions').insert({
-                    'user_id': user_id,
-                    'news_id': news_id,
-                    'interaction_type': 'like'
-                }).execute()
-                new_like_count = news_data['like_count'] + 1
-                action = "liked"
-            
-            # 更新新闻点赞数
-            self.db.table('news').update({
-                'like_count': new_like_count
-            }).eq('id', news_id).execute()
-            
+            self.interaction_state.update(user_id, news_id, 'like', result.data['is_liked'])
+            like_weight = event_weight('like')
+            self.trending_windows.record(
+                news_id, like_weight if result.data['is_liked'] else -like_weight, result.data.get('category')
+            )
             return {
-                'action': action,
-                'like_count': new_like_count,
-                'is_liked': action == "liked"
+                'action': result.data['action'],
+                'like_count': result.data['like_count'],
+                'is_liked': result.data['is_liked']
             }
             
         except ValueError:
@@ -190,32 +340,19 @@ class NewsService:
             raise Exception(f"点赞操作失败: {str(e)}")
     
     async def toggle_news_favorite(self, news_id: str, user_id: str) -> Dict[str, Any]:
-        """切换新闻收藏状态"""
+        """切换新闻收藏状态（数据库函数内原子完成，单次往返）"""
         try:
-            # 检查新闻是否存在
-            news_result = self.db.table('news').select('id').eq('id', news_id).execute()
-            if not news_result.data:
+            result = await execute(self.service_db.rpc('toggle_news_favorite', {
+                'p_news_id': news_id,
+                'p_user_id': user_id
+            }))
+            if result.data is None:
                 raise ValueError("新闻不存在")
             
-            # 检查是否已收藏
-            favorite_result = self.db.table('user_news_interactions').select('*').eq('user_id', user_id).eq('news_id', news_id).eq('interaction_type', 'favorite').execute()
-            
-            if favorite_result.data:
-                # 取消收藏
-                self.db.table('user_news_interactions').delete().eq('user_id', user_id).eq('news_id', news_id).eq('interaction_type', 'favorite').execute()
-                action = "unfavorited"
-            else:
-                # 添加收藏
-                self.db.table('user_news_interactions').insert({
-                    'user_id': user_id,
-                    'news_id': news_id,
-                    'interaction_type': 'favorite'
-                }).execute()
-                action = "favorited"
-            
+            self.interaction_state.update(user_id, news_id, 'favorite', result.data['is_favorited'])
             return {
-                'action': action,
-                'is_favorited': action == "favorited"
+                'action': result.data['action'],
+                'is_favorited': result.data['is_favorited']
             }
             
         except ValueError:
@@ -224,29 +361,22 @@ class NewsService:
             raise Exception(f"收藏操作失败: {str(e)}")
     
     async def share_news(self, news_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
-        """分享新闻"""
+        """分享新闻（分享数原子自增并记录分享行为，单次往返）"""
         try:
-            # 检查新闻是否存在
-            news_result = self.db.table('news').select('id, share_count, title').eq('id', news_id).execute()
-            if not news_result.data:
+            result = await execute(self.service_db.rpc('share_news', {
+                'p_news_id': news_id,
+                'p_user_id': user_id
+            }))
+            if result.data is None:
                 raise ValueError("新闻不存在")
             
-            news_data = news_result.data[0]
-            
-            # 更新分享数
-            new_share_count = news_data['share_count'] + 1
-            self.db.table('news').update({
-                'share_count': new_share_count
-            }).eq('id', news_id).execute()
-            
-            # 记录用户分享行为
             if user_id:
-                self._record_user_interaction(user_id, news_id, 'share')
-            
+                self.interaction_state.update(user_id, news_id, 'share', True)
+            self.trending_windows.record(news_id, event_weight('share'), result.data.get('category'))
             return {
-                'share_count': new_share_count,
+                'share_count': result.data['share_count'],
                 'share_url': f"/news/{news_id}",  # 可以根据实际需求生成完整URL
-                'title': news_data['title']
+                'title': result.data['title']
             }
             
         except ValueError:
@@ -254,55 +384,81 @@ class NewsService:
         except Exception as e:
             raise Exception(f"分享操作失败: {str(e)}")
     
-    async def get_categories(self) -> List[Dict[str, Any]]:
-        """获取新闻分类列表"""
+    async def get_interaction_states(self, user_id: str, news_ids: List[str]) -> Dict[str, Dict[str, bool]]:
+        """批量获取用户对多篇新闻的点赞/收藏/分享状态（已缓存时不查询数据库）"""
         try:
-            # 从数据库获取分类
-            categories_result = self.db.table('categories').select('*').eq('is_active', True).order('sort_order').execute()
-            
-            categories = []
-            for cat_data in categories_result.data:
-                categories.append({
-                    'id': cat_data['id'],
-                    'name': cat_data['name'],
-                    'display_name': cat_data['display_name'],
-                    'description': cat_data.get('description'),
-                    'icon_url': cat_data.get('icon_url'),
-                    'color': cat_data.get('color'),
-                    'sort_order': cat_data.get('sort_order', 0)
-                })
-            
-            return categories
-            
+            state = self.interaction_state.cached(user_id)
+            if state is None:
+                # 互动表受RLS保护，经 service-role 客户端读取
+                if self.service_db is None:
+                    raise ServiceClientUnavailableError("service-role client not configured")
+                result = await execute(
+                    self.service_db.table('user_news_interactions')
+                    .select('news_id, interaction_type')
+                    .eq('user_id', user_id)
+                    .in_('news_id', news_ids)
+                    .in_('interaction_type', list(CACHED_INTERACTION_TYPES))
+                )
+                state = UserInteractionState(result.data)
+            
+            states = {}
+            for news_id in news_ids:
+                found = state.lookup(news_id)
+                states[news_id] = {t: found.get(t, False) for t in CACHED_INTERACTION_TYPES}
+            return states
+            
+        except ServiceClientUnavailableError:
+            raise
+        except Exception as e:
+            raise Exception(f"获取互动状态失败: {str(e)}")
+    
+    async def get_category_snapshot(self) -> CategorySnapshot:
+        """获取分类快照（启动时预加载，按TTL刷新）"""
+        try:
+            return await self.category_store.get(self.db)
         except Exception as e:
             raise Exception(f"获取分类列表失败: {str(e)}")
     
-    async def get_trending_news(self, limit: int = 10) -> List[NewsPublic]:
-        """获取热门新闻"""
+    async def get_categories(self) -> List[Dict[str, Any]]:
+        """获取新闻分类列表"""
+        snapshot = await self.get_category_snapshot()
+        return snapshot.as_list()
+    
+    async def get_trending_news(
+        self,
+        limit: int = 10,
+        window: Optional[str] = None,
+        category: Optional[NewsCategory] = None
+    ) -> List[NewsPublic]:
+        """
+        获取热门新闻
+        未指定时间窗口与分类时返回时间衰减热度榜单（后台周期增量刷新）；
+        指定时按滑动窗口计数排行（分类未指定窗口时默认 day），不足时用热度榜单补齐
+        """
         try:
-            # 基于浏览量和点赞数的综合热度排序
-            result = self.db.table('news').select('*').eq('status', 'published').order('view_count', desc=True).order('like_count', desc=True).limit(limit).execute()
-            
-            trending_news = []
-            for news_data in result.data:
-                trending_news.append(NewsPublic(
-                    id=news_data['id'],
-                    slug=news_data['slug'],
-                    title=news_data['title'],
-                    summary=news_data.get('summary'),
-                    category=NewsCategory(news_data['category']),
-                    tags=news_data.get('tags', []),
-                    author=news_data.get('author'),
-                    featured_image=news_data.get('featured_image'),
-                    thumbnail_image=news_data.get('thumbnail_image'),
-                    reading_time=news_data.get('reading_time', 0),
-                    view_count=news_data.get('view_count', 0),
-                    like_count=news_data.get('like_count', 0),
-                    created_at=news_data['created_at'],
-                    published_at=news_data.get('published_at')
-                ))
-            
-            return trending_news
+            # 榜单尚未生成时（如后台任务首次刷新前）同步刷新一次
+            if not self.trending.ready:
+                await self.trending.refresh(self.db)
+            
+            category_value = category.value if category else None
+            if window is None and category_value is None:
+                return self.trending.top(limit)
+            
+            ranked_ids = [news_id for news_id, _ in self.trending_windows.top(window or "day", limit, category_value)]
+            rows = self.trending.candidate_rows(ranked_ids)
+            missing = [news_id for news_id in ranked_ids if news_id not in rows]
+            if missing:
+                result = await execute(self.db.table('news').select(NEWS_PUBLIC_COLUMNS).in_('id', missing).eq('status', 'published'))
+                rows.update({row['id']: row for row in result.data})
+            items = to_news_public_list([rows[news_id] for news_id in ranked_ids if news_id in rows])
+            
+            # 窗口内互动不足（如服务刚启动）时用热度榜单补齐
+            if len(items) < limit:
+                seen = {item.id for item in items}
+                items.extend(
+                    item for item in self.trending.top(limit * 2, category_value) if item.id not in seen
+                )
+            return items[:limit]
             
         except Exception as e:
             raise Exception(f"获取热门新闻失败: {str(e)}")
@@ -328,18 +484,15 @@ class NewsService:
                 "published_at": item.get("published"),
             })
         # 按slug唯一键upsert
-        result = self.db.table("news").upsert(upsert_data, on_conflict="slug").execute()
+        result = await execute(self.db.table("news").upsert(upsert_data, on_conflict="slug"))
+        
+        # 新闻入库后失效列表缓存、分类计数缓存与已知ETag
+        await self.cache.delete_prefix(NEWS_LIST_CACHE_PREFIX)
+        await self.cache.delete_prefix(NEWS_COUNT_CACHE_PREFIX)
+        await invalidate_etags("news_list")
+        await invalidate_etags("news_trending")
         return len(result.data) if hasattr(result, "data") and result.data else 0
 
-    def _record_user_interaction(self, user_id: str, news_id: str, interaction_type: str):
-        """记录用户互动行为"""
-        try:
-            # 使用upsert避免重复记录
-            self.db.table('user_news_interactions').upsert({
-                'user_id': user_id,
-                'news_id': news_id,
-                'interaction_type': interaction_type,
-                'created_at': datetime.utcnow().isoformat()
-            }).execute()
-        except Exception:
-            pass  # 记录失败不影响主要功能 
\ No newline at end of file
+    def _record_user_interaction(self, user_id: str, news_id: str, interaction_type: str) -> None:
+        """记录用户互动行为（放入队列，由后台任务批量写入）"""
+        self.interaction_writer.record(user_id, news_id, interaction_type)
@@ -0,0 +1,231 @@
+"""
+热门新闻排行引擎
+按浏览、点赞、分享与发布时长计算重力衰减热度，周期性增量刷新（只拉取 updated_at 变化的新闻）
+并预先排好名次，/news/trending/hot 直接截取前 limit 条，无需每次全表排序
+"""
+import asyncio
+import heapq
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from dateutil.parser import isoparse
+
+from app.core.config import settings
+from app.core.etag import invalidate_etags
+from app.db.database import execute, get_supabase_client, quote_filter_value, select_columns
+from app.models.news import NewsPublic, to_news_public_list
+
+logger = logging.getLogger(__name__)
+
+# 候选新闻的查询列：公开字段 + 评分与增量刷新所需字段
+TRENDING_COLUMNS = select_columns(NewsPublic, 'share_count', 'status', 'updated_at')
+
+# 增量刷新每次拉取的行数 (PostgREST默认单次最多返回1000行)
+TRENDING_FETCH_PAGE_SIZE = 1000
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """解析数据库时间戳（Postgres 会去掉小数秒末尾的0，Python 3.10 及以下的 fromisoformat 无法解析）"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        moment = isoparse(str(value))
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+class GravityScorer:
+    """
+    重力衰减热度: (浏览*w_v + 点赞*w_l + 分享*w_s + 1) / (发布小时数 + 2) ^ gravity
+    gravity 越大，旧新闻下沉越快
+    """
+
+    def __init__(
+        self,
+        gravity: float = 1.8,
+        view_weight: float = 1.0,
+        like_weight: float = 5.0,
+        share_weight: float = 10.0
+    ):
+        self.gravity = gravity
+        self.view_weight = view_weight
+        self.like_weight = like_weight
+        self.share_weight = share_weight
+
+    def __call__(self, row: Dict[str, Any], now: datetime) -> float:
+        points = (
+            (row.get('view_count') or 0) * self.view_weight
+            + (row.get('like_count') or 0) * self.like_weight
+            + (row.get('share_count') or 0) * self.share_weight
+            + 1
+        )
+        published_at = _parse_timestamp(row.get('published_at') or row.get('created_at')) or now
+        age_hours = max((now - published_at).total_seconds() / 3600, 0.0)
+        return points / math.pow(age_hours + 2, self.gravity)
+
+class TrendingEngine:
+    """维护候选新闻与预排序的热门榜单"""
+
+    def __init__(
+        self,
+        scorer: Optional[Callable[[Dict[str, Any], datetime], float]] = None,
+        db=None,
+        window_hours: int = 168,
+        max_ranked: int = 200,
+        refresh_interval: float = 60.0
+    ):
+        self.scorer = scorer or GravityScorer()
+        self.db = db
+        self.window_hours = window_hours
+        self.max_ranked = max_ranked
+        self.refresh_interval = refresh_interval
+        self._candidates: Dict[str, Dict[str, Any]] = {}
+        self._ranked: List[NewsPublic] = []
+        self._watermark: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.last_refresh: Optional[datetime] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.last_refresh is not None
+
+    def top(self, limit: int, category: Optional[str] = None) -> List[NewsPublic]:
+        """返回热度前 limit 条新闻，可按分类筛选"""
+        if category is None:
+            return self._ranked[:limit]
+        return [item for item in self._ranked if item.category == category][:limit]
+
+    def candidate_rows(self, news_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """从候选集中取新闻数据（时间窗口内发布的新闻）"""
+        return {news_id: self._candidates[news_id] for news_id in news_ids if news_id in self._candidates}
+
+    async def _fetch_changed(self, db, since: datetime) -> List[Dict[str, Any]]:
+        """
+        拉取自上次刷新以来有变化的新闻（首次为时间窗口内全部新闻）
+        按 (updated_at, id) 游标分页，避免 OFFSET 逐页扫描已读过的行；升序时 updated_at 为 NULL 的行排在最后
+        水位回退一个刷新周期：事务提交晚于 updated_at 的行在上次刷新时尚不可见，重叠部分由调用方按 id 去重
+        """
+        rows: List[Dict[str, Any]] = []
+        last_row: Optional[Dict[str, Any]] = None
+        while True:
+            query = db.table('news').select(TRENDING_COLUMNS).gte('published_at', since.isoformat())
+            if self._watermark:
+                overlap = timedelta(seconds=self.refresh_interval)
+                query = query.gte('updated_at', (self._watermark - overlap).isoformat())
+            if last_row is not None:
+                if last_row.get('updated_at') is None:
+                    query = query.is_('updated_at', 'null').gt('id', last_row['id'])
+                else:
+                    value = quote_filter_value(last_row['updated_at'])
+                    last_id = quote_filter_value(last_row['id'])
+                    query = query.or_(
+                        f'updated_at.gt.{value},and(updated_at.eq.{value},id.gt.{last_id}),updated_at.is.null'
+                    )
+            query = query.order('updated_at').order('id').limit(TRENDING_FETCH_PAGE_SIZE)
+            page = (await execute(query)).data
+            rows.extend(page)
+            if len(page) < TRENDING_FETCH_PAGE_SIZE:
+                return rows
+            last_row = page[-1]
+
+    def rank(self, now: datetime) -> List[NewsPublic]:
+        """对全部候选重新评分（热度随时间衰减，需整体重算），保留前 max_ranked 条"""
+        top_rows = heapq.nlargest(
+            self.max_ranked,
+            self._candidates.values(),
+            key=lambda row: self.scorer(row, now)
+        )
+        return to_news_public_list(top_rows)
+
+    async def refresh(self, db=None) -> int:
+        """增量刷新榜单，返回本次变化的新闻数"""
+        async with self._lock:
+            db = db or self.db or get_supabase_client()
+            if db is None:
+                raise RuntimeError("Database connection not available")
+
+            now = datetime.now(timezone.utc)
+            since = now - timedelta(hours=self.window_hours)
+            fetched = await self._fetch_changed(db, since)
+
+            # 水位重叠会重复拉到已处理的行，按 id 比对，只统计内容确有变化的新闻
+            changed = 0
+            for row in fetched:
+                if row.get('status') == 'published':
+                    if self._candidates.get(row['id']) != row:
+                        self._candidates[row['id']] = row
+                        changed += 1
+                elif self._candidates.pop(row['id'], None) is not None:
+                    changed += 1
+                updated_at = _parse_timestamp(row.get('updated_at'))
+                if updated_at and (self._watermark is None or updated_at > self._watermark):
+                    self._watermark = updated_at
+
+            # 移出时间窗口的新闻不再参与排行
+            for news_id in [
+                news_id for news_id, row in self._candidates.items()
+                if (_parse_timestamp(row.get('published_at')) or now) < since
+            ]:
+                del self._candidates[news_id]
+
+            previous_ids = [item.id for item in self._ranked]
+            self._ranked = self.rank(now)
+            self.refreshes += 1
+            self.last_refresh = now
+            if [item.id for item in self._ranked] != previous_ids:
+                await invalidate_etags("news_trending")
+            return changed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Trending refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        """启动周期刷新任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "candidates": len(self._candidates),
+            "ranked": len(self._ranked),
+            "refreshes": self.refreshes,
+            "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None
+        }
+
+# 全局热门排行引擎实例
+_trending_engine: Optional[TrendingEngine] = None
+
+def get_trending_engine() -> TrendingEngine:
+    """获取热门排行引擎，评分参数由配置决定"""
+    global _trending_engine
+
+    if _trending_engine is None:
+        _trending_engine = TrendingEngine(
+            scorer=GravityScorer(
+                gravity=settings.TRENDING_GRAVITY,
+                view_weight=settings.TRENDING_VIEW_WEIGHT,
+                like_weight=settings.TRENDING_LIKE_WEIGHT,
+                share_weight=settings.TRENDING_SHARE_WEIGHT
+            ),
+            window_hours=settings.TRENDING_WINDOW_HOURS,
+            max_ranked=settings.TRENDING_MAX_RANKED,
+            refresh_interval=settings.TRENDING_REFRESH_INTERVAL
+        )
+    return _trending_engine
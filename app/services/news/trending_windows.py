@@ -0,0 +1,119 @@
+"""
+分时间窗口的热门计数
+浏览/点赞/分享事件按权重计入分桶滑动窗口（最近1小时按分钟分桶，今日/本周按小时分桶），
+每个窗口维护滚动合计，过期分桶移出时扣减，查询时无需扫描新闻表
+计数为进程内数据，多实例部署时各实例按自身流量排行
+"""
+import heapq
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# 时间窗口: 名称 -> (分桶秒数, 分桶数量)
+TRENDING_WINDOWS: Dict[str, Tuple[int, int]] = {
+    "hour": (60, 60),
+    "day": (3600, 24),
+    "week": (3600, 168),
+}
+
+class SlidingWindowCounter:
+    """单个时间窗口的分桶计数"""
+
+    def __init__(self, bucket_seconds: int, bucket_count: int):
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = bucket_count
+        self._buckets: Deque[Tuple[int, Dict[str, float]]] = deque()
+        self.totals: Dict[str, float] = {}
+
+    def _expire(self, now: float) -> None:
+        oldest = int(now // self.bucket_seconds) - self.bucket_count + 1
+        while self._buckets and self._buckets[0][0] < oldest:
+            _, counts = self._buckets.popleft()
+            for news_id, value in counts.items():
+                # 取消点赞等负权重可能使合计暂时为负，只在归零时移除
+                remaining = self.totals.get(news_id, 0.0) - value
+                if abs(remaining) > 1e-9:
+                    self.totals[news_id] = remaining
+                else:
+                    self.totals.pop(news_id, None)
+
+    def add(self, news_id: str, value: float, now: float) -> None:
+        self._expire(now)
+        bucket_index = int(now // self.bucket_seconds)
+        if not self._buckets or self._buckets[-1][0] != bucket_index:
+            self._buckets.append((bucket_index, {}))
+        counts = self._buckets[-1][1]
+        counts[news_id] = counts.get(news_id, 0.0) + value
+        self.totals[news_id] = self.totals.get(news_id, 0.0) + value
+
+    def top(self, limit: int, now: float, news_filter=None) -> List[Tuple[str, float]]:
+        self._expire(now)
+        items = self.totals.items()
+        if news_filter is not None:
+            items = [(news_id, score) for news_id, score in items if news_filter(news_id)]
+        return heapq.nlargest(limit, ((news_id, score) for news_id, score in items if score > 0), key=lambda item: item[1])
+
+class TrendingWindows:
+    """各时间窗口的热门计数，支持按分类筛选"""
+
+    def __init__(self, windows: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.counters = {
+            name: SlidingWindowCounter(bucket_seconds, bucket_count)
+            for name, (bucket_seconds, bucket_count) in (windows or TRENDING_WINDOWS).items()
+        }
+        # 新闻ID -> 分类，由事件携带的分类维护
+        self._categories: Dict[str, str] = {}
+        self.events = 0
+
+    def record(self, news_id: str, weight: float, category: Optional[str] = None, now: Optional[float] = None) -> None:
+        """记录一次带权重的互动事件（取消点赞等为负权重）"""
+        now = time.time() if now is None else now
+        if category:
+            self._categories[news_id] = category
+        for counter in self.counters.values():
+            counter.add(news_id, weight, now)
+        self.events += 1
+
+    def top(self, window: str, limit: int, category: Optional[str] = None, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """返回窗口内热度最高的 (新闻ID, 热度)"""
+        now = time.time() if now is None else now
+        news_filter = (lambda news_id: self._categories.get(news_id) == category) if category else None
+        result = self.counters[window].top(limit, now, news_filter)
+        self._prune_categories()
+        return result
+
+    def _prune_categories(self) -> None:
+        """清理已移出所有窗口的新闻分类映射"""
+        active = max(len(counter.totals) for counter in self.counters.values())
+        if len(self._categories) > 2 * active + 1000:
+            self._categories = {
+                news_id: category for news_id, category in self._categories.items()
+                if any(news_id in counter.totals for counter in self.counters.values())
+            }
+
+    def stats(self):
+        return {
+            "events": self.events,
+            "windows": {name: len(counter.totals) for name, counter in self.counters.items()}
+        }
+
+# 全局窗口计数实例
+_trending_windows: Optional[TrendingWindows] = None
+
+def get_trending_windows() -> TrendingWindows:
+    """获取分时间窗口的热门计数"""
+    global _trending_windows
+
+    if _trending_windows is None:
+        _trending_windows = TrendingWindows()
+    return _trending_windows
+
+def event_weight(interaction_type: str) -> float:
+    """互动事件权重，与热度评分的权重配置一致"""
+    return {
+        "view": settings.TRENDING_VIEW_WEIGHT,
+        "like": settings.TRENDING_LIKE_WEIGHT,
+        "share": settings.TRENDING_SHARE_WEIGHT,
+    }.get(interaction_type, 0.0)
@@ -0,0 +1,228 @@
+"""
+新闻浏览量写回缓冲 (write-behind)
+详情页浏览只在内存/Redis中累加，按 VIEW_COUNT_FLUSH_INTERVAL 周期批量写入数据库，
+每篇文章一次原子增量 (increment_news_view_counts)，避免热点行锁与读-改-写丢失计数
+
+持久性取舍：进程内缓冲在进程崩溃时最多丢失一个刷新周期的浏览量（正常退出时会最后刷新一次）；
+Redis缓冲由各实例共享，进程崩溃不丢失未刷新的计数，仅刷新途中崩溃时丢失该批次
+"""
+import asyncio
+import logging
+import uuid
+from typing import Dict, Optional
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.db.database import execute, get_supabase_service_client
+
+logger = logging.getLogger(__name__)
+
+# Redis中待写回计数的哈希键
+VIEW_COUNT_REDIS_KEY = "newshub:views:pending"
+
+class MemoryViewBuffer:
+    """进程内浏览量缓冲"""
+
+    backend = "memory"
+
+    def __init__(self):
+        self._pending: Dict[str, int] = {}
+        self._flushing: Dict[str, int] = {}
+
+    async def increment(self, news_id: str) -> int:
+        """累加一次浏览，返回尚未写入数据库的浏览量"""
+        self._pending[news_id] = self._pending.get(news_id, 0) + 1
+        return self._pending[news_id] + self._flushing.get(news_id, 0)
+
+    async def pending(self, news_id: str) -> int:
+        """尚未写入数据库的浏览量（含正在刷新的部分）"""
+        return self._pending.get(news_id, 0) + self._flushing.get(news_id, 0)
+
+    async def drain(self) -> Dict[str, int]:
+        """取出全部待写回计数"""
+        self._flushing, self._pending = self._pending, {}
+        return dict(self._flushing)
+
+    async def ack(self) -> None:
+        """写回成功，清除正在刷新的计数"""
+        self._flushing = {}
+
+    async def restore(self, counts: Dict[str, int]) -> None:
+        """写回失败，计数放回缓冲等待下次刷新"""
+        for news_id, count in counts.items():
+            self._pending[news_id] = self._pending.get(news_id, 0) + count
+        self._flushing = {}
+
+class RedisViewBuffer:
+    """
+    Redis浏览量缓冲，HINCRBY累加；刷新时先RENAME再读取，刷新期间的新增不受影响
+    Redis不可用时记录日志并改记入进程内缓冲（下次刷新时一并写回），浏览请求不因Redis故障失败
+    """
+
+    backend = "redis"
+
+    def __init__(self, client, key: str = VIEW_COUNT_REDIS_KEY):
+        self.client = client
+        self.key = key
+        self._flushing_key: Optional[str] = None
+        self._fallback = MemoryViewBuffer()
+        self.errors = 0
+
+    async def increment(self, news_id: str) -> int:
+        """HINCRBY 直接返回累加后的计数；刷新期间在同一管道中读取正在刷新的部分，每次浏览仅一次往返"""
+        try:
+            if not self._flushing_key:
+                pending = int(await self.client.hincrby(self.key, news_id, 1))
+            else:
+                pipe = self.client.pipeline()
+                pipe.hincrby(self.key, news_id, 1)
+                pipe.hget(self._flushing_key, news_id)
+                pending, flushing = await pipe.execute()
+                pending = int(pending) + int(flushing or 0)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis view increment failed, buffering in process: {e}")
+            return await self._fallback.increment(news_id)
+        return pending + await self._fallback.pending(news_id)
+
+    async def pending(self, news_id: str) -> int:
+        local = await self._fallback.pending(news_id)
+        keys = [self.key, self._flushing_key] if self._flushing_key else [self.key]
+        try:
+            values = [await self.client.hget(key, news_id) for key in keys]
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis view pending lookup failed: {e}")
+            return local
+        return local + sum(int(value) for value in values if value)
+
+    async def drain(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        flushing_key = f"{self.key}:flushing:{uuid.uuid4().hex}"
+        try:
+            await self.client.rename(self.key, flushing_key)
+            self._flushing_key = flushing_key
+            counts = {news_id: int(count) for news_id, count in (await self.client.hgetall(flushing_key)).items()}
+        except Exception as e:
+            # 键不存在（没有新的浏览）时RENAME报错
+            if "no such key" not in str(e).lower():
+                raise
+        # Redis不可用期间记入进程内缓冲的浏览量一并写回
+        for news_id, count in (await self._fallback.drain()).items():
+            counts[news_id] = counts.get(news_id, 0) + count
+        return counts
+
+    async def ack(self) -> None:
+        await self._fallback.ack()
+        if self._flushing_key:
+            try:
+                await self.client.delete(self._flushing_key)
+            except Exception as e:
+                # 计数已写回，残留的刷新键不会再被读取
+                self.errors += 1
+                logger.warning(f"Redis view flushing key delete failed: {e}")
+            self._flushing_key = None
+
+    async def restore(self, counts: Dict[str, int]) -> None:
+        await self._fallback.ack()
+        try:
+            pipe = self.client.pipeline()
+            for news_id, count in counts.items():
+                pipe.hincrby(self.key, news_id, count)
+            if self._flushing_key:
+                pipe.delete(self._flushing_key)
+            await pipe.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis view restore failed, keeping counts in process: {e}")
+            await self._fallback.restore(counts)
+        self._flushing_key = None
+
+class ViewCounter:
+    """浏览量写回缓冲：累加、查询待写回数、周期刷新"""
+
+    def __init__(self, buffer, db=None, flush_interval: float = 10.0):
+        self.buffer = buffer
+        self.db = db
+        self.flush_interval = flush_interval
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.flushed_views = 0
+        self.flush_failures = 0
+
+    async def increment(self, news_id: str) -> int:
+        """记录一次浏览，返回该新闻尚未写回的浏览量"""
+        return await self.buffer.increment(news_id)
+
+    async def pending(self, news_id: str) -> int:
+        return await self.buffer.pending(news_id)
+
+    async def flush(self) -> int:
+        """将缓冲的浏览量批量写入数据库，返回写回的浏览次数"""
+        async with self._lock:
+            counts = await self.buffer.drain()
+            if not counts:
+                return 0
+            # 写回函数仅对 service_role 开放
+            db = self.db or get_supabase_service_client()
+            try:
+                if db is None:
+                    raise RuntimeError("Database connection not available")
+                await execute(db.rpc('increment_news_view_counts', {'p_counts': counts}))
+            except Exception as e:
+                self.flush_failures += 1
+                logger.warning(f"View count flush failed, will retry: {e}")
+                await self.buffer.restore(counts)
+                return 0
+            await self.buffer.ack()
+            total = sum(counts.values())
+            self.flushed_views += total
+            return total
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"View count flush loop error: {e}")
+
+    def start(self) -> None:
+        """启动周期刷新任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止周期刷新并写回剩余计数"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, object]:
+        result: Dict[str, object] = {
+            "backend": self.buffer.backend,
+            "flush_interval": self.flush_interval,
+            "flushed_views": self.flushed_views,
+            "flush_failures": self.flush_failures
+        }
+        if isinstance(self.buffer, RedisViewBuffer):
+            result["errors"] = self.buffer.errors
+        return result
+
+# 全局浏览量缓冲实例
+_view_counter: Optional[ViewCounter] = None
+
+def get_view_counter() -> ViewCounter:
+    """获取浏览量缓冲：配置REDIS_URL时使用Redis，否则使用进程内缓冲"""
+    global _view_counter
+
+    if _view_counter is None:
+        redis_client = get_redis_client()
+        buffer = RedisViewBuffer(redis_client) if redis_client is not None else MemoryViewBuffer()
+        _view_counter = ViewCounter(buffer, flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL)
+    return _view_counter
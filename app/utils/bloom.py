@@ -0,0 +1,51 @@
+"""
+布隆过滤器
+判断元素“一定不存在”或“可能存在”，不存在的判断无误报；
+位数组大小与哈希次数按预期容量与误报率计算
+"""
+import hashlib
+import math
+from typing import Any, Dict
+
+class BloomFilter:
+    """基于 bytearray 的布隆过滤器（双重哈希生成k个位置）"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity 必须为正数，error_rate 必须在 (0, 1) 之间")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def estimated_error_rate(self) -> float:
+        """按已加入元素数估算当前误报率"""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "capacity": self.capacity,
+            "bits": self.num_bits,
+            "hashes": self.num_hashes,
+            "memory_bytes": len(self._bits),
+            "estimated_error_rate": round(self.estimated_error_rate(), 6)
+        }
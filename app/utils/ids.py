@@ -0,0 +1,15 @@
+"""
+ID校验工具
+数据库主键均为UUID；非法ID在进入查询前拒绝，避免数据库类型转换失败返回500
+"""
+import uuid
+from typing import Any
+
+def is_uuid(value: Any) -> bool:
+    """是否为标准格式的UUID字符串（8-4-4-4-12）"""
+    if not isinstance(value, str) or len(value) != 36:
+        return False
+    try:
+        return str(uuid.UUID(value)) == value.lower()
+    except ValueError:
+        return False
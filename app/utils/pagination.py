@@ -0,0 +1,29 @@
+"""
+分页工具
+游标（keyset）分页的编码与解码
+"""
+import base64
+import json
+from typing import Any, Tuple
+
+from app.utils.ids import is_uuid
+
+# 游标中排序键允许的类型（列值为时间、数字、文本或NULL）
+SORT_VALUE_TYPES = (str, int, float, bool, type(None))
+
+def encode_cursor(sort_value: Any, row_id: str) -> str:
+    """将最后一行的 (排序键, id) 编码为不透明游标"""
+    raw = json.dumps([sort_value, row_id], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """解码游标，格式非法时抛出 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("无效的分页游标")
+    # 游标由客户端回传，id 必须是UUID、排序键必须是标量，才能拼入查询条件
+    if not is_uuid(row_id) or not isinstance(sort_value, SORT_VALUE_TYPES):
+        raise ValueError("无效的分页游标")
+    return sort_value, row_id
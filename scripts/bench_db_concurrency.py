@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+单worker并发吞吐基准测试
+模拟固定延迟的数据库往返，对比同步 .execute() 直接阻塞事件循环
+与经线程池执行 (app.db.database.execute) 时的请求吞吐量
+压测新闻详情接口：每次打开都需查询数据库（计入浏览量），不经响应缓存
+"""
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import httpx
+
+from app.core.config import settings
+
+# 基准测试由单一客户端发出大量请求，需在创建应用前关闭限流，否则超出突发额度后返回429
+settings.RATE_LIMIT_ENABLED = False
+
+from app.main import app
+from app.db.database import get_db
+from app.services.news import news_service
+
+DB_LATENCY = 0.05  # 模拟单次数据库往返 50ms
+CONCURRENCY = 50
+REQUESTS = 200
+NEWS_ID = "00000000-0000-0000-0000-000000000001"
+
+# 详情查询返回的新闻行
+NEWS_ROW = {
+    "id": NEWS_ID,
+    "slug": "bench-news",
+    "title": "基准测试新闻",
+    "category": "technology",
+    "view_count": 0,
+    "created_at": "2024-01-01T00:00:00+00:00"
+}
+
+class FakeQuery:
+    """模拟PostgREST查询构造器：链式调用返回自身，execute() 同步阻塞"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        time.sleep(DB_LATENCY)
+        return type("Result", (), {"data": [dict(NEWS_ROW)], "count": 1})()
+
+class FakeClient:
+    def table(self, name):
+        return FakeQuery()
+
+async def blocking_execute(query):
+    """原实现：在事件循环线程中直接调用同步 execute()"""
+    return query.execute()
+
+async def run_load(label: str) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def one_request():
+            async with semaphore:
+                resp = await client.get(f"/api/v1/news/{NEWS_ID}")
+                assert resp.status_code == 200, resp.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(REQUESTS)))
+        elapsed = time.perf_counter() - start
+    print(f"  {label:<20} {REQUESTS / elapsed:>8.1f} req/s  (总耗时 {elapsed:.2f}s)")
+
+async def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app.dependency_overrides[get_db] = lambda: FakeClient()
+    print(f"🚀 并发吞吐基准 (DB延迟={DB_LATENCY * 1000:.0f}ms, 并发={CONCURRENCY}, 请求数={REQUESTS})")
+
+    threaded_execute = news_service.execute
+    news_service.execute = blocking_execute
+    await run_load("阻塞调用 (before)")
+
+    news_service.execute = threaded_execute
+    await run_load("线程池执行 (after)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+本地凭证登录吞吐基准测试
+并发调用 LocalCredentialBackend.authenticate（用户查询走数据库线程池，bcrypt校验走进程池），
+对比bcrypt在事件循环中直接执行与在进程池中执行时的登录吞吐，
+并记录登录期间事件循环的最大延迟（其他请求被阻塞的时长）
+数据库为内存桩，每次查询模拟固定往返延迟
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from app.core.config import settings
+from app.db.database import shutdown_db_executor
+from app.services.auth import credentials
+from app.services.auth.credentials import LocalCredentialBackend
+from app.services.auth.passwords import (
+    hash_password, run_in_password_executor, get_password_executor, shutdown_password_executor
+)
+
+LOGINS = 32
+EMAIL = "bench@example.com"
+PASSWORD = "benchmark-password"
+DB_LATENCY = 0.002  # 模拟的单次查询往返（秒）
+
+class StubUsersDB:
+    """users 表查询桩：链式调用返回自身，execute 在数据库线程池中阻塞 DB_LATENCY 后返回用户行"""
+
+    def __init__(self, user: dict):
+        self.user = user
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        time.sleep(DB_LATENCY)
+        return SimpleNamespace(data=[self.user])
+
+async def run_inline(func, *args):
+    """改造前的行为：bcrypt直接在事件循环中执行"""
+    return func(*args)
+
+async def measure(name: str, backend: LocalCredentialBackend) -> None:
+    """并发执行 LOGINS 次登录，同时以10ms间隔探测事件循环延迟"""
+    max_lag = 0.0
+    running = True
+
+    async def probe():
+        nonlocal max_lag
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.01)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(backend.authenticate(EMAIL, PASSWORD) for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+    running = False
+    await probe_task
+    assert all(profile['email'] == EMAIL for profile, _ in results)
+    print(f"  {name:<24} {LOGINS / elapsed:>8.1f} 次登录/s   事件循环最大延迟 {max_lag * 1000:>8.1f} ms")
+
+async def main():
+    user = {'id': 'uid', 'email': EMAIL, 'password_hash': hash_password(PASSWORD, settings.BCRYPT_ROUNDS)}
+    backend = LocalCredentialBackend(StubUsersDB(user), rounds=settings.BCRYPT_ROUNDS)
+
+    # 预热进程池（spawn启动子进程）与数据库线程池
+    executor = get_password_executor()
+    await asyncio.gather(*(run_in_password_executor(hash_password, "warmup", 4) for _ in range(executor._max_workers)))
+    await backend.authenticate(EMAIL, PASSWORD)
+
+    print(f"🚀 登录吞吐基准 (bcrypt rounds={settings.BCRYPT_ROUNDS}, logins={LOGINS}, "
+          f"workers={settings.PASSWORD_HASH_WORKERS}, cpus={os.cpu_count()}, db latency={DB_LATENCY * 1000:.0f}ms)")
+    with patch.object(credentials, 'run_in_password_executor', run_inline):
+        await measure("事件循环内校验 (before)", backend)
+    await measure("进程池校验 (after)", backend)
+    shutdown_password_executor()
+    shutdown_db_executor()
+
+if __name__ == "__main__":
+    asyncio.run(main())
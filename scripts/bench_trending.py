@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+热门新闻排行基准测试
+对比原实现（每次请求按 view_count, like_count 全量排序）与预排序榜单截取前 limit 条的吞吐量，
+并给出一次全量重算榜单的耗时（后台刷新开销）
+"""
+import sys
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from app.models.news import to_news_public_list
+from app.services.news.trending import TrendingEngine
+
+CANDIDATES = 20000
+LIMIT = 10
+ROUNDS = 200
+
+def make_rows(count: int):
+    """构造一周内发布的候选新闻"""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        published_at = (now - timedelta(minutes=random.randint(0, 7 * 24 * 60))).isoformat()
+        rows.append({
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "slug": f"news-{i}",
+            "title": f"测试新闻标题 {i}",
+            "category": "technology",
+            "view_count": random.randint(0, 100000),
+            "like_count": random.randint(0, 5000),
+            "share_count": random.randint(0, 1000),
+            "status": "published",
+            "created_at": published_at,
+            "published_at": published_at,
+            "updated_at": published_at,
+        })
+    return rows
+
+def query_sort(rows):
+    """原实现：每次请求对全部已发布新闻排序后取前 limit 条"""
+    ranked = sorted(rows, key=lambda row: (row["view_count"], row["like_count"]), reverse=True)
+    return to_news_public_list(ranked[:LIMIT])
+
+def bench(name: str, func) -> float:
+    func()  # 预热
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    elapsed = time.perf_counter() - start
+    rate = ROUNDS / elapsed
+    print(f"  {name:<28} {rate:>12,.0f} req/s")
+    return rate
+
+def main():
+    random.seed(42)
+    rows = make_rows(CANDIDATES)
+    engine = TrendingEngine()
+    engine._candidates = {row["id"]: row for row in rows}
+
+    start = time.perf_counter()
+    engine._ranked = engine.rank(datetime.now(timezone.utc))
+    rank_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🚀 热门排行基准 (candidates={CANDIDATES}, limit={LIMIT}, rounds={ROUNDS})")
+    before = bench("全量排序 (before)", lambda: query_sort(rows))
+    after = bench("预排序榜单 (after)", lambda: engine.top(LIMIT))
+    print(f"📊 加速比: {after / before:,.0f}x")
+    print(f"⏱️ 后台一次全量重算榜单: {rank_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,13 @@ def create_users_table(supabase):
     CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
     CREATE INDEX IF NOT EXISTS idx_users_device_id ON users(device_id);
 
+    -- 邮箱（注册时小写写入，供注册查重与可用性检查）
+    ALTER TABLE users ADD COLUMN IF NOT EXISTS email VARCHAR(255);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email);
+
+    -- 本地凭证后端 (AUTH_BACKEND=local) 的bcrypt密码哈希
+    ALTER TABLE users ADD COLUMN IF NOT EXISTS password_hash VARCHAR(255);
+
     -- 创建更新时间触发器
     CREATE OR REPLACE FUNCTION update_updated_at_column()
     RETURNS TRIGGER AS $$
@@ -157,6 +164,12 @@ def create_news_table(supabase):
     CREATE INDEX IF NOT EXISTS idx_news_view_count ON news(view_count DESC);
     CREATE INDEX IF NOT EXISTS idx_news_like_count ON news(like_count DESC);
     CREATE INDEX IF NOT EXISTS idx_news_tags ON news USING GIN(tags);
+    -- 游标分页复合索引 (排序键, id)
+    CREATE INDEX IF NOT EXISTS idx_news_published_at_id ON news(published_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_news_view_count_id ON news(view_count DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_news_like_count_id ON news(like_count DESC, id DESC);
+    -- 热门排行增量刷新
+    CREATE INDEX IF NOT EXISTS idx_news_updated_at ON news(updated_at);
 
     -- 更新触发器
     CREATE TRIGGER IF NOT EXISTS update_news_updated_at 
@@ -172,6 +185,83 @@ def create_news_table(supabase):
         print(f"❌ 新闻表创建失败: {e}")
         return False
 
+def create_news_search(supabase):
+    """创建新闻全文检索列、索引、搜索函数及浏览量写回函数"""
+    print("📝 创建新闻全文检索...")
+    
+    sql = """
+    -- 全文检索 (中英文混合)
+    -- 中文按字切分后使用 simple 词典，英文按词切分；短语查询保证中文连续匹配
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+    CREATE OR REPLACE FUNCTION news_search_tokens(input TEXT)
+    RETURNS TEXT AS $$
+        SELECT regexp_replace(coalesce(input, ''), '([\\u3400-\\u9fff\\uf900-\\ufaff])', ' \\1 ', 'g');
+    $$ LANGUAGE sql IMMUTABLE;
+
+    ALTER TABLE news ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', news_search_tokens(title)), 'A') ||
+            setweight(to_tsvector('simple', news_search_tokens(summary)), 'B')
+        ) STORED;
+
+    CREATE INDEX IF NOT EXISTS idx_news_search_vector ON news USING GIN(search_vector);
+    CREATE INDEX IF NOT EXISTS idx_news_title_trgm ON news USING GIN(title gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS idx_news_summary_trgm ON news USING GIN(summary gin_trgm_ops);
+
+    -- 按相关度排序的搜索 (sort=relevance)
+    CREATE OR REPLACE FUNCTION search_news(
+        p_keyword TEXT,
+        p_category TEXT DEFAULT NULL,
+        p_limit INTEGER DEFAULT 20,
+        p_offset INTEGER DEFAULT 0
+    )
+    RETURNS SETOF news AS $$
+        SELECT n.*
+        FROM news n,
+             phraseto_tsquery('simple', news_search_tokens(p_keyword)) q,
+             -- 子串匹配模式：转义关键词中的LIKE通配符，避免 % 或 _ 匹配全部行
+             concat('%', replace(replace(replace(p_keyword, '!', '!!'), '%', '!%'), '_', '!_'), '%') AS p(pattern)
+        WHERE n.status = 'published'
+          AND (p_category IS NULL OR n.category = p_category)
+          AND (
+              n.search_vector @@ q
+              OR n.title ILIKE p.pattern ESCAPE '!'
+              OR n.summary ILIKE p.pattern ESCAPE '!'
+          )
+        ORDER BY ts_rank_cd(n.search_vector, q) + similarity(n.title, p_keyword) DESC,
+                 n.published_at DESC NULLS LAST,
+                 n.id DESC
+        LIMIT p_limit OFFSET p_offset;
+    $$ LANGUAGE sql STABLE;
+
+    -- 浏览量批量写回 (每篇文章一次原子增量)
+    CREATE OR REPLACE FUNCTION increment_news_view_counts(p_counts JSONB)
+    RETURNS INTEGER AS $$
+        WITH updated AS (
+            UPDATE news n
+            SET view_count = n.view_count + c.value::INTEGER
+            FROM jsonb_each_text(p_counts) c
+            WHERE n.id = c.key::UUID AND c.value::INTEGER > 0
+            RETURNING 1
+        )
+        SELECT count(*)::INTEGER FROM updated;
+    $$ LANGUAGE sql SECURITY DEFINER
+    SET search_path = public, pg_temp;
+
+    -- 仅服务端(service_role)可写回浏览量
+    REVOKE EXECUTE ON FUNCTION increment_news_view_counts(JSONB) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION increment_news_view_counts(JSONB) TO service_role;
+    """
+    
+    try:
+        supabase.rpc('exec_sql', {'sql': sql}).execute()
+        print("✅ 新闻全文检索创建成功")
+        return True
+    except Exception as e:
+        print(f"❌ 新闻全文检索创建失败: {e}")
+        return False
+
 def create_user_interactions_table(supabase):
     """创建用户互动表"""
     print("📝 创建用户互动表...")
@@ -192,6 +282,102 @@ def create_user_interactions_table(supabase):
     CREATE INDEX IF NOT EXISTS idx_user_interactions_user_id ON user_news_interactions(user_id);
     CREATE INDEX IF NOT EXISTS idx_user_interactions_news_id ON user_news_interactions(news_id);
     CREATE INDEX IF NOT EXISTS idx_user_interactions_type ON user_news_interactions(interaction_type);
+
+    -- 用户互动原子操作 (存在性检查、互动记录、计数增减在同一事务内完成)
+    CREATE OR REPLACE FUNCTION toggle_news_like(p_news_id UUID, p_user_id UUID)
+    RETURNS JSONB AS $$
+    DECLARE
+        v_rows INTEGER;
+        v_like_count INTEGER;
+        v_category TEXT;
+    BEGIN
+        DELETE FROM user_news_interactions
+        WHERE user_id = p_user_id AND news_id = p_news_id AND interaction_type = 'like';
+        GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+        IF v_rows > 0 THEN
+            UPDATE news SET like_count = GREATEST(like_count - 1, 0)
+            WHERE id = p_news_id
+            RETURNING like_count, category INTO v_like_count, v_category;
+            RETURN jsonb_build_object('action', 'unliked', 'like_count', v_like_count, 'is_liked', false, 'category', v_category);
+        END IF;
+
+        IF NOT EXISTS (SELECT 1 FROM news WHERE id = p_news_id AND status = 'published') THEN
+            RETURN NULL;
+        END IF;
+
+        INSERT INTO user_news_interactions (user_id, news_id, interaction_type)
+        VALUES (p_user_id, p_news_id, 'like')
+        ON CONFLICT (user_id, news_id, interaction_type) DO NOTHING;
+        GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+        IF v_rows > 0 THEN
+            UPDATE news SET like_count = like_count + 1
+            WHERE id = p_news_id
+            RETURNING like_count, category INTO v_like_count, v_category;
+        ELSE
+            SELECT like_count, category INTO v_like_count, v_category FROM news WHERE id = p_news_id;
+        END IF;
+        RETURN jsonb_build_object('action', 'liked', 'like_count', v_like_count, 'is_liked', true, 'category', v_category);
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER
+    SET search_path = public, pg_temp;
+    REVOKE EXECUTE ON FUNCTION toggle_news_like(UUID, UUID) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION toggle_news_like(UUID, UUID) TO service_role;
+
+    CREATE OR REPLACE FUNCTION toggle_news_favorite(p_news_id UUID, p_user_id UUID)
+    RETURNS JSONB AS $$
+    DECLARE
+        v_rows INTEGER;
+    BEGIN
+        DELETE FROM user_news_interactions
+        WHERE user_id = p_user_id AND news_id = p_news_id AND interaction_type = 'favorite';
+        GET DIAGNOSTICS v_rows = ROW_COUNT;
+
+        IF v_rows > 0 THEN
+            RETURN jsonb_build_object('action', 'unfavorited', 'is_favorited', false);
+        END IF;
+
+        IF NOT EXISTS (SELECT 1 FROM news WHERE id = p_news_id AND status = 'published') THEN
+            RETURN NULL;
+        END IF;
+
+        INSERT INTO user_news_interactions (user_id, news_id, interaction_type)
+        VALUES (p_user_id, p_news_id, 'favorite')
+        ON CONFLICT (user_id, news_id, interaction_type) DO NOTHING;
+        RETURN jsonb_build_object('action', 'favorited', 'is_favorited', true);
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER
+    SET search_path = public, pg_temp;
+    REVOKE EXECUTE ON FUNCTION toggle_news_favorite(UUID, UUID) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION toggle_news_favorite(UUID, UUID) TO service_role;
+
+    CREATE OR REPLACE FUNCTION share_news(p_news_id UUID, p_user_id UUID DEFAULT NULL)
+    RETURNS JSONB AS $$
+    DECLARE
+        v_share_count INTEGER;
+        v_title TEXT;
+        v_category TEXT;
+    BEGIN
+        UPDATE news SET share_count = share_count + 1
+        WHERE id = p_news_id AND status = 'published'
+        RETURNING share_count, title, category INTO v_share_count, v_title, v_category;
+
+        IF NOT FOUND THEN
+            RETURN NULL;
+        END IF;
+
+        IF p_user_id IS NOT NULL THEN
+            INSERT INTO user_news_interactions (user_id, news_id, interaction_type)
+            VALUES (p_user_id, p_news_id, 'share')
+            ON CONFLICT (user_id, news_id, interaction_type) DO UPDATE SET created_at = NOW();
+        END IF;
+        RETURN jsonb_build_object('share_count', v_share_count, 'title', v_title, 'category', v_category);
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER
+    SET search_path = public, pg_temp;
+    REVOKE EXECUTE ON FUNCTION share_news(UUID, UUID) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION share_news(UUID, UUID) TO service_role;
     """
     
     try:
@@ -224,6 +410,144 @@ def create_comments_table(supabase):
     CREATE INDEX IF NOT EXISTS idx_comments_user_id ON news_comments(user_id);
     CREATE INDEX IF NOT EXISTS idx_comments_created_at ON news_comments(created_at DESC);
 
+    -- 评论回复数 (顶层评论维护，用于回复预览与分页)
+    ALTER TABLE news_comments ADD COLUMN IF NOT EXISTS reply_count INTEGER DEFAULT 0;
+
+    -- 评论游标分页索引：顶层评论按 (新闻, 时间, id) 倒序，回复按 (父评论, 时间, id) 正序
+    CREATE INDEX IF NOT EXISTS idx_comments_news_top_level ON news_comments(news_id, created_at DESC, id DESC) WHERE parent_id IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_comments_parent_created ON news_comments(parent_id, created_at, id) WHERE parent_id IS NOT NULL;
+
+    -- 顶层评论分页 (keyset，任意页恒定耗时)
+    CREATE OR REPLACE FUNCTION get_news_comments(
+        p_news_id UUID,
+        p_limit INTEGER DEFAULT 20,
+        p_before_created_at TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+        p_before_id UUID DEFAULT NULL
+    )
+    RETURNS TABLE (
+        id UUID, news_id UUID, user_id UUID, parent_id UUID, username TEXT, avatar_url TEXT,
+        content TEXT, like_count INTEGER, reply_count INTEGER, created_at TIMESTAMP WITH TIME ZONE
+    ) AS $$
+        SELECT c.id, c.news_id, c.user_id, c.parent_id, u.username::TEXT, u.avatar_url,
+               c.content, c.like_count, c.reply_count, c.created_at
+        FROM news_comments c
+        LEFT JOIN users u ON u.id = c.user_id
+        WHERE c.news_id = p_news_id
+          AND c.parent_id IS NULL
+          AND (p_before_created_at IS NULL OR (c.created_at, c.id) < (p_before_created_at, p_before_id))
+        ORDER BY c.created_at DESC, c.id DESC
+        LIMIT p_limit;
+    $$ LANGUAGE sql STABLE SECURITY DEFINER
+    SET search_path = public, pg_temp;
+    REVOKE EXECUTE ON FUNCTION get_news_comments(UUID, INTEGER, TIMESTAMP WITH TIME ZONE, UUID) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION get_news_comments(UUID, INTEGER, TIMESTAMP WITH TIME ZONE, UUID) TO service_role;
+
+    -- 批量获取一页顶层评论的回复预览 (每个父评论最早的 p_limit 条)
+    CREATE OR REPLACE FUNCTION get_comment_reply_previews(p_parent_ids UUID[], p_limit INTEGER DEFAULT 3)
+    RETURNS TABLE (
+        id UUID, news_id UUID, user_id UUID, parent_id UUID, username TEXT, avatar_url TEXT,
+        content TEXT, like_count INTEGER, reply_count INTEGER, created_at TIMESTAMP WITH TIME ZONE
+    ) AS $$
+        SELECT r.*
+        FROM unnest(p_parent_ids) AS p(pid)
+        CROSS JOIN LATERAL (
+            SELECT c.id, c.news_id, c.user_id, c.parent_id, u.username::TEXT, u.avatar_url,
+                   c.content, c.like_count, c.reply_count, c.created_at
+            FROM news_comments c
+            LEFT JOIN users u ON u.id = c.user_id
+            WHERE c.parent_id = p.pid
+            ORDER BY c.created_at, c.id
+            LIMIT p_limit
+        ) r;
+    $$ LANGUAGE sql STABLE SECURITY DEFINER
+    SET search_path = public, pg_temp;
+    REVOKE EXECUTE ON FUNCTION get_comment_reply_previews(UUID[], INTEGER) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION get_comment_reply_previews(UUID[], INTEGER) TO service_role;
+
+    -- 单条评论的回复分页 (按时间正序；限定所属新闻)
+    DROP FUNCTION IF EXISTS get_comment_replies(UUID, INTEGER, TIMESTAMP WITH TIME ZONE, UUID);
+    CREATE OR REPLACE FUNCTION get_comment_replies(
+        p_news_id UUID,
+        p_parent_id UUID,
+        p_limit INTEGER DEFAULT 20,
+        p_after_created_at TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+        p_after_id UUID DEFAULT NULL
+    )
+    RETURNS TABLE (
+        id UUID, news_id UUID, user_id UUID, parent_id UUID, username TEXT, avatar_url TEXT,
+        content TEXT, like_count INTEGER, reply_count INTEGER, created_at TIMESTAMP WITH TIME ZONE
+    ) AS $$
+        SELECT c.id, c.news_id, c.user_id, c.parent_id, u.username::TEXT, u.avatar_url,
+               c.content, c.like_count, c.reply_count, c.created_at
+        FROM news_comments c
+        LEFT JOIN users u ON u.id = c.user_id
+        WHERE c.news_id = p_news_id
+          AND c.parent_id = p_parent_id
+          AND (p_after_created_at IS NULL OR (c.created_at, c.id) > (p_after_created_at, p_after_id))
+        ORDER BY c.created_at, c.id
+        LIMIT p_limit;
+    $$ LANGUAGE sql STABLE SECURITY DEFINER
+    SET search_path = public, pg_temp;
+    REVOKE EXECUTE ON FUNCTION get_comment_replies(UUID, UUID, INTEGER, TIMESTAMP WITH TIME ZONE, UUID) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION get_comment_replies(UUID, UUID, INTEGER, TIMESTAMP WITH TIME ZONE, UUID) TO service_role;
+
+    -- 发表评论：写入评论并原子递增新闻评论数与父评论回复数
+    -- 回复的回复挂在同一顶层评论下 (两级结构)；新闻或父评论不存在时返回 NULL
+    CREATE OR REPLACE FUNCTION add_news_comment(
+        p_news_id UUID,
+        p_user_id UUID,
+        p_content TEXT,
+        p_parent_id UUID DEFAULT NULL
+    )
+    RETURNS JSONB AS $$
+    DECLARE
+        v_root_id UUID;
+        v_comment news_comments%ROWTYPE;
+        v_username TEXT;
+        v_avatar_url TEXT;
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM news WHERE id = p_news_id AND status = 'published') THEN
+            RETURN NULL;
+        END IF;
+
+        IF p_parent_id IS NOT NULL THEN
+            SELECT coalesce(c.parent_id, c.id) INTO v_root_id
+            FROM news_comments c
+            WHERE c.id = p_parent_id AND c.news_id = p_news_id;
+            IF v_root_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+        END IF;
+
+        INSERT INTO news_comments (news_id, user_id, parent_id, content)
+        VALUES (p_news_id, p_user_id, v_root_id, p_content)
+        RETURNING * INTO v_comment;
+
+        UPDATE news SET comment_count = comment_count + 1 WHERE id = p_news_id;
+        IF v_root_id IS NOT NULL THEN
+            UPDATE news_comments SET reply_count = reply_count + 1 WHERE id = v_root_id;
+        END IF;
+
+        SELECT u.username, u.avatar_url INTO v_username, v_avatar_url FROM users u WHERE u.id = p_user_id;
+
+        RETURN jsonb_build_object(
+            'id', v_comment.id,
+            'news_id', v_comment.news_id,
+            'user_id', v_comment.user_id,
+            'parent_id', v_comment.parent_id,
+            'username', v_username,
+            'avatar_url', v_avatar_url,
+            'content', v_comment.content,
+            'like_count', v_comment.like_count,
+            'reply_count', v_comment.reply_count,
+            'created_at', v_comment.created_at
+        );
+    END;
+    $$ LANGUAGE plpgsql SECURITY DEFINER
+    SET search_path = public, pg_temp;
+    REVOKE EXECUTE ON FUNCTION add_news_comment(UUID, UUID, TEXT, UUID) FROM PUBLIC, anon, authenticated;
+    GRANT EXECUTE ON FUNCTION add_news_comment(UUID, UUID, TEXT, UUID) TO service_role;
+
     -- 更新触发器
     CREATE TRIGGER IF NOT EXISTS update_comments_updated_at 
     BEFORE UPDATE ON news_comments
@@ -380,6 +704,7 @@ def main():
         ("创建用户表", create_users_table),
         ("创建分类表", create_categories_table), 
         ("创建新闻表", create_news_table),
+        ("创建全文检索", create_news_search),
         ("创建互动表", create_user_interactions_table),
         ("创建评论表", create_comments_table),
         ("设置安全策略", setup_rls_policies),
@@ -0,0 +1,103 @@
+import pytest
+from app.api import deps
+from app.core import cache, compression, etag, rate_limit
+from app.services.auth import profile_cache, account_index, token_store
+from app.services.news import view_counter, interaction_writer, interaction_state, trending, trending_windows, categories
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """每个测试使用独立的进程内缓存（含渲染后的响应体与压缩统计）"""
+    cache._cache = cache.MemoryCache()
+    etag._rendered_bodies.clear()
+    compression.compression_stats.endpoints.clear()
+    yield cache._cache
+    cache._cache = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter():
+    """每个测试使用独立的进程内令牌桶（含令牌到用户ID的缓存）"""
+    rate_limit._rate_limiter = None
+    rate_limit._token_subjects.clear()
+    yield
+    rate_limit._rate_limiter = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_view_counter():
+    """每个测试使用独立的进程内浏览量缓冲"""
+    view_counter._view_counter = view_counter.ViewCounter(view_counter.MemoryViewBuffer())
+    yield view_counter._view_counter
+    view_counter._view_counter = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_interaction_writer():
+    """每个测试使用独立的互动事件队列"""
+    interaction_writer._interaction_writer = interaction_writer.InteractionWriter(db=None)
+    yield interaction_writer._interaction_writer
+    interaction_writer._interaction_writer = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_interaction_state():
+    """每个测试使用独立的用户互动状态缓存"""
+    interaction_state._interaction_state_cache = interaction_state.InteractionStateCache()
+    yield interaction_state._interaction_state_cache
+    interaction_state._interaction_state_cache = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_trending():
+    """每个测试使用独立的热门排行引擎"""
+    trending._trending_engine = trending.TrendingEngine()
+    yield trending._trending_engine
+    trending._trending_engine = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_trending_windows():
+    """每个测试使用独立的窗口计数"""
+    trending_windows._trending_windows = trending_windows.TrendingWindows()
+    yield trending_windows._trending_windows
+    trending_windows._trending_windows = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_category_store():
+    """每个测试使用独立的分类快照"""
+    categories._category_store = categories.CategoryStore()
+    yield categories._category_store
+    categories._category_store = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_profile_cache():
+    """每个测试使用独立的用户资料缓存"""
+    profile_cache._profile_cache = None
+    yield profile_cache.get_profile_cache()
+    profile_cache._profile_cache = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_rejected_tokens():
+    """每个测试使用独立的无效令牌缓存"""
+    deps._rejected_tokens = None
+    yield deps.get_rejected_tokens()
+    deps._rejected_tokens = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_account_index():
+    """每个测试使用独立的账号索引（未加载）"""
+    account_index._account_index = account_index.AccountIndex(capacity=1000)
+    yield account_index._account_index
+    account_index._account_index = None
+
+
+@pytest.fixture(autouse=True)
+def fresh_token_store():
+    """每个测试使用独立的进程内令牌吊销集合"""
+    token_store._token_store = token_store.MemoryTokenStore()
+    yield token_store._token_store
+    token_store._token_store = None
@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.core.config import settings
+from app.main import app
+from app.services.auth.auth_service import AuthService
+
+def bearer(token):
+    return HTTPAuthorizationCredentials(scheme='Bearer', credentials=token)
+
+@pytest.mark.asyncio
+async def test_current_user_from_claims():
+    db = MagicMock()
+    token = AuthService(db)._generate_access_token('uid')
+    user = await deps.get_current_user(bearer(token), db)
+    assert user.id == 'uid'
+    db.table.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_refresh_token_rejected():
+    token = AuthService(MagicMock())._generate_refresh_token('uid')
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_user(bearer(token), MagicMock())
+    assert exc.value.status_code == 401
+
+def test_rejected_token_cached():
+    with pytest.raises(ValueError):
+        deps.verify_token('not-a-jwt')
+    with patch('app.api.deps.decode_token') as decode:
+        with pytest.raises(ValueError):
+            deps.verify_token('not-a-jwt')
+        decode.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_optional_user():
+    assert await deps.get_optional_user(None, MagicMock()) is None
+    assert await deps.get_optional_user(bearer('bad'), MagicMock()) is None
+
+@pytest.mark.asyncio
+async def test_profile_loaded_lazily_once():
+    user = deps.CurrentUser('uid', 'token', MagicMock())
+    with patch('app.api.deps.AuthService') as auth_service:
+        auth_service.return_value.get_user_profile = AsyncMock(return_value=MagicMock(id='uid'))
+        await user.profile()
+        await user.profile()
+        auth_service.return_value.get_user_profile.assert_awaited_once_with('uid')
+
+@pytest.mark.asyncio
+async def test_revoked_session_rejected():
+    service = AuthService(MagicMock())
+    token = service._generate_access_token('uid', 'sid1')
+    await service._revoke_session('sid1')
+    with pytest.raises(HTTPException) as exc:
+        await deps.get_current_user(bearer(token), MagicMock())
+    assert exc.value.status_code == 401
+    assert await deps.get_optional_user(bearer(token), MagicMock()) is None
+
+def test_metrics_requires_admin_key(monkeypatch):
+    client = TestClient(app)
+    # 未配置管理密钥时不可访问
+    assert client.get('/api/v1/metrics').status_code == 403
+    monkeypatch.setattr(settings, 'ADMIN_API_KEY', 'secret')
+    assert client.get('/api/v1/metrics', headers={'X-Admin-Key': 'wrong'}).status_code == 403
+    resp = client.get('/api/v1/metrics', headers={'X-Admin-Key': 'secret'})
+    assert resp.status_code == 200
+    assert 'token_store' in resp.json()['data']
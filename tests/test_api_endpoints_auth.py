@@ -2,6 +2,11 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock, AsyncMock
 from app.main import app
+from app.db.database import get_db
+from app.schemas.responses.auth import UserResponse
+from app.services.auth.account_index import get_account_index
+from app.services.auth.auth_service import AuthService
+from app.utils.bloom import BloomFilter
 
 client = TestClient(app)
 
@@ -25,4 +30,33 @@ def test_register_fail(mock_auth_service):
     resp = client.post('/api/v1/auth/register', json={
         'email': 'a@b.com', 'username': 'u', 'password': 'p'
     })
-    assert resp.status_code >= 400 
\ No newline at end of file
+    assert resp.status_code >= 400 
+
+@pytest.fixture
+def db_override():
+    db = MagicMock()
+    app.dependency_overrides[get_db] = lambda: db
+    yield db
+    app.dependency_overrides.clear()
+
+def test_availability_requires_field(db_override):
+    assert client.get('/api/v1/auth/availability').status_code == 400
+
+def test_availability_filter_negative(db_override):
+    get_account_index()._filter = BloomFilter(capacity=100)
+    resp = client.get('/api/v1/auth/availability', params={'username': 'newuser'})
+    assert resp.status_code == 200
+    assert resp.json()['data'] == {'username': True}
+    db_override.table.assert_not_called()
+
+def test_profile_uses_current_user_dependency(db_override, fresh_profile_cache):
+    token = AuthService(db_override)._generate_access_token('uid')
+    fresh_profile_cache.set('uid', UserResponse(
+        id='uid', email='a@b.com', username='u', created_at='2024-01-01T00:00:00', preferences={}
+    ))
+    resp = client.get('/api/v1/auth/profile', headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 200
+    assert resp.json()['data']['username'] == 'u'
+    # 令牌只校验一次，资料命中缓存时不查询 users 表
+    db_override.table.assert_not_called()
+    assert client.get('/api/v1/auth/profile', headers={'Authorization': 'Bearer bad'}).status_code == 401
@@ -1,5 +1,124 @@
 import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock, MagicMock
+from app.api import deps
 from app.api.api_v1.endpoints import news
+from app.db.database import get_db
+from app.main import app
+from app.core.config import settings
+from app.services.auth.auth_service import AuthService
  
 def test_news_endpoint_import():
-    assert hasattr(news, '__file__') or True  # 模块可导入 
\ No newline at end of file
+    assert hasattr(news, '__file__') or True  # 模块可导入
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    app.dependency_overrides[deps.get_service_db] = lambda: MagicMock()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+def test_categories_served_from_snapshot(client):
+    db = MagicMock()
+    db.table.return_value = db
+    db.select.return_value = db
+    db.eq.return_value = db
+    db.order.return_value = db
+    db.execute.return_value = MagicMock(data=[{'id': '1', 'name': 'technology', 'display_name': '科技'}])
+    app.dependency_overrides[get_db] = lambda: db
+    first = client.get('/api/v1/news/categories/list')
+    assert first.status_code == 200
+    assert first.json()['data'][0]['name'] == 'technology'
+    etag = first.headers['etag']
+    
+    second = client.get('/api/v1/news/categories/list', headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.content == b''
+    third = client.get('/api/v1/news/categories/list')
+    assert third.headers['etag'] == etag
+    # 快照加载后不再访问数据库
+    assert db.execute.call_count == 1
+
+def test_refresh_categories_requires_admin_key(client, monkeypatch):
+    monkeypatch.setattr(settings, 'ADMIN_API_KEY', 'secret')
+    assert client.post('/api/v1/news/categories/refresh').status_code == 403
+    assert client.post('/api/v1/news/categories/refresh', headers={'X-Admin-Key': 'wrong'}).status_code == 403
+
+@patch('app.api.api_v1.endpoints.news.NewsService')
+def test_bulk_interaction_states(mock_news_service, client):
+    news_id = '00000000-0000-4000-8000-000000000001'
+    states = {news_id: {'like': True, 'favorite': False, 'share': False}}
+    mock_news_service.return_value.get_interaction_states = AsyncMock(return_value=states)
+    token = AuthService(MagicMock())._generate_access_token('uid')
+    resp = client.post('/api/v1/news/interactions/state', json={'news_ids': [news_id, news_id]},
+                       headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 200
+    assert resp.json()['data']['states'] == states
+    mock_news_service.return_value.get_interaction_states.assert_awaited_once_with('uid', [news_id])
+
+def test_bulk_interaction_states_without_service_client(client, monkeypatch):
+    # 未配置 service-role 密钥时返回503，而不是全部为 false 的状态
+    del app.dependency_overrides[deps.get_service_db]
+    monkeypatch.setattr(deps, 'get_supabase_service_client', lambda: None)
+    token = AuthService(MagicMock())._generate_access_token('uid')
+    resp = client.post('/api/v1/news/interactions/state', json={'news_ids': ['00000000-0000-4000-8000-000000000001']},
+                       headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 503
+
+def test_bulk_interaction_states_limit(client):
+    token = AuthService(MagicMock())._generate_access_token('uid')
+    resp = client.post('/api/v1/news/interactions/state',
+                       json={'news_ids': [f'00000000-0000-4000-8000-{i:012d}' for i in range(101)]},
+                       headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 422
+
+def test_bulk_interaction_states_invalid_ids(client):
+    token = AuthService(MagicMock())._generate_access_token('uid')
+    resp = client.post('/api/v1/news/interactions/state', json={'news_ids': ['n1']},
+                       headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 422
+
+@patch('app.api.api_v1.endpoints.news.NewsService')
+def test_like_news_uses_token_claims(mock_news_service, client):
+    db = MagicMock()
+    app.dependency_overrides[get_db] = lambda: db
+    mock_news_service.return_value.toggle_news_like = AsyncMock(return_value={'liked': True})
+    token = AuthService(db)._generate_access_token('uid')
+    resp = client.post('/api/v1/news/n1/like', headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 200
+    mock_news_service.return_value.toggle_news_like.assert_awaited_once_with('n1', 'uid')
+    # 身份来自令牌声明，不查询 users 表
+    db.table.assert_not_called()
+
+def test_like_news_invalid_token(client):
+    resp = client.post('/api/v1/news/n1/like', headers={'Authorization': 'Bearer token'})
+    assert resp.status_code == 401
+
+def test_share_news_without_service_client(client, monkeypatch):
+    # 未配置 service-role 密钥时明确返回503，而不是以匿名客户端调用
+    del app.dependency_overrides[deps.get_service_db]
+    monkeypatch.setattr(deps, 'get_supabase_service_client', lambda: None)
+    resp = client.post('/api/v1/news/n1/share')
+    assert resp.status_code == 503
+
+@patch('app.api.api_v1.endpoints.news.NewsService')
+def test_share_news_anonymous(mock_news_service, client):
+    mock_news_service.return_value.share_news = AsyncMock(return_value={'share_count': 1})
+    resp = client.post('/api/v1/news/n1/share')
+    assert resp.status_code == 200
+    mock_news_service.return_value.share_news.assert_awaited_once_with('n1', None)
+
+def test_comment_replies_invalid_cursor(client):
+    news_id = '00000000-0000-4000-8000-000000000001'
+    comment_id = '00000000-0000-4000-8000-000000000002'
+    resp = client.get(f'/api/v1/news/{news_id}/comments/{comment_id}/replies', params={'cursor': 'bogus'})
+    assert resp.status_code == 400
+    resp = client.get(f'/api/v1/news/{news_id}/comments/not-a-uuid/replies')
+    assert resp.status_code == 400
+
+def test_add_comment_invalid_parent_id(client):
+    token = AuthService(MagicMock())._generate_access_token('uid')
+    resp = client.post('/api/v1/news/00000000-0000-4000-8000-000000000001/comments',
+                       json={'content': 'hi', 'parent_id': "x'),(select"},
+                       headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 422
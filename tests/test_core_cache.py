@@ -0,0 +1,37 @@
+import pytest
+from app.core.cache import TTLCache, MemoryCache
+
+def test_ttl_cache_lru_eviction():
+    c = TTLCache(max_entries=2, default_ttl=60)
+    c.set('a', 1)
+    c.set('b', 2)
+    assert c.get('a') == 1  # a 变为最近使用
+    c.set('c', 3)
+    assert c.get('b') is None
+    assert c.get('a') == 1
+    assert c.get('c') == 3
+
+def test_ttl_cache_expiry():
+    c = TTLCache(max_entries=10, default_ttl=60)
+    c.set('a', 1, ttl=-1)
+    assert c.get('a') is None
+    assert c.stats()['misses'] == 1
+
+def test_ttl_cache_delete_prefix():
+    c = TTLCache()
+    c.set('news:list:1', 'x')
+    c.set('news:list:2', 'y')
+    c.set('other', 'z')
+    assert c.delete_prefix('news:list:') == 2
+    assert len(c) == 1
+
+@pytest.mark.asyncio
+async def test_memory_cache_stats():
+    c = MemoryCache()
+    assert await c.get('k') is None
+    await c.set('k', 'v')
+    assert await c.get('k') == 'v'
+    stats = c.stats()
+    assert stats['backend'] == 'memory'
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
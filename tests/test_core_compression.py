@@ -0,0 +1,62 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionMiddleware, negotiate_encoding, compression_stats
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+@app.get("/big")
+def big():
+    return PlainTextResponse("新闻" * 500, headers={"ETag": '"v1"'})
+
+@app.get("/big-other")
+def big_other():
+    # 与 /big 使用相同的ETag（数据哈希相同），响应体不同
+    return PlainTextResponse("资讯" * 500, headers={"ETag": '"v1"'})
+
+@app.get("/small")
+def small():
+    return PlainTextResponse("ok")
+
+@app.get("/not-modified")
+def not_modified():
+    return Response(status_code=304, headers={"ETag": '"v1"'})
+
+client = TestClient(app)
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0") == "gzip"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+def test_brotli_and_gzip_compression():
+    resp = client.get("/big", headers={"Accept-Encoding": "br"})
+    assert resp.headers["content-encoding"] == "br"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    # 压缩表示与未压缩表示的字节不同，强ETag需区分
+    assert resp.headers["etag"] == '"v1-br"'
+    assert client.get("/big", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"v1"'
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.text == "新闻" * 500
+
+def test_small_and_304_not_compressed():
+    resp = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+    resp = client.get("/not-modified", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 304
+    assert "content-encoding" not in resp.headers
+
+def test_precompressed_payload_reused():
+    for _ in range(3):
+        client.get("/big", headers={"Accept-Encoding": "gzip"})
+    stats = compression_stats.snapshot()["GET /big"]
+    assert stats["cache_hits"] >= 2
+    assert stats["compression_ratio"] < 0.5
+
+def test_precompressed_cache_keyed_by_path():
+    client.get("/big", headers={"Accept-Encoding": "gzip"})
+    resp = client.get("/big-other", headers={"Accept-Encoding": "gzip"})
+    assert resp.text == "资讯" * 500
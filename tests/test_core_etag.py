@@ -0,0 +1,43 @@
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.etag import compute_etag, conditional_success, encoded_etag, etag_matches
+
+def test_compute_etag_stable():
+    assert compute_etag({'a': 1, 'b': [1, 2]}) == compute_etag({'b': [1, 2], 'a': 1})
+    assert compute_etag({'a': 1}) != compute_etag({'a': 2})
+    assert compute_etag({'a': 1}).startswith('W/"')
+
+def test_etag_matches():
+    etag = compute_etag({'a': 1})
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag[2:], etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+def test_etag_matches_encoded_representation():
+    etag = compute_etag({'a': 1}, weak=False)
+    assert etag_matches(encoded_etag(etag, 'br'), etag)
+    assert etag_matches(encoded_etag(etag, 'gzip'), etag)
+    assert not etag_matches(encoded_etag('"other"', 'br'), etag)
+
+def test_rendered_body_not_shared_across_endpoints():
+    app = FastAPI()
+
+    @app.get('/categories')
+    async def categories(request: Request):
+        return await conditional_success(request, [], '获取分类成功', namespace='categories')
+
+    @app.get('/hot')
+    async def hot(request: Request):
+        return await conditional_success(request, [], '获取热门新闻成功', namespace='news')
+
+    client = TestClient(app)
+    first = client.get('/categories')
+    second = client.get('/hot')
+    # 空列表的ETag相同，但各自的响应信封不同
+    assert first.headers['etag'] == second.headers['etag']
+    assert first.json()['message'] == '获取分类成功'
+    assert second.json()['message'] == '获取热门新闻成功'
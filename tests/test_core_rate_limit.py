@@ -0,0 +1,80 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    MemoryTokenBuckets, RateLimiter, RateLimitMiddleware, RateLimitRule, client_identity, parse_trusted_proxies
+)
+from app.services.auth.auth_service import AuthService
+
+def make_scope(path='/api/v1/news', query=b'', headers=(), client=('1.2.3.4', 5000)):
+    return {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query, 'headers': list(headers), 'client': client}
+
+@pytest.mark.asyncio
+async def test_token_bucket_refill(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, 'monotonic', lambda: now[0])
+    buckets = MemoryTokenBuckets()
+    assert await buckets.acquire('k', rate=1.0, capacity=2) == 0
+    assert await buckets.acquire('k', rate=1.0, capacity=2) == 0
+    assert await buckets.acquire('k', rate=1.0, capacity=2) == pytest.approx(1.0)
+    now[0] += 1.0
+    assert await buckets.acquire('k', rate=1.0, capacity=2) == 0
+
+@pytest.mark.asyncio
+async def test_memory_buckets_bounded():
+    buckets = MemoryTokenBuckets(max_keys=2)
+    for key in ('a', 'b', 'c'):
+        await buckets.acquire(key, rate=1.0, capacity=1)
+    assert len(buckets) == 2
+
+def test_client_identity():
+    token = AuthService(None)._generate_access_token('uid')
+    assert client_identity(make_scope(headers=[(b'authorization', f'Bearer {token}'.encode())])) == 'user:uid'
+    # 无效令牌与客户端自带的设备ID都不能替代IP
+    assert client_identity(make_scope(headers=[(b'authorization', b'Bearer bad'), (b'x-device-id', b'dev1')])) == 'ip:1.2.3.4'
+    assert client_identity(make_scope()) == 'ip:1.2.3.4'
+
+def test_client_identity_behind_trusted_proxy():
+    proxies = parse_trusted_proxies(['10.0.0.0/8', 'not-an-ip'])
+    proxied = make_scope(headers=[(b'x-forwarded-for', b'203.0.113.7')], client=('10.1.2.3', 5000))
+    assert client_identity(proxied, proxies) == 'ip:203.0.113.7'
+    # 客户端自行填写的最左侧条目不可信，取最右侧的非代理地址
+    spoofed = make_scope(headers=[(b'x-forwarded-for', b'1.1.1.1, 203.0.113.7, 10.0.0.5')], client=('10.1.2.3', 5000))
+    assert client_identity(spoofed, proxies) == 'ip:203.0.113.7'
+    # 非可信对端携带的 X-Forwarded-For 被忽略
+    direct = make_scope(headers=[(b'x-forwarded-for', b'203.0.113.7')], client=('198.51.100.1', 5000))
+    assert client_identity(direct, proxies) == 'ip:198.51.100.1'
+    assert client_identity(proxied) == 'ip:10.1.2.3'
+
+def test_search_rule_matches_keyword_only():
+    rule = RateLimitRule('search', 30, 10, path='/api/v1/news', methods=['GET'], query_param='keyword')
+    assert rule.matches(make_scope(path='/api/v1/news/', query=b'keyword=ai'))
+    assert not rule.matches(make_scope(query=b'keyword='))
+    assert not rule.matches(make_scope(query=b'page=2'))
+
+def test_middleware_returns_429(monkeypatch):
+    limiter = RateLimiter(
+        MemoryTokenBuckets(),
+        default_rule=RateLimitRule('default', 60, 2),
+        rules=[RateLimitRule('search', 60, 1, path='/items', query_param='keyword')]
+    )
+    monkeypatch.setattr(rate_limit, '_rate_limiter', limiter)
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+
+    @app.get('/items')
+    async def items():
+        return {'ok': True}
+
+    client = TestClient(app)
+    assert client.get('/items', params={'keyword': 'x'}).status_code == 200
+    limited = client.get('/items', params={'keyword': 'x'})
+    assert limited.status_code == 429
+    assert limited.headers['retry-after'] == '1'
+    # 搜索额度独立于默认额度
+    assert client.get('/items').status_code == 200
+    assert client.get('/items').status_code == 200
+    assert client.get('/items').status_code == 429
+    assert limiter.stats()['limited'] == {'search': 1, 'default': 1}
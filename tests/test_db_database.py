@@ -0,0 +1,23 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from app.db.database import execute, quote_filter_value, select_columns
+from app.models.news import NewsPublic
+
+@pytest.mark.asyncio
+async def test_execute_runs_off_event_loop_thread():
+    query = MagicMock()
+    query.execute.side_effect = lambda: threading.current_thread().name
+    thread_name = await execute(query)
+    assert thread_name.startswith('supabase-db')
+    assert thread_name != threading.current_thread().name
+
+def test_quote_filter_value():
+    assert quote_filter_value('a,b') == '"a,b"'
+    assert quote_filter_value('say "hi"') == '"say \\"hi\\""'
+
+def test_select_columns():
+    columns = select_columns(NewsPublic, 'share_count', 'id').split(',')
+    assert columns[0] == 'id'
+    assert columns[-1] == 'share_count'
+    assert 'content' not in columns
@@ -1,6 +1,7 @@
 import pytest
 from app.models.news import (
-    NewsCategory, NewsStatus, NewsBase, NewsCreate, NewsUpdate, NewsInDB, NewsPublic, NewsListResponse
+    NewsCategory, NewsStatus, NewsBase, NewsCreate, NewsUpdate, NewsInDB, NewsPublic, NewsListResponse,
+    to_news_public_list
 )
 from datetime import datetime
 
@@ -84,4 +85,13 @@ def test_news_list_response():
     resp = NewsListResponse(items=[item], total=1, page=1, size=10, has_next=False)
     assert resp.total == 1
     assert resp.items[0].id == "uuid"
-    assert resp.has_next is False 
\ No newline at end of file
+    assert resp.has_next is False 
+
+def test_to_news_public_list():
+    items = to_news_public_list([
+        {'id': 'a', 'slug': 's', 'title': 't', 'category': 'health',
+         'created_at': '2024-01-01T00:00:00', 'content': 'ignored'}
+    ])
+    assert items[0].category == NewsCategory.HEALTH
+    assert items[0].created_at == datetime(2024, 1, 1)
+    assert items[0].tags == []
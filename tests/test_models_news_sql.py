@@ -0,0 +1,150 @@
+"""
+NEWS_TABLES_SQL 中数据库函数的集成测试
+需要真实PostgreSQL：设置 TEST_POSTGRES_URL 并安装 psycopg2，否则跳过；
+每次运行在临时schema中建最小表结构，并执行仓库中的函数定义原文
+"""
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models.news import NEWS_TABLES_SQL
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set")
+
+# 函数依赖的最小表结构（省略 users 外键与无关列）
+SCHEMA_SQL = """
+CREATE TABLE news (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    title TEXT NOT NULL DEFAULT '',
+    category VARCHAR(50) NOT NULL DEFAULT 'technology',
+    status VARCHAR(20) NOT NULL DEFAULT 'published',
+    like_count INTEGER DEFAULT 0,
+    share_count INTEGER DEFAULT 0
+);
+CREATE TABLE user_news_interactions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID,
+    news_id UUID REFERENCES news(id) ON DELETE CASCADE,
+    interaction_type VARCHAR(20) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE(user_id, news_id, interaction_type)
+);
+"""
+
+def shipped_function(name: str, schema: str) -> str:
+    """从 NEWS_TABLES_SQL 中取出函数定义原文，固定的 search_path 指向测试schema"""
+    match = re.search(
+        rf"CREATE OR REPLACE FUNCTION {name}\(.*?\$\$ LANGUAGE \w+[^;]*;",
+        NEWS_TABLES_SQL,
+        re.S
+    )
+    assert match, f"{name} not found in NEWS_TABLES_SQL"
+    return match.group(0).replace("SET search_path = public,", f"SET search_path = {schema},")
+
+@pytest.fixture
+def pg():
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    options = f"-c search_path={schema}"
+    admin = psycopg2.connect(POSTGRES_URL)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {schema}")
+    try:
+        conn = psycopg2.connect(POSTGRES_URL, options=options)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(SCHEMA_SQL)
+            for name in ('toggle_news_like', 'toggle_news_favorite', 'share_news'):
+                cursor.execute(shipped_function(name, schema))
+        yield lambda: psycopg2.connect(POSTGRES_URL, options=options)
+        conn.close()
+    finally:
+        with admin.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+def call(conn, name, news_id, user_id):
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT {name}(%s, %s)", (news_id, user_id))
+        result = cursor.fetchone()[0]
+    conn.commit()
+    return result
+
+def insert_news(pg, status: str = 'published') -> str:
+    conn = pg()
+    with conn.cursor() as cursor:
+        cursor.execute("INSERT INTO news (title, status) VALUES ('t', %s) RETURNING id", (status,))
+        news_id = str(cursor.fetchone()[0])
+    conn.commit()
+    conn.close()
+    return news_id
+
+def run_concurrently(pg, name, news_id, user_ids, workers=16):
+    """每个工作线程持有独立连接，模拟多个API进程并发调用"""
+    chunks = [user_ids[i::workers] for i in range(workers)]
+
+    def worker(chunk):
+        conn = pg()
+        try:
+            return [call(conn, name, news_id, user_id) for user_id in chunk]
+        finally:
+            conn.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [result for results in pool.map(worker, chunks) for result in results]
+
+def test_toggle_news_like_concurrent_counts_are_exact(pg):
+    news_id = insert_news(pg)
+    user_ids = [str(uuid.uuid4()) for _ in range(300)]
+
+    results = run_concurrently(pg, 'toggle_news_like', news_id, user_ids)
+    assert all(result['action'] == 'liked' for result in results)
+    assert all(result['category'] == 'technology' for result in results)
+    # 前50个用户再次点击取消点赞
+    results = run_concurrently(pg, 'toggle_news_like', news_id, user_ids[:50])
+    assert all(result['action'] == 'unliked' for result in results)
+
+    conn = pg()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT like_count FROM news WHERE id = %s", (news_id,))
+        assert cursor.fetchone()[0] == 250
+        cursor.execute("SELECT count(*) FROM user_news_interactions WHERE news_id = %s", (news_id,))
+        assert cursor.fetchone()[0] == 250
+    conn.close()
+
+def test_toggle_news_like_missing_news_returns_null(pg):
+    conn = pg()
+    assert call(conn, 'toggle_news_like', str(uuid.uuid4()), str(uuid.uuid4())) is None
+    conn.close()
+
+def test_interactions_rejected_for_unpublished_news(pg):
+    news_id = insert_news(pg, status='archived')
+    conn = pg()
+    for name in ('toggle_news_like', 'toggle_news_favorite', 'share_news'):
+        assert call(conn, name, news_id, str(uuid.uuid4())) is None
+    conn.close()
+
+def test_toggle_news_favorite_round_trip(pg):
+    news_id = insert_news(pg)
+    user_id = str(uuid.uuid4())
+    conn = pg()
+    assert call(conn, 'toggle_news_favorite', news_id, user_id)['is_favorited'] is True
+    assert call(conn, 'toggle_news_favorite', news_id, user_id)['is_favorited'] is False
+    conn.close()
+
+def test_share_news_concurrent_counts_are_exact(pg):
+    news_id = insert_news(pg)
+    user_ids = [str(uuid.uuid4()) for _ in range(100)]
+    run_concurrently(pg, 'share_news', news_id, user_ids)
+
+    conn = pg()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT share_count FROM news WHERE id = %s", (news_id,))
+        assert cursor.fetchone()[0] == 100
+    conn.close()
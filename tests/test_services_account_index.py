@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.auth import account_index
+from app.services.auth.account_index import AccountIndex
+
+def make_db(*results):
+    db = MagicMock()
+    for name in ('table', 'select', 'order', 'gt', 'or_', 'limit'):
+        getattr(db, name).return_value = db
+    db.execute.side_effect = [MagicMock(data=data) for data in results]
+    return db
+
+@pytest.mark.asyncio
+async def test_unloaded_index_checks_database():
+    index = AccountIndex(capacity=100)
+    db = make_db([{'username': 'taken', 'email': 'x@y.com'}])
+    result = await index.check(db, username='taken', email='new@y.com')
+    assert result == {'username': False, 'email': True}
+    assert index.db_checks == 1
+
+@pytest.mark.asyncio
+async def test_definite_negative_skips_database():
+    index = AccountIndex(capacity=100)
+    await index.load(make_db([{'username': 'alice', 'email': 'Alice@Example.com'}]))
+    db = make_db()
+    assert await index.check(db, username='bob', email='bob@example.com') == {'username': True, 'email': True}
+    db.execute.assert_not_called()
+    assert index.filter_negatives == 1
+
+@pytest.mark.asyncio
+async def test_possible_positive_confirmed_with_single_query():
+    index = AccountIndex(capacity=100)
+    await index.load(make_db([{'username': 'alice', 'email': 'alice@example.com'}]))
+    db = make_db([{'username': 'alice', 'email': 'alice@example.com'}])
+    result = await index.check(db, username='alice', email='ALICE@example.com')
+    assert result == {'username': False, 'email': False}
+    db.or_.assert_called_once_with('username.eq."alice",email.eq."alice@example.com"')
+
+@pytest.mark.asyncio
+async def test_added_accounts_visible_after_registration():
+    index = AccountIndex(capacity=100)
+    await index.load(make_db([]))
+    index.add(username='carol', email='carol@example.com')
+    assert index.might_exist('username', 'carol')
+    assert index.might_exist('email', 'carol@example.com')
+
+@pytest.mark.asyncio
+async def test_load_pages_by_id_keyset(monkeypatch):
+    monkeypatch.setattr(account_index, 'ACCOUNT_FETCH_PAGE_SIZE', 2)
+    rows = [{'id': f'u{i}', 'username': f'user{i}', 'email': f'user{i}@example.com'} for i in range(5)]
+    db = make_db(rows[0:2], rows[2:4], rows[4:])
+    index = AccountIndex(capacity=100)
+    assert await index.load(db) == 5
+    # 每页从上一页最后的 id 之后继续，而不是 OFFSET
+    assert [c.args for c in db.gt.call_args_list] == [('id', 'u1'), ('id', 'u3')]
+    assert all(index.might_exist('username', f'user{i}') for i in range(5))
@@ -1,9 +1,11 @@
 import pytest
 import pytest_asyncio
 from unittest.mock import MagicMock
+from app.core.cache import TTLCache
 from app.services.auth.auth_service import AuthService
 from app.schemas.requests.auth import RegisterRequest, LoginRequest
 from app.schemas.responses.auth import UserResponse
+from app.services.auth.token_store import MemoryTokenStore, TokenStoreFullError
 
 @pytest_asyncio.fixture
 def mock_db():
@@ -11,6 +13,8 @@ def mock_db():
     db.table.return_value = db
     db.select.return_value = db
     db.eq.return_value = db
+    db.or_.return_value = db
+    db.limit.return_value = db
     db.insert.return_value = db
     db.execute.return_value = MagicMock(data=[])
     db.auth = MagicMock()
@@ -22,17 +26,20 @@ def mock_db():
 async def test_register_user_success(mock_db):
     service = AuthService(mock_db)
     req = RegisterRequest(email='a@b.com', username='user123', password='passwd123')
-    mock_db.execute.side_effect = [MagicMock(data=[]), MagicMock(data=[]), MagicMock(data=[{'id': 'uid', 'username': 'user123', 'full_name': None, 'avatar_url': None, 'created_at': '2024-01-01T00:00:00', 'preferences': {}}])]
+    mock_db.execute.side_effect = [MagicMock(data=[]), MagicMock(data=[{'id': 'uid', 'username': 'user123', 'full_name': None, 'avatar_url': None, 'created_at': '2024-01-01T00:00:00', 'preferences': {}}])]
     resp = await service.register_user(req)
     assert resp.user.username == 'user123'
+    # 邮箱与用户名合并为一次查询
+    mock_db.or_.assert_called_once_with('username.eq."user123",email.eq."a@b.com"')
 
 @pytest.mark.asyncio
 async def test_register_user_email_exists(mock_db):
     service = AuthService(mock_db)
     req = RegisterRequest(email='a@b.com', username='user123', password='passwd123')
-    mock_db.execute.side_effect = [MagicMock(data=[{'id': 'uid'}])]
-    with pytest.raises(ValueError):
+    mock_db.execute.side_effect = [MagicMock(data=[{'username': 'other', 'email': 'a@b.com'}])]
+    with pytest.raises(ValueError, match="邮箱已被注册"):
         await service.register_user(req)
+    mock_db.auth.sign_up.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_login_user_success(mock_db):
@@ -48,4 +55,71 @@ async def test_login_user_fail(mock_db):
     req = LoginRequest(email='a@b.com', password='p')
     mock_db.auth.sign_in_with_password.return_value = MagicMock(user=None)
     with pytest.raises(ValueError):
-        await service.login_user(req) 
\ No newline at end of file
+        await service.login_user(req) 
+
+@pytest.mark.asyncio
+async def test_get_current_user_cached(mock_db):
+    service = AuthService(mock_db)
+    token = service._generate_access_token('uid')
+    mock_db.execute.side_effect = [MagicMock(data=[{'id': 'uid', 'username': 'u', 'full_name': None, 'avatar_url': None, 'created_at': '2024-01-01T00:00:00', 'preferences': {}}])]
+    first = await service.get_current_user(token)
+    second = await service.get_current_user(token)
+    assert first.username == second.username == 'u'
+    assert mock_db.execute.call_count == 1
+    assert service.profile_cache.stats()['hits'] == 1
+
+def test_empty_injected_dependencies_are_used(mock_db):
+    # 空的 TTLCache 布尔值为假，注入时也不能回退到全局实例
+    cache = TTLCache(max_entries=10, default_ttl=60)
+    store = MemoryTokenStore()
+    service = AuthService(mock_db, profile_cache=cache, token_store=store)
+    assert service.profile_cache is cache
+    assert service.token_store is store
+
+@pytest.mark.asyncio
+async def test_logout_invalidates_profile_cache(mock_db):
+    service = AuthService(mock_db)
+    token = service._generate_access_token('uid')
+    mock_db.update.return_value = mock_db
+    mock_db.execute.side_effect = [
+        MagicMock(data=[{'id': 'uid', 'username': 'u', 'full_name': None, 'avatar_url': None, 'created_at': '2024-01-01T00:00:00', 'preferences': {}}]),
+        MagicMock(data=[]),
+        MagicMock(data=[{'id': 'uid', 'username': 'u2', 'full_name': None, 'avatar_url': None, 'created_at': '2024-01-01T00:00:00', 'preferences': {}}])
+    ]
+    await service.get_current_user(token)
+    await service.logout_user(token)
+    # 登出后原令牌失效，重新登录的令牌读取最新资料
+    with pytest.raises(ValueError):
+        await service.get_current_user(token)
+    user = await service.get_current_user(service._generate_access_token('uid'))
+    assert user.username == 'u2'
+
+@pytest.mark.asyncio
+async def test_refresh_token_rotation(mock_db):
+    service = AuthService(mock_db)
+    refresh = service._generate_refresh_token('uid', 'sid1')
+    mock_db.execute.return_value = MagicMock(data=[{'id': 'uid'}])
+    rotated = await service.refresh_token(refresh)
+    assert rotated.refresh_token != refresh
+    # 旧刷新令牌只能使用一次，重复使用时整个会话被吊销
+    with pytest.raises(ValueError):
+        await service.refresh_token(refresh)
+    with pytest.raises(ValueError):
+        await service.refresh_token(rotated.refresh_token)
+
+@pytest.mark.asyncio
+async def test_refresh_rejected_when_token_store_full(mock_db):
+    store = MemoryTokenStore(max_entries=1)
+    service = AuthService(mock_db, token_store=store)
+    mock_db.execute.return_value = MagicMock(data=[{'id': 'uid'}])
+    await service.refresh_token(service._generate_refresh_token('uid', 'sid1'))
+    # 存储已满时拒绝刷新，而不是淘汰已消费的jti
+    with pytest.raises(TokenStoreFullError):
+        await service.refresh_token(service._generate_refresh_token('uid', 'sid2'))
+    assert store.stats()['revoked'] == 1
+
+@pytest.mark.asyncio
+async def test_access_token_not_accepted_for_refresh(mock_db):
+    service = AuthService(mock_db)
+    with pytest.raises(ValueError):
+        await service.refresh_token(service._generate_access_token('uid'))
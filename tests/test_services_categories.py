@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.services.news.categories import CategoryStore
+
+def make_db(*pages):
+    db = MagicMock()
+    for name in ('table', 'select', 'eq', 'order'):
+        getattr(db, name).return_value = db
+    db.execute.side_effect = [MagicMock(data=page) for page in pages]
+    return db
+
+@pytest.mark.asyncio
+async def test_snapshot_reused_until_reloaded():
+    db = make_db(
+        [{'id': '1', 'name': 'technology', 'display_name': '科技'}],
+        [{'id': '1', 'name': 'technology', 'display_name': '科技'}, {'id': '2', 'name': 'sports', 'display_name': '体育'}]
+    )
+    store = CategoryStore(ttl=3600, db=db)
+    first = await store.get()
+    assert await store.get() is first
+    assert db.execute.call_count == 1
+
+    second = await store.load()
+    assert await store.get() is second
+    assert len(second.items) == 2
+    assert second.version != first.version
+
+@pytest.mark.asyncio
+async def test_refresh_failure_keeps_previous_snapshot():
+    db = make_db([{'id': '1', 'name': 'technology', 'display_name': '科技'}])
+    store = CategoryStore(ttl=0, db=db)
+    first = await store.load()
+    db.execute.side_effect = Exception("db down")
+    assert await store.get() is first
+
+@pytest.mark.asyncio
+async def test_concurrent_cold_start_loads_once():
+    db = make_db()
+    db.execute.side_effect = None
+    db.execute.return_value = MagicMock(data=[{'id': '1', 'name': 'technology', 'display_name': '科技'}])
+    store = CategoryStore(ttl=3600, db=db)
+    snapshots = await asyncio.gather(*(store.get() for _ in range(5)))
+    # 等锁的请求复用先完成的加载结果
+    assert db.execute.call_count == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import MagicMock
+from app.services.news.comment_service import CommentService
+from app.utils.pagination import encode_cursor, decode_cursor
+
+NEWS_ID = '00000000-0000-4000-8000-000000000001'
+
+def cid(i):
+    return f'00000000-0000-4000-8000-{i:012d}'
+
+def make_comment(i, parent_id=None, reply_count=0):
+    return {
+        'id': cid(i), 'news_id': NEWS_ID, 'user_id': 'uid', 'parent_id': parent_id,
+        'username': 'tester', 'avatar_url': None, 'content': f'评论 {i}',
+        'like_count': 0, 'reply_count': reply_count,
+        'created_at': f'2024-01-01T00:00:{59 - i:02d}+00:00'
+    }
+
+def make_db(responses):
+    db = MagicMock()
+    def rpc(name, params):
+        query = MagicMock()
+        query.execute.return_value = MagicMock(data=responses[name](params))
+        return query
+    db.rpc.side_effect = rpc
+    return db
+
+@pytest.mark.asyncio
+async def test_get_comments_batches_reply_previews():
+    top = [make_comment(1, reply_count=2), make_comment(2), make_comment(3, reply_count=1)]
+    db = make_db({
+        'get_news_comments': lambda params: top,
+        'get_comment_reply_previews': lambda params: [
+            make_comment(10, parent_id=cid(1)), make_comment(11, parent_id=cid(1)), make_comment(12, parent_id=cid(3))
+        ]
+    })
+    result = await CommentService(db, service_db=db).get_comments(NEWS_ID, size=2)
+    assert [c.id for c in result.items] == [cid(1), cid(2)]
+    assert result.has_next
+    assert decode_cursor(result.next_cursor)[1] == cid(2)
+    assert [r.id for r in result.items[0].replies] == [cid(10), cid(11)]
+    # 回复预览一次批量查询，只包含当前页中有回复的评论
+    preview_calls = [c for c in db.rpc.call_args_list if c.args[0] == 'get_comment_reply_previews']
+    assert len(preview_calls) == 1
+    assert preview_calls[0].args[1]['p_parent_ids'] == [cid(1)]
+
+@pytest.mark.asyncio
+async def test_get_comments_cursor_passed_as_keyset():
+    seen = {}
+    db = make_db({'get_news_comments': lambda params: seen.update(params) or []})
+    await CommentService(db, service_db=db).get_comments(NEWS_ID, size=5, cursor=encode_cursor('2024-01-01T00:00:00+00:00', cid(9)))
+    assert seen['p_before_created_at'] == '2024-01-01T00:00:00+00:00'
+    assert seen['p_before_id'] == cid(9)
+    assert seen['p_limit'] == 6
+
+@pytest.mark.asyncio
+async def test_get_comments_cursor_with_trimmed_fraction():
+    # Postgres 去掉小数秒末尾的0后只剩一位
+    seen = {}
+    db = make_db({'get_news_comments': lambda params: seen.update(params) or []})
+    await CommentService(db, service_db=db).get_comments(NEWS_ID, size=5, cursor=encode_cursor('2024-05-01T09:00:00.1+00:00', cid(9)))
+    assert seen['p_before_created_at'] == '2024-05-01T09:00:00.1+00:00'
+
+@pytest.mark.asyncio
+async def test_add_comment_missing_news():
+    db = make_db({'add_news_comment': lambda params: None})
+    with pytest.raises(ValueError):
+        await CommentService(db, service_db=db).add_comment(NEWS_ID, 'uid', 'hello')
+
+@pytest.mark.asyncio
+async def test_get_replies_scoped_to_news():
+    seen = {}
+    db = make_db({'get_comment_replies': lambda params: seen.update(params) or []})
+    await CommentService(db, service_db=db).get_replies(NEWS_ID, cid(1), size=5)
+    assert seen['p_news_id'] == NEWS_ID
+    assert seen['p_parent_id'] == cid(1)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('cursor', [
+    encode_cursor('2024-01-01T00:00:00+00:00', 'c9),id.gt.0'),
+    encode_cursor('not-a-time', cid(9)),
+    encode_cursor(['2024-01-01'], cid(9)),
+])
+async def test_invalid_comment_cursor_rejected(cursor):
+    db = make_db({})
+    with pytest.raises(ValueError):
+        await CommentService(db, service_db=db).get_replies(NEWS_ID, cid(1), cursor=cursor)
+    db.rpc.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_invalid_ids_rejected_before_query():
+    db = make_db({})
+    with pytest.raises(ValueError):
+        await CommentService(db, service_db=db).get_comments('nid')
+    with pytest.raises(ValueError):
+        await CommentService(db, service_db=db).get_replies(NEWS_ID, 'c1')
+    with pytest.raises(ValueError):
+        await CommentService(db, service_db=db).add_comment(NEWS_ID, 'uid', 'hello', parent_id='c1')
+    db.rpc.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_comment_rpcs_use_service_client():
+    db = make_db({})
+    service_db = make_db({'get_news_comments': lambda params: []})
+    await CommentService(db, service_db=service_db).get_comments(NEWS_ID)
+    service_db.rpc.assert_called_once()
+    db.rpc.assert_not_called()
@@ -0,0 +1,28 @@
+import asyncio
+import time
+import pytest
+from app.services.concurrency import gather_queries, start_query_timing, format_server_timing
+
+async def _slow(value, delay=0.05):
+    await asyncio.sleep(delay)
+    return value
+
+@pytest.mark.asyncio
+async def test_gather_queries_runs_in_parallel():
+    timings = start_query_timing()
+    origin = time.perf_counter()
+    results = await gather_queries(a=_slow(1), b=_slow(2))
+    assert results == {'a': 1, 'b': 2}
+    assert sorted(name for name, _, _ in timings) == ['a', 'b']
+    # 按记录的起止时间判断并发（不依赖墙钟阈值）：每个查询都在另一个结束前开始
+    spans = {name: (start, end) for name, start, end in timings}
+    assert spans['a'][0] < spans['b'][1] and spans['b'][0] < spans['a'][1]
+    header = format_server_timing(timings, origin)
+    assert 'a;dur=' in header and 'b;dur=' in header
+
+@pytest.mark.asyncio
+async def test_gather_queries_propagates_errors():
+    async def boom():
+        raise ValueError("新闻不存在")
+    with pytest.raises(ValueError):
+        await gather_queries(a=_slow(1), b=boom())
@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.auth import passwords
+from app.services.auth.credentials import LocalCredentialBackend
+from app.services.auth.passwords import hash_password, verify_password
+
+@pytest.fixture
+def password_pool():
+    yield passwords.get_password_executor()
+    passwords.shutdown_password_executor()
+
+def make_db(data):
+    db = MagicMock()
+    db.table.return_value = db
+    db.select.return_value = db
+    db.eq.return_value = db
+    db.execute.return_value = MagicMock(data=data)
+    return db
+
+def test_hash_and_verify():
+    password_hash = hash_password('secret123', rounds=4)
+    assert verify_password('secret123', password_hash)
+    assert not verify_password('wrong', password_hash)
+    assert not verify_password('secret123', 'not-a-hash')
+    # 超过72字节的部分不参与哈希
+    long_hash = hash_password('a' * 72, rounds=4)
+    assert verify_password('a' * 80, long_hash)
+
+@pytest.mark.asyncio
+async def test_local_backend_roundtrip(password_pool):
+    backend = LocalCredentialBackend(make_db([]), rounds=4)
+    credentials = await backend.create_credentials('a@b.com', 'secret123')
+    backend.db = make_db([{'id': 'uid', 'username': 'u', **credentials}])
+    profile, is_verified = await backend.authenticate('A@b.com', 'secret123')
+    assert profile['id'] == 'uid'
+    backend.db.eq.assert_called_once_with('email', 'a@b.com')
+    with pytest.raises(ValueError, match='邮箱或密码错误'):
+        await backend.authenticate('a@b.com', 'wrong')
+
+@pytest.mark.asyncio
+async def test_local_backend_unknown_user(password_pool):
+    backend = LocalCredentialBackend(make_db([]), rounds=4)
+    with pytest.raises(ValueError, match='邮箱或密码错误'):
+        await backend.authenticate('nobody@b.com', 'secret123')
@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.services.news import interaction_state
+from app.services.news.interaction_state import InteractionStateCache
+
+NEWS_A = '11111111-1111-1111-1111-111111111111'
+NEWS_B = '22222222-2222-2222-2222-222222222222'
+
+def make_db(rows):
+    db = MagicMock()
+    db.table.return_value = db
+    db.select.return_value = db
+    db.eq.return_value = db
+    db.in_.return_value = db
+    db.order.return_value = db
+    db.gt.return_value = db
+    db.limit.return_value = db
+    db.execute.return_value = MagicMock(data=rows)
+    return db
+
+@pytest.mark.asyncio
+async def test_lazy_load_once_then_cache_hits():
+    db = make_db([
+        {'news_id': NEWS_A, 'interaction_type': 'like'},
+        {'news_id': NEWS_A, 'interaction_type': 'favorite'},
+        {'news_id': NEWS_B, 'interaction_type': 'share'}
+    ])
+    cache = InteractionStateCache()
+    state = await cache.get(db, 'u1')
+    assert state.lookup(NEWS_A) == {'like': True, 'favorite': True}
+    assert state.lookup(NEWS_B) == {'share': True}
+    await cache.get(db, 'u1')
+    assert db.execute.call_count == 1
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['size'] == 1
+    assert stats['memory_bytes'] > 0
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_merged():
+    db = make_db([])
+    cache = InteractionStateCache()
+    states = await asyncio.gather(*(cache.get(db, 'u1') for _ in range(10)))
+    assert db.execute.call_count == 1
+    assert all(state is states[0] for state in states)
+
+@pytest.mark.asyncio
+async def test_update_in_place():
+    cache = InteractionStateCache()
+    # 未加载的用户不需要更新
+    cache.update('u1', NEWS_A, 'like', True)
+    state = await cache.get(make_db([]), 'u1')
+    cache.update('u1', NEWS_A, 'like', True)
+    assert state.lookup(NEWS_A) == {'like': True}
+    cache.update('u1', NEWS_A, 'like', False)
+    assert state.lookup(NEWS_A) == {}
+
+@pytest.mark.asyncio
+async def test_load_pages_past_row_cap(monkeypatch):
+    monkeypatch.setattr(interaction_state, 'INTERACTION_FETCH_PAGE_SIZE', 2)
+    news_ids = [f'00000000-0000-4000-8000-{i:012d}' for i in range(5)]
+    rows = [{'id': f'i{i}', 'news_id': news_id, 'interaction_type': 'like'} for i, news_id in enumerate(news_ids)]
+    db = make_db([])
+    db.execute.side_effect = [MagicMock(data=rows[0:2]), MagicMock(data=rows[2:4]), MagicMock(data=rows[4:])]
+    state = await InteractionStateCache().get(db, 'u1')
+    # 超过单页上限的记录也全部加载
+    assert all(state.lookup(news_id) == {'like': True} for news_id in news_ids)
+    # 每页从上一页最后的 id 之后继续，而不是 OFFSET
+    assert [c.args for c in db.gt.call_args_list] == [('id', 'i1'), ('id', 'i3')]
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from app.services.news import interaction_writer
+from app.services.news.interaction_writer import InteractionWriter
+
+@pytest.mark.asyncio
+async def test_record_drops_when_queue_full():
+    writer = InteractionWriter(db=MagicMock(), max_queue_size=2)
+    assert writer.record('u1', 'n1', 'view')
+    assert writer.record('u1', 'n2', 'view')
+    assert not writer.record('u1', 'n3', 'view')
+    assert writer.stats()['dropped'] == 1
+    assert writer.stats()['queue_size'] == 2
+
+@pytest.mark.asyncio
+async def test_flush_writes_deduplicated_multi_row_upsert():
+    db = MagicMock()
+    writer = InteractionWriter(db=db)
+    writer.record('u1', 'n1', 'view')
+    writer.record('u1', 'n1', 'view')
+    writer.record('u2', 'n1', 'view')
+    await writer.flush()
+    db.table.assert_called_once_with('user_news_interactions')
+    rows = db.table.return_value.upsert.call_args.args[0]
+    assert len(rows) == 2
+    assert db.table.return_value.upsert.call_args.kwargs['on_conflict'] == 'user_id,news_id,interaction_type'
+    assert writer.stats()['written'] == 2
+
+@pytest.mark.asyncio
+async def test_background_task_batches_and_stop_flushes():
+    db = MagicMock()
+    writer = InteractionWriter(db=db, batch_size=3, flush_interval=10)
+    writer.start()
+    for i in range(4):
+        writer.record(f'u{i}', 'n1', 'view')
+    await asyncio.sleep(0.05)
+    # 达到批量大小立即写入，剩余事件在停止时写入
+    assert db.table.return_value.upsert.call_count == 1
+    await writer.stop()
+    assert db.table.return_value.upsert.call_count == 2
+    assert writer.stats()['written'] == 4
+
+@pytest.mark.asyncio
+async def test_rejected_batch_counted_as_failed(monkeypatch):
+    service_db = MagicMock()
+    service_db.table.return_value.upsert.return_value.execute.side_effect = Exception("permission denied")
+    monkeypatch.setattr(interaction_writer, 'get_supabase_service_client', lambda: service_db)
+    writer = InteractionWriter()
+    writer.record('u1', 'n1', 'view')
+    writer.record('u2', 'n1', 'view')
+    await writer.flush()
+    # 经 service-role 客户端写入；被拒绝的批次在统计中可见
+    service_db.table.assert_called_once_with('user_news_interactions')
+    stats = writer.stats()
+    assert stats['written'] == 0
+    assert stats['failed'] == 2
+    assert stats['failed_batches'] == 1
+    assert stats['last_error'] == 'permission denied'
@@ -1,8 +1,10 @@
 import pytest
 import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock
+from app.db.database import ServiceClientUnavailableError
 from app.services.news.news_service import NewsService
 from app.models.news import NewsCategory
+from app.utils.pagination import encode_cursor, decode_cursor
 
 @pytest_asyncio.fixture
 def mock_db():
@@ -13,6 +15,11 @@ def mock_db():
     db.or_.return_value = db
     db.order.return_value = db
     db.range.return_value = db
+    db.limit.return_value = db
+    db.is_.return_value = db
+    db.filter.return_value = db
+    db.in_.return_value = db
+    db.gte.return_value = db
     db.execute.return_value = MagicMock(data=[{
         'id': 'nid', 'slug': 'slug', 'title': 'title', 'category': 'technology',
         'created_at': '2024-01-01T00:00:00', 'view_count': 1, 'like_count': 2
@@ -41,7 +48,7 @@ async def test_get_news_detail_success(mock_db):
     mock_db.execute.side_effect = [MagicMock(data=[{
         'id': 'nid', 'slug': 'slug', 'title': 'title', 'category': 'technology',
         'view_count': 1, 'created_at': '2024-01-01T00:00:00'
-    }]), MagicMock(), MagicMock(data=[])]
+    }])]
     detail = await service.get_news_detail('nid')
     assert detail['id'] == 'nid'
     assert detail['view_count'] == 2
@@ -51,4 +58,239 @@ async def test_get_news_detail_not_found(mock_db):
     service = NewsService(mock_db)
     mock_db.execute.side_effect = [MagicMock(data=[])]
     with pytest.raises(ValueError):
-        await service.get_news_detail('notfound') 
\ No newline at end of file
+        await service.get_news_detail('notfound') 
+
+@pytest.mark.asyncio
+async def test_get_news_list_cached(mock_db, fresh_cache):
+    service = NewsService(mock_db)
+    first = await service.get_news_list(page=1, size=1, category=NewsCategory.TECHNOLOGY)
+    calls = mock_db.execute.call_count
+    second = await service.get_news_list(page=1, size=1, category=NewsCategory.TECHNOLOGY, keyword=None)
+    assert mock_db.execute.call_count == calls
+    assert second == first
+    assert fresh_cache.stats()['hits'] == 1
+
+@pytest.mark.asyncio
+async def test_upsert_news_batch_invalidates_list_cache(mock_db, fresh_cache):
+    service = NewsService(mock_db)
+    await service.get_news_list(page=1, size=1)
+    await service.upsert_news_batch([{'title': 't', 'link': 'http://x'}])
+    assert fresh_cache.stats()['size'] == 0
+
+def nid(i):
+    return f'00000000-0000-4000-8000-{i:012d}'
+
+@pytest.mark.asyncio
+async def test_get_news_list_cursor_mode(mock_db):
+    rows = [
+        {'id': nid(i), 'slug': f's{i}', 'title': 't', 'category': 'technology',
+         'created_at': '2024-01-01T00:00:00', 'view_count': 10 - i, 'like_count': 0}
+        for i in range(3)
+    ]
+    mock_db.execute.return_value = MagicMock(data=rows, count=10)
+    service = NewsService(mock_db)
+    cursor = encode_cursor(11, nid(9))
+    resp = await service.get_news_list(size=2, sort='view_count', cursor=cursor)
+    mock_db.limit.assert_any_call(3)
+    mock_db.or_.assert_called_with(f'view_count.lt."11",and(view_count.eq."11",id.lt."{nid(9)}")')
+    assert [item.id for item in resp.items] == [nid(0), nid(1)]
+    assert resp.has_next is True
+    assert decode_cursor(resp.next_cursor) == (9, nid(1))
+
+@pytest.mark.asyncio
+async def test_get_news_list_invalid_cursor(mock_db):
+    service = NewsService(mock_db)
+    with pytest.raises(ValueError):
+        await service.get_news_list(cursor='bogus')
+
+@pytest.mark.asyncio
+async def test_get_news_list_without_count(mock_db):
+    service = NewsService(mock_db)
+    resp = await service.get_news_list(size=1, count_mode='none')
+    assert mock_db.execute.call_count == 1
+    assert resp.total is None
+    assert resp.has_next is False
+
+@pytest.mark.asyncio
+async def test_get_news_list_estimated_count_cached(mock_db):
+    service = NewsService(mock_db)
+    mock_db.execute.return_value = MagicMock(data=[], count=42)
+    first = await service.get_news_list(page=1, count_mode='estimated')
+    second = await service.get_news_list(page=2, count_mode='estimated')
+    # 第一页：列表+计数；第二页：仅列表
+    assert mock_db.execute.call_count == 3
+    assert first.total == second.total == 42
+    assert second.total_exact is False
+
+@pytest.mark.asyncio
+async def test_count_query_filters_published(mock_db):
+    service = NewsService(mock_db)
+    await service.get_news_list(size=1)
+    status_filters = [c for c in mock_db.eq.call_args_list if c.args == ('status', 'published')]
+    assert len(status_filters) == 2
+
+@pytest.mark.asyncio
+async def test_get_news_list_keyword_uses_search_vector(mock_db):
+    service = NewsService(mock_db)
+    await service.get_news_list(keyword='AI芯片')
+    mock_db.or_.assert_any_call(
+        'search_vector.phfts(simple)."AI 芯 片",title.ilike."%AI芯片%",summary.ilike."%AI芯片%"'
+    )
+
+@pytest.mark.asyncio
+async def test_get_news_list_keyword_escapes_like_wildcards(mock_db):
+    service = NewsService(mock_db)
+    await service.get_news_list(keyword='100%_a*')
+    # % 与 _ 按字面匹配（反斜杠转义后再经 quote_filter_value 加引号转义），* 降为单字符通配
+    mock_db.or_.assert_any_call(
+        'search_vector.phfts(simple)."100%_a*",'
+        'title.ilike."%100\\\\%\\\\_a_%",summary.ilike."%100\\\\%\\\\_a_%"'
+    )
+
+@pytest.mark.asyncio
+async def test_get_news_list_relevance(mock_db):
+    mock_db.rpc.return_value = mock_db
+    service = NewsService(mock_db)
+    resp = await service.get_news_list(page=2, size=5, keyword='ai', sort='relevance')
+    mock_db.rpc.assert_called_once_with('search_news', {
+        'p_keyword': 'ai', 'p_category': None, 'p_limit': 6, 'p_offset': 5
+    })
+    assert resp.next_cursor is None
+
+@pytest.mark.asyncio
+async def test_get_news_list_relevance_requires_keyword(mock_db):
+    service = NewsService(mock_db)
+    with pytest.raises(ValueError):
+        await service.get_news_list(sort='relevance')
+
+def _selected_columns(mock_db):
+    return [c.args[0] for c in mock_db.select.call_args_list if c.args]
+
+@pytest.mark.asyncio
+async def test_list_queries_do_not_select_content(mock_db):
+    mock_db.limit.return_value = mock_db
+    service = NewsService(mock_db)
+    await service.get_news_list(size=1)
+    await service.get_trending_news(limit=1)
+    columns = _selected_columns(mock_db)
+    assert columns
+    for selected in columns:
+        assert selected != '*'
+        assert 'content' not in selected.split(',')
+        assert 'metadata' not in selected.split(',')
+
+@pytest.mark.asyncio
+async def test_get_news_detail_buffers_view_count(mock_db):
+    service = NewsService(mock_db)
+    await service.get_news_detail('nid')
+    detail = await service.get_news_detail('nid')
+    # 浏览量写入缓冲而不是逐次UPDATE，响应包含尚未写回的浏览量
+    mock_db.update.assert_not_called()
+    assert detail['view_count'] == 3
+
+@pytest.mark.asyncio
+async def test_toggle_news_like_uses_service_client(mock_db):
+    # 计数的原子性见 test_models_news_sql.py（真实PostgreSQL）
+    service_db = MagicMock()
+    service_db.rpc.return_value.execute.return_value = MagicMock(
+        data={'action': 'liked', 'like_count': 1, 'is_liked': True}
+    )
+    service = NewsService(mock_db, service_db=service_db)
+    result = await service.toggle_news_like('nid', 'user')
+    assert result == {'action': 'liked', 'like_count': 1, 'is_liked': True}
+    service_db.rpc.assert_called_once_with('toggle_news_like', {'p_news_id': 'nid', 'p_user_id': 'user'})
+    mock_db.rpc.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_toggle_news_like_missing_news(mock_db):
+    mock_db.rpc.return_value.execute.return_value = MagicMock(data=None)
+    service = NewsService(mock_db, service_db=mock_db)
+    with pytest.raises(ValueError):
+        await service.toggle_news_like('missing', 'user')
+
+@pytest.mark.asyncio
+async def test_share_news_single_rpc(mock_db):
+    mock_db.rpc.return_value.execute.return_value = MagicMock(data={'share_count': 5, 'title': 't'})
+    service = NewsService(mock_db, service_db=mock_db)
+    result = await service.share_news('nid', 'uid')
+    mock_db.rpc.assert_called_once_with('share_news', {'p_news_id': 'nid', 'p_user_id': 'uid'})
+    assert result['share_count'] == 5
+    mock_db.update.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_news_detail_uses_interaction_state_cache(mock_db, fresh_interaction_state):
+    service = NewsService(mock_db, service_db=MagicMock())
+    state = await fresh_interaction_state.get(mock_db, 'uid')
+    state.update('nid', 'like', True)
+    calls = mock_db.execute.call_count
+    detail = await service.get_news_detail('nid', user_id='uid')
+    # 只查询新闻本身，互动状态来自缓存
+    assert mock_db.execute.call_count == calls + 1
+    assert detail['user_interactions'] == {'like': True}
+
+@pytest.mark.asyncio
+async def test_get_news_detail_loads_interactions_with_service_client(mock_db, fresh_interaction_state, monkeypatch):
+    # 互动表受RLS保护，匿名客户端读不到用户的互动记录
+    fetch = AsyncMock(return_value=[{'news_id': 'nid', 'interaction_type': 'favorite'}])
+    monkeypatch.setattr(fresh_interaction_state, '_fetch', fetch)
+    service_db = MagicMock()
+    detail = await NewsService(mock_db, service_db=service_db).get_news_detail('nid', user_id='uid')
+    fetch.assert_awaited_once_with(service_db, 'uid')
+    assert detail['user_interactions'] == {'favorite': True}
+
+@pytest.mark.asyncio
+async def test_get_news_detail_requires_service_client_for_users(mock_db):
+    service = NewsService(mock_db)
+    service.service_db = None
+    with pytest.raises(ServiceClientUnavailableError):
+        await service.get_news_detail('nid', user_id='uid')
+    # 匿名浏览不需要 service-role 客户端
+    assert (await service.get_news_detail('nid'))['id'] == 'nid'
+
+@pytest.mark.asyncio
+async def test_get_interaction_states_single_in_query(mock_db):
+    # 互动表受RLS保护，经 service-role 客户端查询
+    service_db = MagicMock()
+    service_db.table.return_value = service_db
+    service_db.select.return_value = service_db
+    service_db.eq.return_value = service_db
+    service_db.in_.return_value = service_db
+    service_db.execute.return_value = MagicMock(data=[{'news_id': 'n1', 'interaction_type': 'like'}])
+    service = NewsService(mock_db, service_db=service_db)
+    states = await service.get_interaction_states('uid', ['n1', 'n2'])
+    assert service_db.execute.call_count == 1
+    mock_db.execute.assert_not_called()
+    service_db.in_.assert_any_call('news_id', ['n1', 'n2'])
+    assert states['n1'] == {'like': True, 'favorite': False, 'share': False}
+    assert states['n2'] == {'like': False, 'favorite': False, 'share': False}
+
+@pytest.mark.asyncio
+async def test_get_interaction_states_from_cache(mock_db, fresh_interaction_state):
+    mock_db.execute.return_value = MagicMock(data=[{'news_id': 'n2', 'interaction_type': 'favorite'}])
+    await fresh_interaction_state.get(mock_db, 'uid')
+    service = NewsService(mock_db)
+    states = await service.get_interaction_states('uid', ['n2'])
+    assert mock_db.execute.call_count == 1  # 仅首次加载
+    assert states['n2']['favorite'] is True
+
+@pytest.mark.asyncio
+async def test_trending_by_window_and_category(mock_db, fresh_trending_windows):
+    service = NewsService(mock_db)
+    await service.get_news_detail('nid')
+    fresh_trending_windows.record('other', 100, 'sports')
+    items = await service.get_trending_news(limit=5, window='hour', category=NewsCategory.TECHNOLOGY)
+    assert [item.id for item in items] == ['nid']
+    mock_db.in_.assert_any_call('id', ['nid'])
+
+@pytest.mark.asyncio
+async def test_like_and_share_recorded_in_category_window(mock_db, fresh_trending_windows):
+    # 未在本进程浏览过的新闻，点赞/分享也计入分类窗口
+    mock_db.rpc.return_value.execute.side_effect = [
+        MagicMock(data={'action': 'liked', 'like_count': 1, 'is_liked': True, 'category': 'technology'}),
+        MagicMock(data={'share_count': 1, 'title': 't', 'category': 'sports'})
+    ]
+    service = NewsService(mock_db, service_db=mock_db)
+    await service.toggle_news_like('liked', 'uid')
+    await service.share_news('shared', 'uid')
+    assert [news_id for news_id, _ in fresh_trending_windows.top('hour', 5, 'technology')] == ['liked']
+    assert [news_id for news_id, _ in fresh_trending_windows.top('hour', 5, 'sports')] == ['shared']
@@ -0,0 +1,50 @@
+import time
+import pytest
+
+from app.services.auth.token_store import MemoryTokenStore, TokenStoreFullError
+
+@pytest.mark.asyncio
+async def test_revoke_and_check():
+    store = MemoryTokenStore()
+    await store.revoke('a', time.time() + 60)
+    assert await store.is_revoked('a')
+    assert not await store.is_revoked('b')
+
+@pytest.mark.asyncio
+async def test_revoke_once():
+    store = MemoryTokenStore()
+    assert await store.revoke_once('jti', time.time() + 60)
+    assert not await store.revoke_once('jti', time.time() + 60)
+
+@pytest.mark.asyncio
+async def test_expired_entries_pruned():
+    store = MemoryTokenStore()
+    await store.revoke('old', time.time() + 0.01)
+    time.sleep(0.02)
+    assert not await store.is_revoked('old')
+    await store.revoke('new', time.time() + 60)
+    assert store.stats()['revoked'] == 1
+
+@pytest.mark.asyncio
+async def test_full_store_rejects_refresh_without_evicting():
+    store = MemoryTokenStore(max_entries=2)
+    now = time.time()
+    assert await store.revoke_once('a', now + 10)
+    assert await store.revoke_once('b', now + 20)
+    with pytest.raises(TokenStoreFullError):
+        await store.revoke_once('c', now + 30)
+    # 已消费的jti在过期前不会被淘汰
+    assert await store.is_revoked('a')
+    assert await store.is_revoked('b')
+    assert not await store.is_revoked('c')
+    # 会话吊销不受上限限制
+    await store.revoke('sid', now + 30)
+    assert await store.is_revoked('sid')
+    assert store.stats() == {'backend': 'memory', 'revoked': 3, 'rejected': 1}
+
+@pytest.mark.asyncio
+async def test_full_store_accepts_after_expiry():
+    store = MemoryTokenStore(max_entries=1)
+    assert await store.revoke_once('old', time.time() + 0.01)
+    time.sleep(0.02)
+    assert await store.revoke_once('new', time.time() + 60)
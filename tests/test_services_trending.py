@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from app.services.news import trending
+from app.services.news.trending import GravityScorer, TrendingEngine
+
+NOW = datetime.now(timezone.utc)
+
+def make_row(i, hours_ago, views=0, likes=0, status='published', updated=0):
+    return {
+        'id': f'00000000-0000-0000-0000-{i:012d}', 'slug': f's{i}', 'title': f't{i}',
+        'category': 'technology', 'view_count': views, 'like_count': likes, 'share_count': 0,
+        'status': status, 'created_at': (NOW - timedelta(hours=hours_ago)).isoformat(),
+        'published_at': (NOW - timedelta(hours=hours_ago)).isoformat(),
+        'updated_at': (NOW + timedelta(seconds=updated)).isoformat()
+    }
+
+def make_db(*pages):
+    db = MagicMock()
+    for name in ('table', 'select', 'gte', 'order', 'limit', 'or_', 'is_', 'gt'):
+        getattr(db, name).return_value = db
+    db.execute.side_effect = [MagicMock(data=page) for page in pages]
+    return db
+
+def test_gravity_scorer_decays_old_news():
+    scorer = GravityScorer(gravity=1.8)
+    old_popular = make_row(1, hours_ago=24 * 30, views=100000)
+    fresh = make_row(2, hours_ago=1, views=500)
+    assert scorer(fresh, NOW) > scorer(old_popular, NOW)
+
+@pytest.mark.asyncio
+async def test_refresh_ranks_and_serves_top():
+    db = make_db([make_row(1, 1, views=10), make_row(2, 1, views=1000), make_row(3, 2, views=100)])
+    engine = TrendingEngine()
+    assert await engine.refresh(db) == 3
+    assert [item.slug for item in engine.top(2)] == ['s2', 's3']
+
+@pytest.mark.asyncio
+async def test_incremental_refresh_merges_changes():
+    db = make_db(
+        [make_row(1, 1, views=10), make_row(2, 1, views=1000)],
+        [make_row(1, 1, views=5000, updated=5), make_row(2, 1, views=1000, status='archived', updated=5)]
+    )
+    engine = TrendingEngine()
+    await engine.refresh(db)
+    await engine.refresh(db)
+    # 第二次只拉取 updated_at 不早于 上次水位 - 刷新周期 的新闻
+    updated_filters = [c.args for c in db.gte.call_args_list if c.args[0] == 'updated_at']
+    watermark = datetime.fromisoformat(make_row(1, 1)['updated_at'])
+    assert updated_filters == [('updated_at', (watermark - timedelta(seconds=engine.refresh_interval)).isoformat())]
+    assert [item.slug for item in engine.top(10)] == ['s1']
+    assert engine.stats()['candidates'] == 1
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_late_committed_rows_and_dedupes_overlap():
+    first = make_row(1, 1, views=10, updated=10)
+    # 新闻2的 updated_at 早于水位，但其事务在上次刷新之后才提交
+    late = make_row(2, 1, views=1000, updated=5)
+    db = make_db([first], [late, first])
+    engine = TrendingEngine()
+    await engine.refresh(db)
+    # 重叠区间重复拉到的新闻1未变化，不计入
+    assert await engine.refresh(db) == 1
+    assert [item.slug for item in engine.top(10)] == ['s2', 's1']
+    assert engine.stats()['candidates'] == 2
+
+@pytest.mark.asyncio
+async def test_refresh_parses_trimmed_fractional_seconds():
+    # Postgres 去掉小数秒末尾的0后可能只剩1~5位
+    published = (NOW - timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%S') + '.12345+00:00'
+    row = dict(make_row(1, 1, views=10), published_at=published, updated_at='2099-05-01T09:00:00.12345+00:00')
+    engine = TrendingEngine()
+    assert await engine.refresh(make_db([row])) == 1
+    assert engine.top(1)[0].slug == 's1'
+
+@pytest.mark.asyncio
+async def test_refresh_pages_by_updated_at_keyset(monkeypatch):
+    monkeypatch.setattr(trending, 'TRENDING_FETCH_PAGE_SIZE', 2)
+    rows = [make_row(i, 1, views=i, updated=i) for i in range(1, 4)]
+    db = make_db(rows[0:2], rows[2:])
+    engine = TrendingEngine()
+    assert await engine.refresh(db) == 3
+    # 第二页从上一页最后的 (updated_at, id) 之后继续，而不是 OFFSET
+    value, last_id = rows[1]['updated_at'], rows[1]['id']
+    db.or_.assert_called_once_with(
+        f'updated_at.gt."{value}",and(updated_at.eq."{value}",id.gt."{last_id}"),updated_at.is.null'
+    )
@@ -0,0 +1,29 @@
+from app.services.news.trending_windows import TrendingWindows
+
+T0 = 1_700_000_000.0
+
+def test_hour_window_slides_by_minute():
+    windows = TrendingWindows()
+    windows.record('a', 1, 'technology', now=T0)
+    windows.record('b', 1, 'sports', now=T0 + 30 * 60)
+    windows.record('b', 1, 'sports', now=T0 + 30 * 60)
+    assert [news_id for news_id, _ in windows.top('hour', 10, now=T0 + 31 * 60)] == ['b', 'a']
+    # 61分钟后a移出1小时窗口，但仍在今日/本周窗口内
+    assert [news_id for news_id, _ in windows.top('hour', 10, now=T0 + 61 * 60)] == ['b']
+    assert {news_id for news_id, _ in windows.top('day', 10, now=T0 + 61 * 60)} == {'a', 'b'}
+
+def test_category_filter_and_week_expiry():
+    windows = TrendingWindows()
+    windows.record('a', 5, 'technology', now=T0)
+    windows.record('b', 1, 'sports', now=T0)
+    assert windows.top('week', 10, category='sports', now=T0) == [('b', 1)]
+    assert windows.top('week', 10, now=T0 + 169 * 3600) == []
+
+def test_negative_weight_across_buckets():
+    windows = TrendingWindows()
+    windows.record('a', 5, now=T0)
+    windows.record('a', -5, now=T0 + 120)  # 取消点赞
+    assert windows.top('hour', 10, now=T0 + 121) == []
+    # 点赞所在分桶过期后，取消点赞的负权重不应变成正热度
+    assert windows.top('hour', 10, now=T0 + 3600 + 60) == []
+    assert windows.top('hour', 10, now=T0 + 3600 + 180) == []
@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.services.news.view_counter import ViewCounter, MemoryViewBuffer, RedisViewBuffer
+
+@pytest.mark.asyncio
+async def test_increment_accumulates_pending():
+    counter = ViewCounter(MemoryViewBuffer(), db=MagicMock())
+    assert await counter.increment('a') == 1
+    assert await counter.increment('a') == 2
+    await counter.increment('b')
+    assert await counter.pending('a') == 2
+    assert await counter.pending('c') == 0
+
+@pytest.mark.asyncio
+async def test_flush_batches_one_increment_per_news():
+    db = MagicMock()
+    counter = ViewCounter(MemoryViewBuffer(), db=db)
+    for _ in range(5):
+        await counter.increment('a')
+    await counter.increment('b')
+    assert await counter.flush() == 6
+    db.rpc.assert_called_once_with('increment_news_view_counts', {'p_counts': {'a': 5, 'b': 1}})
+    assert await counter.pending('a') == 0
+    # 无新浏览时不访问数据库
+    assert await counter.flush() == 0
+    assert db.rpc.call_count == 1
+
+@pytest.mark.asyncio
+async def test_flush_failure_keeps_counts():
+    db = MagicMock()
+    db.rpc.return_value.execute.side_effect = Exception("db down")
+    counter = ViewCounter(MemoryViewBuffer(), db=db)
+    await counter.increment('a')
+    assert await counter.flush() == 0
+    assert await counter.pending('a') == 1
+    assert counter.stats()['flush_failures'] == 1
+
+@pytest.mark.asyncio
+async def test_redis_increment_single_round_trip():
+    client = MagicMock()
+    client.hincrby = AsyncMock(return_value=3)
+    client.hget = AsyncMock()
+    counter = ViewCounter(RedisViewBuffer(client), db=MagicMock())
+    # 待写回计数取自 HINCRBY 的返回值，不再额外 HGET
+    assert await counter.increment('a') == 3
+    client.hget.assert_not_awaited()
+
+    # 刷新期间在同一管道中读取正在刷新的计数
+    counter.buffer._flushing_key = 'flushing'
+    pipe = client.pipeline.return_value
+    pipe.execute = AsyncMock(return_value=[1, b'4'])
+    assert await counter.increment('a') == 5
+    pipe.execute.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_process_buffer():
+    client = MagicMock()
+    client.hincrby = AsyncMock(side_effect=ConnectionError("redis down"))
+    client.rename = AsyncMock(side_effect=ConnectionError("redis down"))
+    db = MagicMock()
+    counter = ViewCounter(RedisViewBuffer(client), db=db)
+    # Redis故障不影响浏览请求，计数暂存在进程内
+    assert await counter.increment('a') == 1
+    assert await counter.increment('a') == 2
+    assert counter.stats()['errors'] == 2
+
+    # Redis恢复后，暂存的计数随下一次刷新写回
+    client.rename = AsyncMock()
+    client.hgetall = AsyncMock(return_value={'a': '3'})
+    client.delete = AsyncMock()
+    assert await counter.flush() == 5
+    db.rpc.assert_called_once_with('increment_news_view_counts', {'p_counts': {'a': 5}})
@@ -1,4 +1,8 @@
 import pytest
+from app.utils.pagination import encode_cursor, decode_cursor
+
+NID = '00000000-0000-4000-8000-000000000001'
+
 # 假设有 app.utils.common.py，包含 def add(a, b): return a + b
 try:
     from app.utils.common import add
@@ -7,4 +11,23 @@ except ImportError:
 
 def test_add():
     assert add(1, 2) == 3
-    assert add(-1, 1) == 0 
\ No newline at end of file
+    assert add(-1, 1) == 0 
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor('2024-01-01T00:00:00+00:00', NID)
+    assert decode_cursor(cursor) == ('2024-01-01T00:00:00+00:00', NID)
+    assert decode_cursor(encode_cursor(None, NID)) == (None, NID)
+
+def test_cursor_invalid():
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+@pytest.mark.parametrize('sort_value,row_id', [
+    (1, 'n1),id.gt.0'),  # id 注入筛选条件
+    (1, ''),
+    ({'a': 1}, NID),  # 排序键不是标量
+    ([1, 2], NID),
+])
+def test_cursor_rejects_unsafe_values(sort_value, row_id):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(sort_value, row_id))
@@ -0,0 +1,17 @@
+import pytest
+from app.utils.bloom import BloomFilter
+
+def test_bloom_filter_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f'user{i}' for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f'other{i}' in bloom for i in range(10000))
+    assert false_positives < 300
+    assert bloom.stats()['count'] == 1000
+
+def test_bloom_filter_invalid_params():
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+